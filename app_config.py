@@ -14,4 +14,7 @@ def get_app_root_path():
 
 # Application paths
 APP_ROOT = get_app_root_path()
-CONFIG_PATH = os.path.join(APP_ROOT, 'folders_config.json')
+# FOLDER_OPENER_CONFIG points the app at another config file (used by the benchmarks)
+CONFIG_PATH = os.environ.get('FOLDER_OPENER_CONFIG') or os.path.join(APP_ROOT, 'folders_config.json')
+HISTORY_PATH = os.environ.get('FOLDER_OPENER_HISTORY') or os.path.join(APP_ROOT, 'run_history.sqlite3')
+PROFILE_DIR = os.environ.get('FOLDER_OPENER_PROFILE_DIR') or os.path.join(APP_ROOT, 'profiles')
@@ -0,0 +1,63 @@
+# bench_utils.py
+
+"""Version 1.1"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from core.stats import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def summarize(samples):
+    """Summarize a list of measurements (min, mean, percentiles, max)"""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p95": percentile(samples, 95),
+        "max": max(samples),
+        "samples": list(samples),
+    }
+
+
+def environment_info():
+    """Describe the machine and revision a benchmark ran on"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "revision": revision,
+    }
+
+
+def write_results(path, benchmark, results, parameters=None):
+    """Write benchmark results as JSON so runs can be compared later"""
+    document = {
+        "benchmark": benchmark,
+        "environment": environment_info(),
+        "parameters": parameters or {},
+        "results": results,
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return document
@@ -0,0 +1,204 @@
+# engine_throughput.py
+
+"""Version 1.1
+
+Measures the folder opening engine itself: the simulated backend replaces
+Explorer and a virtual clock replaces the configured sleeps, so the measured
+time is pure engine overhead. Each run is compiled once and its action
+program replayed for every repetition. Sweeps folder counts, path lengths,
+timer settings and the number of engines running concurrently (one thread
+each).
+
+Usage:
+    python benchmarks/engine_throughput.py --output engine.json
+    python benchmarks/engine_throughput.py --counts 10 1000 --compare engine.json
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_utils import summarize, write_results
+from core.action_program import DEFAULT_SLEEP_TIMERS, compile_run
+from core.backends import SimulatedBackend
+from core.clock import VirtualClock
+from core.opening_engine import FolderOpeningEngine
+from core.run_events import RunEvent
+
+DEFAULT_COUNTS = [10, 100, 1000, 10000]
+DEFAULT_PATH_LENGTHS = [32, 128, 260]
+DEFAULT_CONCURRENCY = [1, 4]
+TIMER_PRESETS = {
+    "zero": {"explorer_startup": 0, "new_tab": 0, "address_bar_focus": 0, "after_typing": 0, "after_enter": 0},
+    "fast": {"explorer_startup": 0.5, "new_tab": 0.1, "address_bar_focus": 0.1, "after_typing": 0.1,
+             "after_enter": 0.1},
+    # The timers of a new configuration
+    "default": dict(DEFAULT_SLEEP_TIMERS),
+}
+
+
+def make_folders(count, path_length):
+    """Generate count distinct folder paths padded to path_length characters"""
+    folders = []
+    for i in range(count):
+        prefix = f"C:\\Projects\\{i:06d}\\"
+        folders.append(prefix + "x" * max(0, path_length - len(prefix)))
+    return folders
+
+
+def is_gui_signal(event):
+    """Whether FolderOpeningThread forwards the event to the GUI thread as a Qt signal"""
+    if event.kind in (RunEvent.LOG, RunEvent.PROGRESS, RunEvent.FINISHED, RunEvent.FOLDER, RunEvent.LANE):
+        return True
+    return event.kind == RunEvent.STEP and event["index"] < 0
+
+
+def run_engines(folders, timers, concurrency, program):
+    """Replay the program on `concurrency` engines at once.
+
+    Returns (wall seconds, virtual seconds, event counts of one engine).
+    """
+    counts = [collections.Counter() for _ in range(concurrency)]
+    clocks = [VirtualClock() for _ in range(concurrency)]
+    results = [None] * concurrency
+
+    def worker(n):
+        def on_event(event):
+            counts[n][event.kind] += 1
+            if is_gui_signal(event):
+                counts[n]["gui_signals"] += 1
+
+        engine = FolderOpeningEngine(folders, timers, SimulatedBackend(), on_event, clocks[n])
+        results[n] = engine.run(program)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    if not all(results):
+        raise RuntimeError("A simulated run failed")
+    return wall, clocks[0].now(), counts[0]
+
+
+def peak_memory_kib(folders, timers, concurrency):
+    """Peak Python memory allocated while running, measured in a separate pass (tracemalloc slows the run)"""
+    tracemalloc.start()
+    try:
+        run_engines(folders, timers, concurrency, compile_run(folders, timers))
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(count, path_length, timer_name, concurrency, repeat, memory=True):
+    folders = make_folders(count, path_length)
+    timers = TIMER_PRESETS[timer_name]
+    start = time.perf_counter()
+    program = compile_run(folders, timers)
+    compile_ms = (time.perf_counter() - start) * 1000
+    folders_per_second = []
+    overhead_us = []
+    virtual_seconds = None
+    events = None
+    for _ in range(repeat):
+        wall, virtual_seconds, events = run_engines(folders, timers, concurrency, program)
+        folders_per_second.append(count * concurrency / wall)
+        # Each engine waits for its own steps; contention between engines shows up as extra time per step
+        overhead_us.append(wall / events[RunEvent.STEP] * 1e6)
+
+    return {
+        "folders": count,
+        "path_length": path_length,
+        "timers": timer_name,
+        "concurrency": concurrency,
+        "folders_per_second": summarize(folders_per_second),
+        "overhead_us_per_step": summarize(overhead_us),
+        "virtual_seconds": virtual_seconds,
+        "compile_ms": compile_ms,
+        "events": dict(events),
+        "peak_memory_kib": peak_memory_kib(folders, timers, concurrency) if memory else None,
+    }
+
+
+def combination_key(result):
+    return f"n={result['folders']},path={result['path_length']},timers={result['timers']},c={result['concurrency']}"
+
+
+def compare(results, baseline_path, tolerance):
+    """Print the change against a saved run and return the number of regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for key, result in results.items():
+        if key not in baseline:
+            print(f"  {key}: not in baseline")
+            continue
+        old_rate = baseline[key]["folders_per_second"]["p50"]
+        new_rate = result["folders_per_second"]["p50"]
+        old_overhead = baseline[key]["overhead_us_per_step"]["p50"]
+        new_overhead = result["overhead_us_per_step"]["p50"]
+        rate_change = new_rate / old_rate - 1
+        overhead_change = new_overhead / old_overhead - 1
+        regressed = rate_change < -tolerance or overhead_change > tolerance
+        regressions += regressed
+        print(f"  {key}: {new_rate:,.0f} folders/s ({rate_change:+.1%}), "
+              f"{new_overhead:.1f} us/step ({overhead_change:+.1%}){'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the opening engine with a simulated backend and virtual clock")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="Folder counts")
+    parser.add_argument("--path-lengths", type=int, nargs="+", default=DEFAULT_PATH_LENGTHS,
+                        help="Lengths of the generated folder paths")
+    parser.add_argument("--timers", nargs="+", choices=sorted(TIMER_PRESETS), default=sorted(TIMER_PRESETS),
+                        help="Timer presets (sleeps are virtual; they only change the predicted run time)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY,
+                        help="Numbers of engines running at the same time")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per combination")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", default="engine_throughput.json", help="JSON results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression in compare mode (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for count, path_length, timer_name, concurrency in itertools.product(
+            args.counts, args.path_lengths, args.timers, args.concurrency):
+        result = measure(count, path_length, timer_name, concurrency, args.repeat, not args.no_memory)
+        key = combination_key(result)
+        results[key] = result
+        memory = f", peak {result['peak_memory_kib']:,.0f} KiB" if result["peak_memory_kib"] is not None else ""
+        print(f"{key}: {result['folders_per_second']['p50']:,.0f} folders/s, "
+              f"{result['overhead_us_per_step']['p50']:.1f} us/step, "
+              f"{result['events'].get('gui_signals', 0)} signals, "
+              f"{result['virtual_seconds']:.1f} s of configured sleeps{memory}")
+
+    write_results(args.output, "engine_throughput", results, {
+        "counts": args.counts, "path_lengths": args.path_lengths, "timers": args.timers,
+        "concurrency": args.concurrency, "repeat": args.repeat,
+    })
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# metrics_overhead.py
+
+"""Version 1.1
+
+Measures the cost of the run metrics instrumentation: the time RunMetrics adds
+to each engine step in a simulated run with zero waits, and the cost of one
+handle() call on a STEP event.
+
+Usage:
+    python benchmarks/metrics_overhead.py --folders 1000 --repeat 5 --output metrics_overhead.json
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_utils import summarize, write_results
+from core.backends import SimulatedBackend
+from core.metrics import RunMetrics
+from core.opening_engine import FolderOpeningEngine
+from core.run_events import RunEvent
+
+ZERO_TIMERS = {"explorer_startup": 0, "new_tab": 0, "address_bar_focus": 0, "after_typing": 0, "after_enter": 0}
+
+
+def time_run(folders, listener):
+    """Run the engine once and return (seconds, number of steps)"""
+    steps = 0
+
+    def on_event(event):
+        nonlocal steps
+        if event.kind == RunEvent.STEP:
+            steps += 1
+        if listener:
+            listener(event)
+
+    engine = FolderOpeningEngine(folders, ZERO_TIMERS, SimulatedBackend(), on_event)
+    start = time.perf_counter()
+    engine.run()
+    return time.perf_counter() - start, steps
+
+
+def time_handle(calls):
+    """Return the mean cost in ns of RunMetrics.handle() on a STEP event"""
+    metrics = RunMetrics()
+    event = RunEvent(RunEvent.STEP, index=0, folder="C:\\Projects", step="type_path", outcome="ok",
+                     duration=0.5, action_duration=0.01, expected=0.5)
+    start = time.perf_counter()
+    for _ in range(calls):
+        metrics.handle(event)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the overhead of the run metrics per engine step")
+    parser.add_argument("--folders", type=int, default=1000, help="Folders per simulated run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant")
+    parser.add_argument("--calls", type=int, default=200000, help="handle() calls in the micro benchmark")
+    parser.add_argument("--output", default="metrics_overhead.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    folders = [f"C:\\Projects\\project-{i:06d}\\src" for i in range(args.folders)]
+    per_step = {"baseline": [], "metrics": []}
+    for _ in range(args.repeat):
+        for variant, listener in (("baseline", None), ("metrics", RunMetrics().handle)):
+            seconds, steps = time_run(folders, listener)
+            per_step[variant].append(seconds / steps * 1e6)
+
+    results = {variant: summarize(samples) for variant, samples in per_step.items()}
+    results["overhead_us_per_step"] = results["metrics"]["p50"] - results["baseline"]["p50"]
+    results["handle_ns"] = time_handle(args.calls)
+
+    print(f"Engine step without metrics: p50 {results['baseline']['p50']:.2f} us")
+    print(f"Engine step with metrics:    p50 {results['metrics']['p50']:.2f} us")
+    print(f"Overhead per step:           {results['overhead_us_per_step']:.2f} us")
+    print(f"RunMetrics.handle(STEP):     {results['handle_ns']:.0f} ns")
+
+    write_results(args.output, "metrics_overhead", results,
+                  {"folders": args.folders, "repeat": args.repeat, "calls": args.calls})
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
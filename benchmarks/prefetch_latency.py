@@ -0,0 +1,142 @@
+# prefetch_latency.py
+
+"""Version 1.1
+
+Measures how much first-access latency the folder prefetcher hides. A
+simulated share makes the first access to each path slow (as an SMB connect
+or an automount does) and the simulated backend pays that cost when Enter
+is pressed, the moment Explorer would list the folder. Each run uses the
+real clock with short sleep timers, so the prefetcher has real waits to
+overlap. With --path, the cold and warm cost of prefetch_folder() on real
+folders is measured as well.
+
+Usage:
+    python benchmarks/prefetch_latency.py --output prefetch.json
+    python benchmarks/prefetch_latency.py --latency 0.3 --depths 0 1 2 4 --path \\\\server\\share\\projects
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_utils import summarize, write_results
+from core.backends import SimulatedBackend
+from core.opening_engine import FolderOpeningEngine
+from core.prefetch import FolderPrefetcher, prefetch_folder
+
+DEFAULT_DEPTHS = [0, 1, 2, 4]
+TIMERS = {"explorer_startup": 0.05, "new_tab": 0.01, "address_bar_focus": 0.01, "after_typing": 0.01,
+          "after_enter": 0.05}
+
+
+class SimulatedShare:
+    """Charges `latency` seconds for the first access to a path, as a cold network share does.
+
+    A second access while the first is still in progress waits for it to finish.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.accessed = {}
+        self.lock = threading.Lock()
+
+    def access(self, path):
+        with self.lock:
+            done = self.accessed.get(path)
+            if done is None:
+                done = self.accessed[path] = threading.Event()
+                first = True
+            else:
+                first = False
+        if first:
+            time.sleep(self.latency)
+            done.set()
+        else:
+            done.wait()
+
+
+class ShareBackend(SimulatedBackend):
+    """Simulated file manager that lists the typed folder from the share when Enter is pressed"""
+
+    def __init__(self, share):
+        super().__init__()
+        self.share = share
+
+    def press_enter(self, window=None):
+        path = self.address_bars[self._target(window)]
+        super().press_enter(window)
+        self.share.access(path)
+
+
+def run_once(count, latency, depth):
+    """Open count folders from a cold share and return the wall seconds of the run"""
+    share = SimulatedShare(latency)
+    folders = [f"\\\\fileserver\\projects\\{i:04d}" for i in range(count)]
+    prefetcher = FolderPrefetcher(depth, touch=share.access) if depth else None
+    engine = FolderOpeningEngine(folders, TIMERS, ShareBackend(share), prefetcher=prefetcher)
+    start = time.perf_counter()
+    if not engine.run():
+        raise RuntimeError("A simulated run failed")
+    return time.perf_counter() - start
+
+
+def measure_path(path, scan_limit, repeat):
+    """Time prefetch_folder() on a real folder: the first (possibly cold) access, then warm ones"""
+    start = time.perf_counter()
+    entries = prefetch_folder(path, scan_limit)
+    cold = time.perf_counter() - start
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prefetch_folder(path, scan_limit)
+        warm.append(time.perf_counter() - start)
+    return {"path": path, "entries": entries, "cold_ms": cold * 1000,
+            "warm_ms": summarize([seconds * 1000 for seconds in warm])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the latency hidden by prefetching folders")
+    parser.add_argument("--count", type=int, default=20, help="Folders per run")
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Simulated first access time of a folder in seconds")
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS,
+                        help="Prefetch depths to compare (0 is no prefetching)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per depth")
+    parser.add_argument("--path", action="append", default=[],
+                        help="Also time prefetching this real folder (may be repeated)")
+    parser.add_argument("--scan-limit", type=int, default=256, help="Directory entries read per folder")
+    parser.add_argument("--output", default="prefetch_latency.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    baseline = None
+    for depth in args.depths:
+        durations = [run_once(args.count, args.latency, depth) for _ in range(args.repeat)]
+        summary = summarize(durations)
+        baseline = summary["p50"] if baseline is None else baseline
+        hidden = baseline - summary["p50"]
+        results[f"depth={depth}"] = {"depth": depth, "run_seconds": summary, "hidden_seconds": hidden,
+                                     "hidden_per_folder_ms": hidden / args.count * 1000}
+        print(f"depth={depth}: {summary['p50']:.2f} s per run, {hidden:+.2f} s hidden "
+              f"({hidden / args.count * 1000:.0f} ms per folder) vs depth={args.depths[0]}")
+
+    for path in args.path:
+        result = measure_path(path, args.scan_limit, args.repeat)
+        results[f"path={path}"] = result
+        print(f"{path}: {result['entries']} entries, first access {result['cold_ms']:.1f} ms, "
+              f"warm {result['warm_ms']['p50']:.1f} ms")
+
+    write_results(args.output, "prefetch_latency", results, {
+        "count": args.count, "latency": args.latency, "depths": args.depths, "repeat": args.repeat,
+        "timers": TIMERS, "scan_limit": args.scan_limit,
+    })
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
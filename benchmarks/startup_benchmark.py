@@ -0,0 +1,103 @@
+# startup_benchmark.py
+
+"""Version 1.1
+
+Measures launcher startup under the offscreen Qt platform with the simulated
+opener backend, for configs of several sizes.
+
+Usage:
+    python benchmarks/startup_benchmark.py --repeat 10 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_utils import summarize, write_results
+from benchmarks.startup_probe import PROBE_MARKER
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+PHASES = ["interpreter_start", "imports", "load_config", "qapplication", "ui", "first_event", "deferred_init", "total"]
+PROBE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_probe.py")
+
+
+def write_config(directory, folder_count):
+    """Write a config with folder_count generated folder paths and return its path"""
+    config = {
+        "folders": [os.path.join(directory, "share", f"project-{i:06d}", "src") for i in range(folder_count)],
+        "sleep_timers": {
+            "explorer_startup": 1.5,
+            "new_tab": 0.5,
+            "address_bar_focus": 0.5,
+            "after_typing": 0.5,
+            "after_enter": 0.5
+        },
+        "start_instantly": False,
+        "auto_close": False,
+        "auto_close_delay": 3,
+        "system_tray": False
+    }
+    config_path = os.path.join(directory, f"folders_config_{folder_count}.json")
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+    return config_path
+
+
+def run_probe(python, config_path, work_dir):
+    """Start the launcher once in a child process and return its phase timings in ms"""
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["FOLDER_OPENER_BACKEND"] = "simulated"
+    env["FOLDER_OPENER_CONFIG"] = config_path
+
+    spawn_wall = time.time()
+    completed = subprocess.run([python, PROBE_PATH], cwd=work_dir, env=env,
+                               capture_output=True, text=True, timeout=600)
+    for line in completed.stdout.splitlines():
+        if line.startswith(PROBE_MARKER):
+            report = json.loads(line[len(PROBE_MARKER):])
+            timings = report["timings"]
+            timings["interpreter_start"] = (report["process_start_wall"] - spawn_wall) * 1000
+            return timings
+
+    raise RuntimeError(f"Startup probe failed (exit code {completed.returncode}):\n{completed.stderr}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark launcher startup under QT_QPA_PLATFORM=offscreen")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Folder counts of the generated configs")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per config size")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter used to start the launcher")
+    parser.add_argument("--output", default="startup_benchmark.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="folder-opener-bench-") as work_dir:
+        for size in args.sizes:
+            config_path = write_config(work_dir, size)
+            samples = {phase: [] for phase in PHASES}
+            for _ in range(args.repeat):
+                timings = run_probe(args.python, config_path, work_dir)
+                for phase in PHASES:
+                    if timings.get(phase) is not None:
+                        samples[phase].append(timings[phase])
+
+            results[str(size)] = {phase: summarize(values) for phase, values in samples.items()}
+            print(f"{size:>7} folders: " + ", ".join(
+                f"{phase} p50={results[str(size)][phase]['p50']:.1f}ms"
+                for phase in PHASES if samples[phase]
+            ))
+
+    write_results(args.output, "startup", results, {"sizes": args.sizes, "repeat": args.repeat})
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# startup_probe.py
+
+"""Version 1.1
+
+Child process used by startup_benchmark.py. Starts the launcher once and prints
+its phase timings as a single JSON line prefixed with PROBE_MARKER.
+"""
+
+import time
+
+PROCESS_START_WALL = time.time()
+PROCESS_START = time.perf_counter()
+
+import json
+import os
+import sys
+
+PROBE_MARKER = "STARTUP_PROBE "
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    timings = {}
+
+    start = time.perf_counter()
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    import launcher_app
+    from managers.config_manager import ConfigManager
+    from app_config import CONFIG_PATH
+    timings["imports"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    ConfigManager(CONFIG_PATH).load_config()
+    timings["load_config"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    app = QApplication([sys.argv[0]])
+    timings["qapplication"] = (time.perf_counter() - start) * 1000
+
+    def on_deferred_done():
+        timings["deferred_init"] = (time.perf_counter() - start) * 1000
+        app.quit()
+
+    def on_first_event():
+        timings["first_event"] = (time.perf_counter() - start) * 1000
+        # Queued behind the window's own deferred initialization
+        QTimer.singleShot(0, on_deferred_done)
+
+    # Registered before the window so it is the first timer to be processed
+    QTimer.singleShot(0, on_first_event)
+
+    # first_event and deferred_init are measured from the start of window construction
+    start = time.perf_counter()
+    window = launcher_app.FolderOpenerExecutionApp()
+    timings["ui"] = dict(window.startup_timings).get("ui")
+    timings["window"] = (time.perf_counter() - start) * 1000
+    window.show()
+    app.exec()
+
+    timings["total"] = (time.perf_counter() - PROCESS_START) * 1000
+    print(PROBE_MARKER + json.dumps({"process_start_wall": PROCESS_START_WALL, "timings": timings}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
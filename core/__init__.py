@@ -0,0 +1,16 @@
+# __init__.py
+
+"""Version 1.1
+
+The folder opening core: planning (action_program), execution (opening_engine),
+events (run_events) and backends, without Qt. See core.api for an example.
+"""
+
+from core.api import open_folders, open_folders_async
+from core.backends import BACKENDS, get_backend
+from core.opening_engine import FolderOpeningEngine, RunCancelled
+from core.run_events import RunEvent
+from core.timing import TimingSettings
+
+__all__ = ["open_folders", "open_folders_async", "BACKENDS", "get_backend", "FolderOpeningEngine", "RunCancelled",
+           "RunEvent", "TimingSettings"]
@@ -0,0 +1,260 @@
+# action_program.py
+
+"""Version 1.1"""
+
+from core.window_groups import WindowGroup, split_into_groups
+
+DEFAULT_SLEEP_TIMERS = {
+    "explorer_startup": 1.5,
+    "new_tab": 0.5,
+    "address_bar_focus": 0.5,
+    "after_typing": 0.5,
+    "after_enter": 0.5
+}
+
+# Backend operation -> (step name in the run history, sleep timer, log message, wait description)
+OPERATIONS = {
+    "launch": ("launch", "explorer_startup", "Opening Windows Explorer...", "for Explorer to start"),
+    "open_window": ("launch", "explorer_startup", "Opening window {window}...", "for the window to open"),
+    "focus_window": ("focus_window", "window_focus", "Switching to window {window}", "after switching windows"),
+    "new_tab": ("new_tab", "new_tab", "Opening new tab (Ctrl+T)", "after new tab"),
+    "focus_address_bar": ("focus_address_bar", "address_bar_focus", "Focusing address bar (Ctrl+L)",
+                          "after focusing address bar"),
+    "type_path": ("type_path", "after_typing", "Typing path: {folder}", "after typing"),
+    "press_enter": ("press_enter", "after_enter", "Pressing Enter", "after pressing Enter"),
+}
+
+
+def action_timers(sleep_timers):
+    """The wait of every timer named in OPERATIONS, in seconds"""
+    # Switching between windows waits as long as focusing the address bar unless configured
+    return {"window_focus": sleep_timers.get("address_bar_focus", 0), **sleep_timers}
+
+
+class Action:
+    """One backend operation of a compiled run and the wait that follows it.
+
+    An overlapping wait only holds back the action's own window, so other
+    windows may be served meanwhile. "at" is the start time the compiler
+    predicted, in seconds from the start of the run.
+    """
+
+    def __init__(self, op, index, folder, window, wait, overlap=False, begins_folder=False, ends_folder=False,
+                 at=0.0):
+        self.op = op
+        self.index = index
+        self.folder = folder
+        self.window = window
+        self.wait = wait
+        self.overlap = overlap
+        self.begins_folder = begins_folder
+        self.ends_folder = ends_folder
+        self.at = at
+
+    @property
+    def step(self):
+        return OPERATIONS[self.op][0]
+
+    @property
+    def message(self):
+        window = None if self.window is None else self.window + 1
+        return OPERATIONS[self.op][2].format(window=window, folder=self.folder)
+
+    @property
+    def wait_description(self):
+        return OPERATIONS[self.op][3]
+
+    def describe(self):
+        """One line for the dry run, e.g. 'type_path C:\\Reports, wait 0.5s'"""
+        target = f" {self.folder}" if self.op == "type_path" else ""
+        window = f"[window {self.window + 1}] " if self.window is not None else ""
+        wait = f", wait {self.wait}s" if self.wait else ""
+        overlap = " (overlaps)" if self.overlap and self.wait else ""
+        return f"{window}{self.op}{target}{wait}{overlap}"
+
+    def to_dict(self):
+        return {"op": self.op, "index": self.index, "folder": self.folder, "window": self.window,
+                "wait": self.wait, "overlap": self.overlap, "at": round(self.at, 3)}
+
+
+class ActionProgram:
+    """The ordered actions of a run, executed by FolderOpeningEngine.execute().
+
+    addressed is True when the actions name their window (backends with
+    concurrent_windows) instead of relying on the focused window.
+    """
+
+    def __init__(self, actions, total, windows, addressed, duration):
+        self.actions = actions
+        self.total = total
+        self.windows = windows
+        self.addressed = addressed
+        self.duration = duration
+
+    def __len__(self):
+        return len(self.actions)
+
+    def folder_order(self):
+        """The folders in the order the run begins them"""
+        return [action.folder for action in self.actions if action.begins_folder]
+
+
+class ProgramCompiler:
+    """Turns a folder list into an ActionProgram.
+
+    The run is played on predicted timings (configured waits plus the action
+    overhead seen in the history) to fix the order of the actions. With several
+    windows the next action goes to the window that can take it first, counting
+    the focus switch it may need. Focus switches are only emitted when another
+    window has the focus, and their wait runs while the target window is still
+    loading instead of after it. On backends with concurrent windows every wait
+    overlaps; on keystroke backends only the wait for a window to start or to
+    load a folder does, and a window that is being opened keeps the focus until
+    its first folder was typed.
+
+    With ranks (the lane rank of each folder, lower first), the window working
+    on the highest ranked folder is served first and the others only fill the
+    time it still has to wait.
+    """
+
+    def __init__(self, sleep_timers, step_overhead=None, concurrent=False):
+        self.timers = action_timers(sleep_timers)
+        self.step_overhead = step_overhead or {}
+        self.concurrent = concurrent
+        self.actions = []
+        self.now = 0.0
+
+    def compile(self, folders, windows=1, max_tabs=0, ranks=None):
+        self.folders = list(folders)
+        self.ranks = ranks
+        self.actions = []
+        self.now = 0.0
+        if not self.folders:
+            return ActionProgram([], 0, 0, False, 0.0)
+
+        groups = split_into_groups(self.folders, windows, max_tabs)
+        if len(groups) == 1:
+            self._compile_single_window()
+            return ActionProgram(self.actions, len(self.folders), 1, False, self.now)
+
+        end = self._compile_windows(groups)
+        return ActionProgram(self.actions, len(self.folders), len(groups), self.concurrent, end)
+
+    def _add(self, op, index, window=None, overlap=False, begins_folder=False, ends_folder=False):
+        wait = self.timers[OPERATIONS[op][1]]
+        folder = self.folders[index] if index >= 0 else None
+        action = Action(op, index, folder, None if window is None else window.number, wait, overlap,
+                        begins_folder, ends_folder, self.now)
+        self.actions.append(action)
+        self.now += self.step_overhead.get(action.step, 0.0)
+        if overlap:
+            window.ready_at = self.now + wait
+        else:
+            self.now += wait
+        return action
+
+    def _switch_time(self):
+        return 0.0 if self.concurrent else self.timers["window_focus"] + self.step_overhead.get("focus_window", 0.0)
+
+    def _start_time(self, window, focused):
+        """When the window's next action could start, including a focus switch if one is needed"""
+        if self.concurrent or window is focused or not window.opened:
+            return max(self.now, window.ready_at)
+        return max(self.now + self._switch_time(), window.ready_at)
+
+    def _rank(self, window):
+        """Lane rank of the folder the window works on next"""
+        return self.ranks[window.steps[0][1] if window.steps else window.indices[0]]
+
+    def _busy_time(self, window):
+        """How long the window's next turn keeps the backend busy (up to its overlapping wait)"""
+        busy = 0.0
+        if not window.opened:
+            busy = self.step_overhead.get("launch", 0.0)
+            if self.concurrent:
+                return busy
+            # A window being opened keeps the focus until its first folder was typed
+            busy += self.timers["explorer_startup"]
+        steps = list(window.steps) or self._folder_ops(window.indices[0], window.tabs > 0)
+        for n, (op, _, _, _) in enumerate(steps):
+            busy += self.step_overhead.get(OPERATIONS[op][0], 0.0)
+            if self.concurrent or n == len(steps) - 1:
+                break
+            busy += self.timers[OPERATIONS[op][1]]
+        return busy
+
+    def _next_window(self, ready, focused):
+        """The window that gets the next action"""
+        def order(window):
+            return self._start_time(window, focused), window is not focused, window.number
+
+        if not self.ranks:
+            return min(ready, key=order)
+        best = min(ready, key=lambda w: (self._rank(w), *order(w)))
+        deadline = self._start_time(best, focused)
+        # Lower lanes may only use the time the best window is waiting anyway, including the switch back
+        fill = [window for window in ready if window is not best and
+                order(window)[0] + self._busy_time(window) + self._switch_time() <= deadline]
+        return min(fill, key=lambda w: (self._rank(w), *order(w))) if fill else best
+
+    @staticmethod
+    def _folder_ops(index, new_tab):
+        """(operation, folder index, begins folder, ends folder) of the steps that open one folder"""
+        ops = (["new_tab"] if new_tab else []) + ["focus_address_bar", "type_path", "press_enter"]
+        return [(op, index, n == 0, n == len(ops) - 1) for n, op in enumerate(ops)]
+
+    def _compile_single_window(self):
+        self._add("launch", -1)
+        for i in range(len(self.folders)):
+            for op, index, begins, ends in self._folder_ops(i, i > 0):
+                self._add(op, index, begins_folder=begins, ends_folder=ends)
+
+    def _compile_windows(self, groups):
+        windows = [WindowGroup(number, indices) for number, indices in enumerate(groups)]
+        focused = None
+        while True:
+            ready = [window for window in windows if window.has_work()]
+            if not self.concurrent:
+                opening = [window for window in ready if window.opened and window.tabs == 0]
+                unopened = [window for window in windows if not window.opened]
+                if opening:
+                    ready = opening
+                else:
+                    ready = [window for window in ready if window.opened or window is unopened[0]]
+            if not ready:
+                return max([self.now] + [window.ready_at for window in windows])
+            window = self._next_window(ready, focused)
+
+            if not window.opened:
+                window.opened = True
+                focused = window
+                self.now = max(self.now, window.ready_at)
+                self._add("open_window", -1, window, overlap=True)
+                continue
+
+            if not window.steps:
+                window.steps.extend(self._folder_ops(window.indices.popleft(), window.tabs > 0))
+                window.tabs += 1
+
+            if not self.concurrent and focused is not window:
+                op, index, begins, ends = window.steps.popleft()
+                window.steps.appendleft((op, index, False, ends))
+                self._add("focus_window", index, window, begins_folder=begins)
+                focused = window
+
+            self.now = max(self.now, window.ready_at)
+            while window.steps:
+                op, index, begins, ends = window.steps.popleft()
+                last = self.concurrent or not window.steps
+                self._add(op, index, window, overlap=last, begins_folder=begins, ends_folder=ends)
+                if last:
+                    break
+
+
+def compile_run(folders, sleep_timers, windows=1, max_tabs=0, concurrent=False, step_overhead=None, lanes=None):
+    """Compile the run of a folder list; see ProgramCompiler.
+
+    lanes holds the (lane, folder count) of consecutive parts of the list, highest priority first.
+    """
+    ranks = [rank for rank, (_, count) in enumerate(lanes) for _ in range(count)] if lanes else None
+    return ProgramCompiler(sleep_timers, step_overhead, concurrent).compile(folders, windows, max_tabs, ranks)
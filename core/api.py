@@ -0,0 +1,124 @@
+# api.py
+
+"""Version 1.1
+
+Library entry point of the folder opening core. Nothing under core imports
+Qt, so the engine can be driven from scripts and other tools:
+
+    from core import open_folders, RunEvent
+
+    def on_event(event):
+        if event.kind == RunEvent.LOG:
+            print(event["message"])
+
+    open_folders([r"C:\\Projects", r"\\\\fileserver\\share"], backend="simulated", on_event=on_event)
+
+From async code, await open_folders_async() instead, or run several sessions
+with core.async_engine.SessionPool.
+"""
+
+from core.backends import get_backend
+from core.opening_engine import FolderOpeningEngine
+from core.prefetch import DEFAULT_SCAN_LIMIT, FolderPrefetcher
+from core.run_events import RunEvent
+from core.timing import TimingSettings
+
+
+def open_folders(paths, backend=None, on_event=None, sleep_timers=None, windows=1, max_tabs=0, prefetch_depth=0,
+                 scan_limit=DEFAULT_SCAN_LIMIT, lanes=None, clock=None, cancel_event=None, history_path=None,
+                 input_pause=None, failsafe=None):
+    """Open folders in the file manager and return True if the run succeeded.
+
+    backend is a backend name from core.backends.BACKENDS (default: explorer) or
+    a backend object. on_event receives every RunEvent on the calling thread;
+    the run ends with a FINISHED event, also when the backend cannot be created.
+    Missing sleep timers take their default values; pass a
+    core.timing.TimingSettings instead of a dict to change them while the run
+    is in progress. input_pause and failsafe set the input pacing of a backend
+    created by name (see core.backends.pacing_options). history_path, if given,
+    records the run in that run history database. The call blocks until the
+    run ends; setting cancel_event from another thread stops it.
+    """
+    prepared = _prepare(FolderOpeningEngine, paths, backend, on_event, sleep_timers, windows, max_tabs,
+                        prefetch_depth, scan_limit, lanes, clock, cancel_event, history_path, input_pause, failsafe)
+    if prepared is None:
+        return False
+    engine, recorder = prepared
+    try:
+        return engine.run()
+    finally:
+        if recorder:
+            recorder.close()
+
+
+async def open_folders_async(paths, backend=None, on_event=None, sleep_timers=None, windows=1, max_tabs=0,
+                             prefetch_depth=0, scan_limit=DEFAULT_SCAN_LIMIT, lanes=None, cancel_event=None,
+                             history_path=None, input_pause=None, failsafe=None, input_slots=None):
+    """Coroutine version of open_folders(); cancelling the task cancels the run.
+
+    input_slots, an asyncio.Semaphore, is held for the whole run when the
+    backend drives the keyboard, so concurrent runs do not type into each other.
+    """
+    import asyncio
+    from core.async_engine import AsyncFolderOpeningEngine
+
+    prepared = _prepare(AsyncFolderOpeningEngine, paths, backend, on_event, sleep_timers, windows, max_tabs,
+                        prefetch_depth, scan_limit, lanes, None, cancel_event, history_path, input_pause, failsafe)
+    if prepared is None:
+        return False
+    engine, recorder = prepared
+    try:
+        if input_slots is None or getattr(engine.backend, "concurrent_windows", False):
+            return await engine.run_async()
+        if input_slots.locked():
+            engine.log("Waiting for another session to finish typing...")
+        try:
+            await input_slots.acquire()
+        except asyncio.CancelledError:
+            engine.log("Folder opening cancelled.")
+            engine.finish(False, "Cancelled", cancelled=True)
+            raise
+        try:
+            return await engine.run_async()
+        finally:
+            input_slots.release()
+    finally:
+        if recorder:
+            recorder.close()
+
+
+def _prepare(engine_class, paths, backend, on_event, sleep_timers, windows, max_tabs, prefetch_depth, scan_limit,
+             lanes, clock, cancel_event, history_path, input_pause, failsafe):
+    """Create the backend, prefetcher and history recorder of a run.
+
+    Returns (engine, recorder or None), or None after reporting a backend that cannot be created.
+    """
+    def emit(event):
+        if on_event:
+            on_event(event)
+
+    timing = TimingSettings.of(sleep_timers)
+    if backend is None or isinstance(backend, str):
+        try:
+            backend = get_backend(backend, input_pause, failsafe)
+        except Exception as e:
+            emit(RunEvent(RunEvent.LOG, message=f"Error: {str(e)}"))
+            emit(RunEvent(RunEvent.FINISHED, success=False, message=str(e), error_class=type(e).__name__))
+            return None
+
+    paths = list(paths)
+    recorder = None
+    if history_path:
+        # SQLite is only loaded when the run is recorded
+        from core.run_history import RunHistoryRecorder
+        recorder = RunHistoryRecorder(history_path, backend.name, timing.snapshot()[1], len(paths))
+
+    def handle(event):
+        if recorder:
+            recorder.handle(event)
+        emit(event)
+
+    prefetcher = FolderPrefetcher(prefetch_depth, scan_limit) if prefetch_depth else None
+    engine = engine_class(paths, timing, backend, handle, clock, cancel_event, windows, max_tabs,
+                          prefetcher, lanes)
+    return engine, recorder
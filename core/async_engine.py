@@ -0,0 +1,142 @@
+# async_engine.py
+
+"""Version 1.1"""
+
+import asyncio
+import threading
+
+from core.api import open_folders_async
+from core.opening_engine import FolderOpeningEngine, RunCancelled
+from core.profiling import profile_thread
+
+
+class AsyncFolderOpeningEngine(FolderOpeningEngine):
+    """Runs the engine on an asyncio event loop.
+
+    The waits become asyncio.sleep() calls, so any number of runs share one
+    loop thread, and cancelling the task cancels the run (reported like
+    cancel()). Backend actions run in the loop's default executor, so a
+    blocking call (typing a path with the input pause) does not hold up the
+    other runs; events are still emitted on the loop thread.
+    """
+
+    offload_actions = True
+
+    async def run_async(self, program=None):
+        """Open all folders (or replay a compiled program) and return True if the run succeeded"""
+        loop = asyncio.get_running_loop()
+        steps = self.steps(program)
+        try:
+            step = next(steps)
+            while True:
+                if callable(step):
+                    # A backend call, see FolderOpeningEngine.act()
+                    try:
+                        result = await loop.run_in_executor(None, step)
+                    except asyncio.CancelledError:
+                        self._cancel_steps(steps)
+                        raise
+                    except Exception as e:
+                        step = steps.throw(e)
+                    else:
+                        step = steps.send(result)
+                    continue
+                if self.cancel_event.is_set():
+                    step = steps.throw(RunCancelled())
+                    continue
+                try:
+                    await asyncio.sleep(step)
+                except asyncio.CancelledError:
+                    self._cancel_steps(steps)
+                    raise
+                step = next(steps)
+        except StopIteration as done:
+            return done.value
+
+    @staticmethod
+    def _cancel_steps(steps):
+        try:
+            steps.throw(RunCancelled())
+        except StopIteration:
+            pass
+
+
+class SessionPool:
+    """Runs independent folder runs ("sessions") as tasks on one event loop.
+
+    Sessions on a backend that drives the keyboard (any backend without
+    concurrent_windows) hold one of `input_sessions` semaphore slots for their
+    whole run, so their keystrokes never interleave; the others run freely.
+    Must be used from the loop's thread.
+    """
+
+    def __init__(self, input_sessions=1):
+        self.input_slots = asyncio.Semaphore(input_sessions)
+        self.tasks = {}
+
+    def start(self, name, paths, **options):
+        """Start a session; options are those of core.api.open_folders_async. Returns its task."""
+        if self.is_running(name):
+            raise ValueError(f"Session '{name}' is already running")
+        task = asyncio.get_running_loop().create_task(
+            open_folders_async(paths, input_slots=self.input_slots, **options), name=f"session {name}")
+        self.tasks[name] = task
+        task.add_done_callback(lambda done: self.tasks.pop(name) if self.tasks.get(name) is done else None)
+        return task
+
+    def is_running(self, name):
+        task = self.tasks.get(name)
+        return task is not None and not task.done()
+
+    def cancel(self, name=None):
+        """Cancel one session, or all of them; returns the number of sessions cancelled"""
+        tasks = [self.tasks[name]] if name in self.tasks else [] if name is not None else list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    async def wait(self):
+        """Wait for all running sessions and return {name: result}"""
+        names = list(self.tasks)
+        results = await asyncio.gather(*(self.tasks[name] for name in names), return_exceptions=True)
+        return dict(zip(names, results))
+
+
+class EventLoopThread:
+    """An asyncio event loop on a daemon thread, for callers that are not async themselves (the Qt UI)"""
+
+    def __init__(self, name="EventLoopThread"):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        with profile_thread(self.name):
+            self.loop.run_forever()
+
+    def call(self, function, *args):
+        """Run a function on the loop thread (thread-safe, does not wait)"""
+        self.loop.call_soon_threadsafe(function, *args)
+
+    def submit(self, coroutine):
+        """Run a coroutine on the loop and return a concurrent.futures.Future of its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout=5.0):
+        """Cancel the remaining tasks, stop the loop and wait for the thread"""
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.thread.is_alive():
+            try:
+                self.submit(shutdown()).result(timeout)
+            finally:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.loop.close()
@@ -0,0 +1,181 @@
+# backends.py
+
+"""Version 1.1"""
+
+import os
+
+# pyautogui's own pause after every keystroke call, kept as the default so run times do not change
+DEFAULT_INPUT_PAUSE = 0.1
+
+
+def pacing_options(settings):
+    """Read (pause, failsafe) from the "input_pacing" config section, ignoring invalid values.
+
+    pause is the delay in seconds after every keystroke call of the Explorer
+    backend, on top of the sleep timers. With failsafe, moving the mouse into
+    a screen corner aborts the run.
+    """
+    settings = settings if isinstance(settings, dict) else {}
+    pause = settings.get("pause", DEFAULT_INPUT_PAUSE)
+    if isinstance(pause, bool) or not isinstance(pause, (int, float)) or pause < 0:
+        pause = DEFAULT_INPUT_PAUSE
+    return pause, settings.get("failsafe", True) is not False
+
+
+class ExplorerBackend:
+    """Drives Windows Explorer through simulated keystrokes"""
+
+    name = "explorer"
+    # Keystrokes go to the foreground window, so several windows are filled by switching focus
+    concurrent_windows = False
+    # Operations that end with the input pause
+    paced_operations = ("new_tab", "focus_address_bar", "type_path", "press_enter")
+
+    def __init__(self, pause=DEFAULT_INPUT_PAUSE, failsafe=True):
+        # pyautogui connects to the display on import, so only load it when a run actually starts
+        import pyautogui
+        import subprocess
+        self.pyautogui = pyautogui
+        self.subprocess = subprocess
+        # The pacing is set here instead of relying on pyautogui's hidden defaults
+        self.pause = pause
+        pyautogui.PAUSE = pause
+        pyautogui.FAILSAFE = failsafe
+        # Windows of a multi-window run, found when they first receive keystrokes
+        self.windows = []
+        self.current = None
+
+    def launch(self):
+        """Start a new Explorer window"""
+        self.subprocess.Popen(r'explorer.exe')
+
+    def open_window(self):
+        """Start another Explorer window for a group of folders and return its number"""
+        self.subprocess.Popen(r'explorer.exe')
+        self.windows.append(None)
+        self.current = len(self.windows) - 1
+        return self.current
+
+    def focus_window(self, window):
+        """Bring a window opened with open_window() back to the foreground"""
+        if self.windows[window] is not None:
+            self.windows[window].activate()
+        self.current = window
+
+    def new_tab(self):
+        self.pyautogui.hotkey('ctrl', 't')
+
+    def focus_address_bar(self):
+        if self.windows and self.windows[self.current] is None:
+            # The window has started and still has the focus: remember it for focus_window()
+            self.windows[self.current] = self.pyautogui.getActiveWindow()
+        self.pyautogui.hotkey('ctrl', 'l')
+
+    def type_path(self, path):
+        self.pyautogui.write(path)
+
+    def press_enter(self):
+        self.pyautogui.press('enter')
+
+
+class SimulatedBackend:
+    """Records the actions of a run instead of sending them to a file manager.
+
+    Models windows with tabs and keyboard focus: actions go to the focused
+    window, like keystrokes do.
+    """
+
+    name = "simulated"
+    concurrent_windows = False
+    paced_operations = ()
+
+    def __init__(self, pause=0.0, failsafe=True):
+        # Accepted like the Explorer backend's pacing; the simulation has no input delay
+        self.pause = 0.0
+        self.actions = []
+        self.windows = []  # the tabs of each window
+        self.address_bars = []
+        self.focused = None
+
+    @property
+    def tabs(self):
+        return self.windows[self.focused] if self.focused is not None else []
+
+    def _new_window(self):
+        self.windows.append([None])
+        self.address_bars.append(None)
+        self.focused = len(self.windows) - 1
+        return self.focused
+
+    def _target(self, window):
+        return self.focused if window is None else window
+
+    def launch(self):
+        self.actions.append(("launch", self._new_window()))
+
+    def open_window(self):
+        window = self._new_window()
+        self.actions.append(("open_window", window))
+        return window
+
+    def focus_window(self, window):
+        self.actions.append(("focus_window", window))
+        self.focused = window
+
+    def new_tab(self, window=None):
+        window = self._target(window)
+        self.actions.append(("new_tab", window))
+        self.windows[window].append(None)
+
+    def focus_address_bar(self, window=None):
+        window = self._target(window)
+        self.actions.append(("focus_address_bar", window))
+        self.address_bars[window] = ""
+
+    def type_path(self, path, window=None):
+        window = self._target(window)
+        self.actions.append(("type_path", window, path))
+        if self.address_bars[window] is not None:
+            self.address_bars[window] += path
+
+    def press_enter(self, window=None):
+        window = self._target(window)
+        self.actions.append(("press_enter", window))
+        if self.address_bars[window] is not None:
+            self.windows[window][-1] = self.address_bars[window]
+        self.address_bars[window] = None
+
+
+class ParallelSimulatedBackend(SimulatedBackend):
+    """A simulated file manager that takes commands for any window without focusing it first.
+
+    Stands in for backends driven through an automation API, which let the
+    engine work on several windows at the same time.
+    """
+
+    name = "simulated-parallel"
+    concurrent_windows = True
+
+
+BACKENDS = {
+    ExplorerBackend.name: ExplorerBackend,
+    SimulatedBackend.name: SimulatedBackend,
+    ParallelSimulatedBackend.name: ParallelSimulatedBackend,
+}
+
+
+def get_backend_class(name=None):
+    """Return the backend class with the given name (defaults to $FOLDER_OPENER_BACKEND or explorer)"""
+    name = name or os.environ.get("FOLDER_OPENER_BACKEND") or ExplorerBackend.name
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[name]
+
+
+def get_backend(name=None, pause=None, failsafe=None):
+    """Create the backend with the given name (defaults to $FOLDER_OPENER_BACKEND or explorer).
+
+    pause and failsafe set the input pacing (see pacing_options); None keeps the backend's default.
+    """
+    options = {key: value for key, value in (("pause", pause), ("failsafe", failsafe)) if value is not None}
+    return get_backend_class(name)(**options)
@@ -0,0 +1,88 @@
+# clock.py
+
+"""Version 1.1"""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class RealClock:
+    """Wall-clock time, real sleeps and timers"""
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, event, timeout):
+        """Wait until the threading.Event is set or the timeout passes. Returns True if it was set."""
+        return event.wait(timeout)
+
+    def call_later(self, seconds, callback):
+        """Call callback (on a timer thread) after the given number of seconds"""
+        timer = threading.Timer(seconds, callback)
+        timer.daemon = True
+        timer.start()
+
+
+class VirtualClock:
+    """A clock whose sleeps return immediately and only advance its time.
+
+    Lets the engine run with realistic timer settings in benchmarks without
+    waiting for them; the virtual time then shows how long the run would take.
+    Callbacks scheduled with call_later() run, in order of their due time, on the
+    thread that advances the clock past it, so timing scenarios replay exactly.
+    """
+
+    def __init__(self, start=0.0):
+        self.time = start
+        # Total time spent in sleep() and wait()
+        self.slept = 0.0
+        self._timers = []  # heap of (due, sequence, callback)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self._pass_time(seconds)
+
+    def wait(self, event, timeout):
+        """Advance to the moment the event is set by a scheduled callback, or by the whole timeout"""
+        if event.is_set():
+            return True
+        self._pass_time(timeout, event.is_set)
+        return event.is_set()
+
+    def call_later(self, seconds, callback):
+        with self._lock:
+            heapq.heappush(self._timers, (self.time + seconds, next(self._sequence), callback))
+
+    def advance(self, seconds, stop=None):
+        """Move the time forward, running the callbacks that fall due.
+
+        If stop is given, it is checked after each callback and ends the advance
+        at that callback's due time once it returns True.
+        """
+        with self._lock:
+            target = self.time + seconds
+        while True:
+            with self._lock:
+                if not self._timers or self._timers[0][0] > target:
+                    self.time = max(self.time, target)
+                    return
+                due, _, callback = heapq.heappop(self._timers)
+                self.time = max(self.time, due)
+            callback()
+            if stop is not None and stop():
+                return
+
+    def _pass_time(self, seconds, stop=None):
+        start = self.time
+        self.advance(seconds, stop)
+        with self._lock:
+            self.slept += self.time - start
@@ -0,0 +1,168 @@
+# eta.py
+
+"""Version 1.1"""
+
+import os
+import sqlite3
+import time
+
+from core.action_program import compile_run
+from core.run_events import RunEvent
+from core.run_history import RunHistory
+
+# Steps of one folder and the sleep timer that follows each of them (see core.action_program)
+FOLDER_STEPS = (
+    ("new_tab", "new_tab"),
+    ("focus_address_bar", "address_bar_focus"),
+    ("type_path", "after_typing"),
+    ("press_enter", "after_enter"),
+)
+LAUNCH_STEP = ("launch", "explorer_startup")
+
+
+def format_duration(seconds):
+    """Format a number of seconds as '45s', '3m 05s' or '1h 02m'"""
+    seconds = max(0, int(round(seconds)))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class RunEstimator:
+    """Predicts the duration of a run and the time left while it is in progress.
+
+    Each step is predicted as its configured wait plus the action overhead seen in
+    the history; a folder with its own history adds its median overhead to the
+    configured waits instead, so changed timers still change the prediction.
+    During the run, the ratio of measured to predicted time of the finished
+    folders scales the prediction of the remaining ones.
+
+    In several windows of a backend with concurrent_windows the waits of the
+    folders overlap: their predictions are then scaled by the ratio of the
+    compiled program's duration to that of the same run in a single window.
+    """
+
+    def __init__(self, folders, sleep_timers, step_history=None, folder_history=None,
+                 windows=1, max_tabs=0, concurrent=False, lanes=None):
+        self.folders = list(folders)
+        self.sleep_timers = sleep_timers
+        self.windows = windows
+        self.max_tabs = max_tabs
+        self.concurrent = concurrent
+        self.lanes = lanes
+        self.step_overhead = {
+            item["step"]: max(0.0, item["p50"] - item["expected_p50"])
+            for item in step_history or []
+            if item["expected_p50"] is not None
+        }
+        self.folder_overhead = {
+            item["folder"]: max(0.0, item["overhead_p50"])
+            for item in folder_history or []
+            if item.get("overhead_p50") is not None
+        }
+
+        self.retime(sleep_timers)
+
+        self.completed = 0
+        self.launched = False
+        self.predicted_done = 0.0
+        self.measured_done = 0.0
+        self.segment_start = None
+
+    @classmethod
+    def from_history(cls, folders, sleep_timers, history_path, last_runs=20, **layout):
+        """Create an estimator using the timings of the last runs (timers only if there is no history).
+
+        layout holds the windows, max_tabs, concurrent and lanes options of the run.
+        """
+        if not os.path.exists(history_path):
+            return cls(folders, sleep_timers, **layout)
+        try:
+            history = RunHistory(history_path)
+        except sqlite3.Error:
+            return cls(folders, sleep_timers, **layout)
+        try:
+            return cls(folders, sleep_timers, history.step_stats(last_runs), history.folder_stats(last_runs), **layout)
+        except sqlite3.Error:
+            return cls(folders, sleep_timers, **layout)
+        finally:
+            history.close()
+
+    def retime(self, sleep_timers):
+        """Predict the folders with changed sleep timers, e.g. after they were changed during the run"""
+        self.sleep_timers = sleep_timers
+        self.launch_prediction = self._predict_step(*LAUNCH_STEP)
+        self.predictions = [self._predict_folder(i, folder) for i, folder in enumerate(self.folders)]
+        self.overlap = self._overlap()
+
+    def _overlap(self):
+        """Share of the folders' sequential time the run takes, 1.0 unless the waits of its windows overlap"""
+        if not self.concurrent or not self.folders:
+            return 1.0
+        launch = self.launch_prediction
+        parallel = compile_run(self.folders, self.sleep_timers, self.windows, self.max_tabs, True,
+                               self.step_overhead, self.lanes).duration
+        sequential = compile_run(self.folders, self.sleep_timers, 1, 0, True, self.step_overhead, self.lanes).duration
+        if sequential <= launch:
+            return 1.0
+        return min(1.0, max(0.0, parallel - launch) / (sequential - launch))
+
+    def _predict_step(self, step, timer):
+        return self.sleep_timers.get(timer, 0) + self.step_overhead.get(step, 0.0)
+
+    def _predict_folder(self, index, folder):
+        steps = FOLDER_STEPS if index > 0 else FOLDER_STEPS[1:]
+        if folder in self.folder_overhead:
+            return sum(self.sleep_timers.get(timer, 0) for _, timer in steps) + self.folder_overhead[folder]
+        return sum(self._predict_step(step, timer) for step, timer in steps)
+
+    def predicted_total(self):
+        """Predicted duration of the whole run in seconds"""
+        return self.launch_prediction + sum(self.predictions) * self.overlap
+
+    def start(self, now=None):
+        """Mark the start of the run"""
+        self.segment_start = time.monotonic() if now is None else now
+
+    def handle(self, event, now=None):
+        """Update the estimate from a STEP or FOLDER event of the engine"""
+        now = time.monotonic() if now is None else now
+        if event.kind == RunEvent.STEP and event["index"] < 0:
+            self.launched = True
+            self._complete(self.launch_prediction, event["duration"], now)
+        elif event.kind == RunEvent.FOLDER:
+            index = event["index"]
+            if 0 <= index < len(self.predictions):
+                # Counted rather than taken from the index: folders in several windows finish out of order
+                self.completed += 1
+                self._complete(self.predictions[index], event["duration"], now)
+
+    def _complete(self, predicted, measured, now):
+        self.predicted_done += predicted
+        self.measured_done += measured
+        self.segment_start = now
+
+    def correction(self):
+        """Ratio of measured to predicted time so far (1.0 until something finished)"""
+        if self.predicted_done <= 0 or self.measured_done <= 0:
+            return 1.0
+        return self.measured_done / self.predicted_done
+
+    def remaining(self, now=None):
+        """Estimated seconds until the run finishes"""
+        now = time.monotonic() if now is None else now
+        segments = [prediction * self.overlap for prediction in self.predictions[self.completed:]]
+        if not self.launched:
+            segments = [self.launch_prediction] + segments
+        if not segments:
+            return 0.0
+        factor = self.correction()
+        # The segment in progress never counts for less than zero, even when it runs late
+        current = segments[0] * factor
+        if self.segment_start is not None:
+            current = max(0.0, current - (now - self.segment_start))
+        return current + sum(segments[1:]) * factor
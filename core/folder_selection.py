@@ -0,0 +1,23 @@
+# folder_selection.py
+
+"""Version 1.1"""
+
+import fnmatch
+import os
+
+
+def matches_pattern(folder, pattern):
+    """Check if a folder's full path or final component matches a glob pattern (case-insensitive)"""
+    pattern = os.path.normcase(pattern)
+    path = os.path.normcase(folder)
+    name = os.path.basename(path.rstrip("\\/"))
+    return fnmatch.fnmatchcase(path.lower(), pattern.lower()) or fnmatch.fnmatchcase(name.lower(), pattern.lower())
+
+
+def select_folders(folders, patterns=None, limit=None):
+    """Return the folders matching any of the patterns, in config order, capped at limit"""
+    selected = [folder for folder in folders
+                if not patterns or any(matches_pattern(folder, pattern) for pattern in patterns)]
+    if limit is not None:
+        selected = selected[:limit]
+    return selected
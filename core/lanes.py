@@ -0,0 +1,62 @@
+# lanes.py
+
+"""Version 1.1"""
+
+from core.folder_selection import matches_pattern
+
+PINNED, NORMAL, LAZY = "pinned", "normal", "lazy"
+LANES = (PINNED, NORMAL, LAZY)
+
+
+def lane_options(settings):
+    """Read (pinned patterns, lazy patterns, defer lazy, auto-close lane) from the "lanes" config section.
+
+    "lazy" folders open at the end of the run unless "lazy_mode" is "on_demand",
+    in which case they are left for the tray menu. Auto-close may trigger once
+    the "auto_close_after" lane is open (default: normal, before the lazy tail).
+    Invalid values are ignored.
+    """
+    settings = settings if isinstance(settings, dict) else {}
+
+    def patterns(key):
+        value = settings.get(key, [])
+        return [pattern for pattern in value if isinstance(pattern, str)] if isinstance(value, list) else []
+
+    auto_close_after = settings.get("auto_close_after", NORMAL)
+    if auto_close_after not in LANES:
+        auto_close_after = NORMAL
+    return patterns(PINNED), patterns(LAZY), settings.get("lazy_mode") == "on_demand", auto_close_after
+
+
+def folder_lane(folder, pinned=(), lazy=()):
+    """The lane of a folder; a folder matching both kinds of pattern is pinned"""
+    if any(matches_pattern(folder, pattern) for pattern in pinned):
+        return PINNED
+    if any(matches_pattern(folder, pattern) for pattern in lazy):
+        return LAZY
+    return NORMAL
+
+
+def lane_plan(folders, pinned=(), lazy=(), defer_lazy=False, order=None):
+    """Arrange a run lane by lane.
+
+    Returns (positions, lanes, deferred): the list positions of the folders to
+    open in run order, the (lane, folder count) of each non-empty lane in that
+    order, and the positions of the lazy folders left out of the run. order, if
+    given, reorders the folders of each lane (see core.ordering.locality_order).
+    """
+    members = {lane: [] for lane in LANES}
+    for index, folder in enumerate(folders):
+        members[folder_lane(folder, pinned, lazy)].append(index)
+
+    positions, lanes, deferred = [], [], []
+    for lane in LANES:
+        indices = members[lane]
+        if order and indices:
+            indices = [indices[i] for i in order([folders[j] for j in indices])]
+        if lane == LAZY and defer_lazy:
+            deferred = indices
+        elif indices:
+            positions.extend(indices)
+            lanes.append((lane, len(indices)))
+    return positions, lanes, deferred
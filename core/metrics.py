@@ -0,0 +1,206 @@
+# metrics.py
+
+"""Version 1.1"""
+
+import bisect
+import os
+import tempfile
+import threading
+
+from core.run_events import RunEvent
+
+STEP_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+RUN_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+STALL_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Without labels the counter is exported as 0 before its first increment
+        self.values = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self.values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram:
+    """Counts observations in cumulative buckets, with their sum and count, per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # label values -> [bucket counts..., sum, count]
+        self.values = {} if self.labelnames else {(): [0] * (len(self.buckets) + 2)}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self.values.items())
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append((f"{self.name}_bucket",
+                                _format_labels(self.labelnames, key, [("le", _format_value(bound))]), cumulative))
+            samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, key, [("le", "+Inf")]), state[-1]))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, key), state[-2]))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, key), state[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, buckets, labelnames=()):
+        return self._register(Histogram(name, documentation, buckets, labelnames))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the metrics atomically, as the node-exporter textfile collector expects"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+class RunMetrics:
+    """The launcher's metrics, fed with engine RunEvents.
+
+    handle() may be called from the thread running the engine; every metric
+    update takes a short lock, so the GUI or an HTTP thread can render at any time.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        self.runs = self.registry.counter(
+            "folder_opener_runs_total", "Finished runs by outcome", ["outcome"])
+        self.failures = self.registry.counter(
+            "folder_opener_failures_total", "Failed runs by error class", ["error_class"])
+        self.folders_opened = self.registry.counter(
+            "folder_opener_folders_opened_total", "Folders opened successfully")
+        self.folders_failed = self.registry.counter(
+            "folder_opener_folders_failed_total", "Folders whose opening failed")
+        self.run_duration = self.registry.histogram(
+            "folder_opener_run_duration_seconds", "Duration of finished runs", RUN_BUCKETS)
+        self.step_duration = self.registry.histogram(
+            "folder_opener_step_duration_seconds", "Duration of each step, including its configured wait",
+            STEP_BUCKETS, ["step"])
+        self.step_action_duration = self.registry.histogram(
+            "folder_opener_step_action_duration_seconds", "Duration of each step without its wait",
+            STEP_BUCKETS, ["step"])
+        self.gui_stalls = self.registry.counter(
+            "folder_opener_gui_stalls_total", "Times the GUI event loop was unresponsive")
+        self.gui_stall_duration = self.registry.histogram(
+            "folder_opener_gui_stall_duration_seconds", "Duration of GUI event loop stalls", STALL_BUCKETS)
+        self.run_started = None
+
+    def handle(self, event):
+        if event.kind == RunEvent.STEP:
+            self.step_duration.observe(event["duration"], step=event["step"])
+            self.step_action_duration.observe(event["action_duration"], step=event["step"])
+        elif event.kind == RunEvent.FOLDER:
+            if event["outcome"] == "ok":
+                self.folders_opened.inc()
+            else:
+                self.folders_failed.inc()
+        elif event.kind == RunEvent.STARTED:
+            self.run_started = event.timestamp
+        elif event.kind == RunEvent.FINISHED:
+            self.record_finished(event)
+
+    def record_finished(self, event):
+        if event.get("cancelled"):
+            outcome = "cancelled"
+        else:
+            outcome = "success" if event["success"] else "failure"
+        self.runs.inc(outcome=outcome)
+        if outcome == "failure":
+            self.failures.inc(error_class=event.get("error_class") or "unknown")
+        if self.run_started is not None:
+            self.run_duration.observe(event.timestamp - self.run_started)
+            self.run_started = None
+
+    def record_stall(self, duration_ms):
+        self.gui_stalls.inc()
+        self.gui_stall_duration.observe(duration_ms / 1000)
+
+    def render(self):
+        return self.registry.render()
+
+    def write_textfile(self, path):
+        self.registry.write_textfile(path)
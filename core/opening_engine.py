@@ -0,0 +1,303 @@
+# opening_engine.py
+
+"""Version 1.1"""
+
+import bisect
+import functools
+import threading
+
+from core.action_program import OPERATIONS, action_timers, compile_run
+from core.clock import RealClock
+from core.run_events import RunEvent
+from core.timing import TimingSettings
+
+
+class RunCancelled(Exception):
+    """Raised inside the engine when cancel() was called"""
+
+
+class FolderOpeningEngine:
+    """Opens a list of folders through a backend without depending on Qt.
+
+    Progress is reported as RunEvent objects through the on_event callback, which
+    lets the same engine drive the Qt thread and the headless command line mode.
+    The run is first compiled into an ActionProgram (see core.action_program),
+    which execute() then performs action by action. Waits end early when the run
+    is cancelled, so cancel() stops it within one backend action. An optional
+    FolderPrefetcher warms the next folders while the engine waits. lanes holds
+    the (lane, folder count) of consecutive parts of the folder list, each
+    reported with a LANE event once it is open.
+
+    sleep_timers is a dict or a core.timing.TimingSettings. The engine checks
+    the settings' version before every action, so timers changed while the run
+    is in progress apply from the next action on; the order of the actions
+    stays as compiled.
+    """
+
+    # Whether steps() yields each backend call (a function without arguments)
+    # for its driver to perform and send the result back, instead of calling it
+    offload_actions = False
+
+    def __init__(self, folders, sleep_timers, backend, on_event=None, clock=None, cancel_event=None,
+                 windows=1, max_tabs=0, prefetcher=None, lanes=None):
+        self.folders = folders
+        self.timing = TimingSettings.of(sleep_timers)
+        self._timing_version, self.sleep_timers = self.timing.snapshot()
+        # The waits of the changed timers, None while the compiled waits apply
+        self._timers = None
+        self.backend = backend
+        self.on_event = on_event
+        # Measures durations and performs the waits; a VirtualClock skips them in benchmarks
+        self.clock = clock or RealClock()
+        self.cancel_event = cancel_event or threading.Event()
+        self.windows = windows
+        self.max_tabs = max_tabs
+        self.prefetcher = prefetcher
+        self.lanes = lanes or []
+
+    def cancel(self):
+        """Stop the run before the next action (thread-safe)"""
+        self.cancel_event.set()
+
+    def emit(self, kind, **data):
+        if self.on_event:
+            self.on_event(RunEvent(kind, **data))
+
+    def log(self, message):
+        self.emit(RunEvent.LOG, message=message)
+
+    def finish(self, success, message, error_class=None, cancelled=False):
+        if success:
+            self.emit(RunEvent.FINISHED, success=success, message=message)
+        elif cancelled:
+            self.emit(RunEvent.FINISHED, success=success, message=message, cancelled=True)
+        else:
+            self.emit(RunEvent.FINISHED, success=success, message=message, error_class=error_class)
+        return success
+
+    def compile(self):
+        """Compile the configured run for this engine's backend"""
+        self._timing_version, self.sleep_timers = self.timing.snapshot()
+        self._timers = None
+        return compile_run(self.folders, self.sleep_timers, self.windows, self.max_tabs,
+                           getattr(self.backend, "concurrent_windows", False), lanes=self.lanes)
+
+    def run(self, program=None):
+        """Open all folders (or replay a compiled program) and return True if the run succeeded"""
+        steps = self.steps(program)
+        try:
+            wait = next(steps)
+            while True:
+                if self.clock.wait(self.cancel_event, wait):
+                    wait = steps.throw(RunCancelled())
+                else:
+                    wait = next(steps)
+        except StopIteration as done:
+            return done.value
+
+    def steps(self, program=None):
+        """The run as a generator that yields every wait in seconds and returns the run's result.
+
+        Whoever drives it performs the waits (run() on this thread, run_async() in
+        core.async_engine on an event loop) and throws RunCancelled into it to stop.
+        With offload_actions it also yields the backend calls, see act().
+        """
+        try:
+            program = program or self.compile()
+            if not program.total:
+                self.log("No folders found in config. Please add folders using the configuration tool.")
+                return self.finish(False, "No folders to open", "NoFolders")
+
+            if self.prefetcher:
+                self.prefetcher.start(program.folder_order())
+            try:
+                yield from self.execute(program)
+            finally:
+                if self.prefetcher:
+                    self.prefetcher.stop()
+
+            self.emit(RunEvent.PROGRESS, index=program.total, total=program.total, folder=None)
+            if self.prefetcher:
+                count, seconds, failures = self.prefetcher.summary()
+                self.log(f"Prefetched {count} folders ahead of the run ({seconds:.2f}s of first access, "
+                         f"{failures} unreachable)")
+            if self._steps:
+                self.log(self.pacing_summary())
+            self.log("All folders opened successfully!")
+            return self.finish(True, "All folders opened successfully!")
+
+        except RunCancelled:
+            self.log("Folder opening cancelled.")
+            return self.finish(False, "Cancelled", cancelled=True)
+        except Exception as e:
+            self.log(f"Error: {str(e)}")
+            return self.finish(False, str(e), type(e).__name__)
+
+    def execute(self, program):
+        """Perform the actions of a program in order, yielding the waits between them.
+
+        A wait marked as overlapping only holds back the next action on the same
+        window; its step (and folder) is reported once the wait has run out.
+        """
+        if program.addressed and not getattr(self.backend, "concurrent_windows", False):
+            raise ValueError(f"The '{self.backend.name}' backend cannot address several windows at once")
+
+        total = program.total
+        if program.windows > 1:
+            self.emit(RunEvent.STARTED, total=total, windows=program.windows)
+            self.log(f"Starting to open {total} folders in {program.windows} windows...")
+        else:
+            self.emit(RunEvent.STARTED, total=total)
+            self.log(f"Starting to open {total} folders...")
+
+        self._lane_ends = []
+        for _, count in self.lanes:
+            self._lane_ends.append((self._lane_ends[-1] if self._lane_ends else 0) + count)
+        self._lanes_left = [count for _, count in self.lanes]
+        self._next_lane = 0
+
+        # Measured against configured time of the reported steps, for pacing_summary()
+        self._steps = 0
+        self._step_time = 0.0
+        self._configured_time = 0.0
+        self._paced_steps = 0
+        pause = getattr(self.backend, "pause", 0.0)
+        if pause:
+            self.log(f"Input pause: {pause}s after each keystroke (input_pacing.pause)")
+
+        handles = {}
+        ready = {}
+        pending = {}
+        folder_start = {}
+        started = 0
+        for action in program.actions:
+            # A focus switch does not wait for the window: its own wait runs while the window loads
+            if action.op != "focus_window":
+                remaining = ready.get(action.window, 0.0) - self.clock.now()
+                if remaining > 0:
+                    yield remaining
+            self.complete_waits(pending, ready, folder_start)
+
+            if action.begins_folder:
+                self.emit(RunEvent.PROGRESS, index=started, total=total, folder=action.folder)
+                if self.prefetcher:
+                    self.prefetcher.advance(started)
+                started += 1
+                in_window = f" in window {action.window + 1}" if action.window is not None else ""
+                self.log(f"Opening folder {started}/{total}{in_window}: {action.folder}")
+                folder_start[action.window] = (action.index, self.clock.now())
+
+            wait = self.wait_for(action)
+            try:
+                start, action_duration = yield from self.act(action, handles, program.addressed)
+                if action.overlap:
+                    self.log(f"Waiting {wait}s {action.wait_description} (window {action.window + 1})")
+                    pending[action.window] = (action, start, action_duration, wait)
+                    ready[action.window] = self.clock.now() + wait
+                else:
+                    yield wait
+                    self.log(f"Waiting {wait}s {action.wait_description}")
+                    self.report(action, start, action_duration, wait, folder_start)
+            except RunCancelled:
+                # An interrupted folder is not reported, so it does not skew the timing history
+                raise
+            except Exception:
+                index, begun = folder_start.get(action.window, (None, None))
+                if action.index >= 0 and index == action.index:
+                    self.emit(RunEvent.FOLDER, index=index, folder=action.folder, outcome="error",
+                              duration=self.clock.now() - begun)
+                raise
+
+        while pending:
+            remaining = min(ready[window] for window in pending) - self.clock.now()
+            if remaining > 0:
+                yield remaining
+            self.complete_waits(pending, ready, folder_start)
+
+    def wait_for(self, action):
+        """The wait after an action: the compiled one, or the current timer once the timing settings changed"""
+        if self.timing.version != self._timing_version:
+            self._timing_version, timers = self.timing.snapshot()
+            changes = ", ".join(f"{name} {value}s" for name, value in timers.items()
+                                if self.sleep_timers.get(name) != value)
+            self.sleep_timers = timers
+            self._timers = action_timers(timers)
+            if changes:
+                self.log(f"Timers changed during the run (version {self._timing_version}): {changes}")
+        return action.wait if self._timers is None else self._timers[OPERATIONS[action.op][1]]
+
+    def act(self, action, handles, addressed):
+        """Perform one backend action and return (start, action duration).
+
+        A generator for execute(): with offload_actions it yields the backend call
+        and gets the call's result sent back, otherwise it calls the backend itself.
+        """
+        if self.cancel_event.is_set():
+            raise RunCancelled()
+        self.log(action.message)
+        start = self.clock.now()
+        call = self.backend_call(action, handles, addressed)
+        try:
+            result = (yield call) if self.offload_actions else call()
+            if action.op == "open_window":
+                handles[action.window] = result
+        except RunCancelled:
+            raise
+        except Exception:
+            duration = self.clock.now() - start
+            self.emit(RunEvent.STEP, index=action.index, folder=action.folder, step=action.step, outcome="error",
+                      duration=duration, action_duration=duration, expected=self.wait_for(action))
+            raise
+        return start, self.clock.now() - start
+
+    def backend_call(self, action, handles, addressed):
+        """The backend method call of an action, as a function without arguments"""
+        if action.op == "launch":
+            return self.backend.launch
+        if action.op == "open_window":
+            return self.backend.open_window
+        if action.op == "focus_window":
+            return functools.partial(self.backend.focus_window, handles[action.window])
+        target = {"window": handles[action.window]} if addressed else {}
+        args = (action.folder,) if action.op == "type_path" else ()
+        return functools.partial(getattr(self.backend, action.op), *args, **target)
+
+    def report(self, action, start, action_duration, wait, folder_start):
+        """Report a step whose wait of `wait` seconds is over, and its folder if it was the last step"""
+        now = self.clock.now()
+        self.emit(RunEvent.STEP, index=action.index, folder=action.folder, step=action.step, outcome="ok",
+                  duration=now - start, action_duration=action_duration, expected=wait)
+        self._steps += 1
+        self._step_time += now - start
+        self._configured_time += wait
+        if action.op in getattr(self.backend, "paced_operations", ()):
+            self._paced_steps += 1
+        if action.ends_folder:
+            index, begun = folder_start[action.window]
+            self.emit(RunEvent.FOLDER, index=index, folder=action.folder, outcome="ok", duration=now - begun)
+            if self.lanes:
+                self.complete_lane_folder(index)
+
+    def pacing_summary(self):
+        """Describe how much longer the steps took than their configured delays, and how much of it is input pause"""
+        overhead = self._step_time - self._configured_time
+        summary = (f"Steps took {self._step_time:.2f}s against {self._configured_time:.2f}s of configured delays: "
+                   f"{overhead:.2f}s of overhead ({overhead / self._steps:.3f}s per step)")
+        pause = getattr(self.backend, "pause", 0.0)
+        if pause and self._paced_steps:
+            summary += f", {pause * self._paced_steps:.2f}s of it from the {pause}s input pause"
+        return summary
+
+    def complete_lane_folder(self, index):
+        """Count an opened folder against its lane and report the lanes that are now open, in lane order"""
+        self._lanes_left[bisect.bisect_right(self._lane_ends, index)] -= 1
+        while self._next_lane < len(self.lanes) and not self._lanes_left[self._next_lane]:
+            lane, count = self.lanes[self._next_lane]
+            self.emit(RunEvent.LANE, lane=lane, count=count)
+            self._next_lane += 1
+
+    def complete_waits(self, pending, ready, folder_start):
+        """Report the overlapping waits that have run out, in the order they ended"""
+        now = self.clock.now()
+        for window in sorted((w for w in pending if ready[w] <= now), key=lambda w: ready[w]):
+            self.report(*pending.pop(window), folder_start)
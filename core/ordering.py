@@ -0,0 +1,82 @@
+# ordering.py
+
+"""Version 1.1"""
+
+import functools
+import itertools
+import ntpath
+import sys
+
+from core.folder_selection import matches_pattern
+
+# Location kinds, in the order they are opened: local disks answer first
+LOCAL, MAPPED, NETWORK = 0, 1, 2
+DRIVE_REMOTE = 4  # GetDriveTypeW result of a mapped network drive
+
+
+def ordering_options(settings):
+    """Read (optimize, keep_order patterns) from the "ordering" config section, ignoring invalid values"""
+    settings = settings if isinstance(settings, dict) else {}
+    optimize = settings.get("optimize", False)
+    keep_order = settings.get("keep_order", [])
+    if not isinstance(keep_order, list):
+        keep_order = []
+    return optimize is True, [pattern for pattern in keep_order if isinstance(pattern, str)]
+
+
+@functools.lru_cache(maxsize=None)
+def drive_is_remote(drive):
+    """Whether a drive letter is mapped to a network share (always False outside Windows)"""
+    if sys.platform != "win32":
+        return False
+    import ctypes
+    return ctypes.windll.kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE
+
+
+def location(path):
+    """(kind, host, path components) of a folder path.
+
+    The host is the server of a UNC path and the drive otherwise; the components
+    start with the share or drive, so folders on one volume share a prefix.
+    """
+    drive, rest = ntpath.splitdrive(ntpath.normcase(ntpath.normpath(path)))
+    parts = [part for part in rest.split("\\") if part]
+    if drive.startswith("\\\\"):
+        host = drive[2:].split("\\", 1)[0]
+        return NETWORK, host, [drive] + parts
+    kind = MAPPED if drive and drive_is_remote(drive) else LOCAL
+    return kind, drive, [drive] + parts
+
+
+def locality_order(folders, keep_order=()):
+    """Return the folder indices in the order that keeps each location together.
+
+    Local folders come first, then mapped drives, then UNC shares. Folders on
+    the same host, volume and parent directory are opened one after another,
+    and the groups keep the order in which the list first mentions them, so
+    a list that is already grouped is left as it is. Folders matching a
+    keep_order pattern stay at their list position and the others are placed
+    around them. Runs in O(n * path depth) plus one sort.
+    """
+    first_seen = itertools.count()
+    hosts = {}
+    # Path component -> (when it was first seen, its subdirectories), one level per component
+    tree = {}
+    keys = []
+    for index, folder in enumerate(folders):
+        kind, host, parts = location(folder)
+        if (kind, host) not in hosts:
+            hosts[kind, host] = next(first_seen)
+        key = [kind, hosts[kind, host]]
+        level = tree
+        for part in parts:
+            if part not in level:
+                level[part] = (next(first_seen), {})
+            seen, level = level[part]
+            key.append(seen)
+        # A folder sorts before its subfolders; duplicates keep their list order
+        keys.append((key, index))
+
+    pinned = [any(matches_pattern(folder, pattern) for pattern in keep_order) for folder in folders]
+    movable = iter(index for key, index in sorted(keys) if not pinned[index])
+    return [index if pinned[index] else next(movable) for index in range(len(folders))]
@@ -0,0 +1,120 @@
+# prefetch.py
+
+"""Version 1.1"""
+
+import os
+import threading
+import time
+
+from core.profiling import profile_thread
+
+DEFAULT_DEPTH = 1
+DEFAULT_SCAN_LIMIT = 256
+
+
+def prefetch_options(settings):
+    """Read (depth, scan_limit) from the "prefetch" config section, ignoring invalid values.
+
+    A depth of 0 turns prefetching off.
+    """
+    settings = settings if isinstance(settings, dict) else {}
+
+    def non_negative_int(key, default):
+        value = settings.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            return default
+        return value
+
+    return non_negative_int("depth", DEFAULT_DEPTH), non_negative_int("scan_limit", DEFAULT_SCAN_LIMIT)
+
+
+def prefetch_folder(path, scan_limit=DEFAULT_SCAN_LIMIT):
+    """Touch a folder the way the file manager is about to and return the number of entries read.
+
+    Resolving and stating the path connects a network share or triggers an
+    automount; reading the start of the listing fills the directory cache
+    the file manager renders from.
+    """
+    resolved = os.path.realpath(path)
+    os.stat(resolved)
+    count = 0
+    with os.scandir(resolved) as entries:
+        for entry in entries:
+            if count >= scan_limit:
+                break
+            entry.is_dir()
+            count += 1
+    return count
+
+
+class FolderPrefetcher:
+    """Warms folders a few positions ahead of the run on a background thread.
+
+    The engine calls start() with the folders in the order it will open them
+    and advance() whenever it begins one, which lets the worker touch up to
+    `depth` folders past it while the engine sleeps between keystrokes.
+    Failures are recorded, never raised: a folder that cannot be prefetched
+    is still opened and fails (or succeeds) there.
+    """
+
+    def __init__(self, depth=DEFAULT_DEPTH, scan_limit=DEFAULT_SCAN_LIMIT, touch=None):
+        self.depth = depth
+        self.scan_limit = scan_limit
+        # Replaceable so benchmarks can simulate slow first access
+        self.touch = touch or (lambda path: prefetch_folder(path, self.scan_limit))
+        self.folders = []
+        # Position in the run -> (seconds spent, error message or None)
+        self.results = {}
+        self._next = 0
+        self._allowed = -1
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self, folders):
+        """Start warming the first `depth` folders of a run"""
+        with self._condition:
+            self.folders = list(folders)
+            self.results = {}
+            self._next = 0
+            self._allowed = self.depth - 1
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="FolderPrefetcher", daemon=True)
+        self._thread.start()
+
+    def advance(self, position):
+        """The run began the folder at `position`; allow the worker to go `depth` folders past it"""
+        with self._condition:
+            if position + self.depth > self._allowed:
+                self._allowed = position + self.depth
+                self._condition.notify()
+
+    def stop(self):
+        """Stop after the folder being touched; does not wait for a share that hangs"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def summary(self):
+        """(folders prefetched, seconds of first access taken off the run, failures)"""
+        results = list(self.results.values())
+        return len(results), sum(seconds for seconds, _ in results), sum(error is not None for _, error in results)
+
+    def _run(self):
+        with profile_thread("FolderPrefetcher"):
+            while True:
+                with self._condition:
+                    while not self._stopped and (self._next > self._allowed or self._next >= len(self.folders)):
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    position = self._next
+                    self._next += 1
+
+                start = time.perf_counter()
+                error = None
+                try:
+                    self.touch(self.folders[position])
+                except OSError as e:
+                    error = str(e)
+                self.results[position] = (time.perf_counter() - start, error)
@@ -0,0 +1,166 @@
+# profiling.py
+
+"""Version 1.1"""
+
+import cProfile
+import collections
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_SAMPLE_RATE = 100  # samples per second
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler(threading.Thread):
+    """Samples the stacks of all threads at a fixed rate and counts them as collapsed stacks.
+
+    The output has one "thread;outer;...;inner count" line per distinct stack, the
+    format read by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, rate=DEFAULT_SAMPLE_RATE, thread_names=None):
+        super().__init__(name="SamplingProfiler", daemon=True)
+        self.interval = 1.0 / max(1, rate)
+        self.thread_names = thread_names if thread_names is not None else {}
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            names.update(self.thread_names)
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """Profiles the GUI or command line session and every thread wrapped in thread().
+
+    In "cprofile" mode each thread gets its own cProfile.Profile, dumped as a
+    .pstats file when the thread (or the session, for the main thread) ends. In
+    "sample" mode a SamplingProfiler covers all threads and writes one
+    .collapsed file when profiling stops.
+    """
+
+    def __init__(self, mode, output_dir, rate=DEFAULT_SAMPLE_RATE):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Available: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.rate = rate
+        self.prefix = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.thread_names = {}
+        self.written = []
+        self._lock = threading.Lock()
+        self._session_profile = None
+        self._sampler = None
+
+    def _path(self, name, extension):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock:
+            path = os.path.join(self.output_dir, f"{self.prefix}-{name}-{len(self.written)}{extension}")
+            self.written.append(path)
+        return path
+
+    def start(self):
+        """Start profiling the calling (main) thread, or all threads when sampling"""
+        self.thread_names[threading.get_ident()] = "MainThread"
+        if self.mode == "cprofile":
+            self._session_profile = cProfile.Profile()
+            self._session_profile.enable()
+        else:
+            self._sampler = SamplingProfiler(self.rate, self.thread_names)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop profiling and write the session output. Returns the paths of all written files."""
+        if self._session_profile is not None:
+            self._session_profile.disable()
+            self._session_profile.dump_stats(self._path("session", ".pstats"))
+            self._session_profile = None
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler.write(self._path("samples", ".collapsed"))
+            self._sampler = None
+        return list(self.written)
+
+    @contextmanager
+    def thread(self, name):
+        """Profile the body as the named thread (only the name is recorded when sampling)"""
+        ident = threading.get_ident()
+        self.thread_names[ident] = name
+        profile = None
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows a single active cProfile; the session profile covers this thread
+                profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(self._path(name, ".pstats"))
+            self.thread_names.pop(ident, None)
+
+
+_active_profiler = None
+
+
+def start_profiling(mode, output_dir, rate=DEFAULT_SAMPLE_RATE):
+    """Start the process-wide profiler. Raises ValueError for an unknown mode."""
+    global _active_profiler
+    if _active_profiler is None:
+        _active_profiler = Profiler(mode, output_dir, rate)
+        _active_profiler.start()
+    return _active_profiler
+
+
+def stop_profiling():
+    """Stop the process-wide profiler and return the written files (empty if it was not running)"""
+    global _active_profiler
+    if _active_profiler is None:
+        return []
+    profiler, _active_profiler = _active_profiler, None
+    return profiler.stop()
+
+
+@contextmanager
+def profile_thread(name):
+    """Profile a worker thread body if profiling is active; no-op otherwise"""
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+    with profiler.thread(name):
+        yield
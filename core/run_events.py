@@ -0,0 +1,46 @@
+# run_events.py
+
+"""Version 1.1"""
+
+import time
+
+
+class RunEvent:
+    """A progress notification emitted by the folder opening engine.
+
+    STEP events carry the measured duration of one action plus its wait, of the
+    action alone ("action_duration") and the configured wait ("expected"); a
+    FOLDER event follows the steps of each folder. When a run is split into
+    lanes, a LANE event names each lane ("lane", "count") once its folders and
+    those of the lanes before it are open. QUEUE events list the runs waiting
+    after the current one ("queued"). A failed FINISHED event names
+    the kind of error in "error_class", or has "cancelled" set when the run was
+    cancelled.
+    """
+
+    STARTED = "started"
+    LOG = "log"
+    PROGRESS = "progress"
+    STEP = "step"
+    FOLDER = "folder"
+    LANE = "lane"
+    QUEUE = "queue"
+    FINISHED = "finished"
+
+    def __init__(self, kind, **data):
+        self.kind = kind
+        self.data = data
+        self.timestamp = time.time()
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the event"""
+        return {"event": self.kind, "time": round(self.timestamp, 6), **self.data}
+
+    def __repr__(self):
+        return f"RunEvent({self.kind!r}, {self.data!r})"
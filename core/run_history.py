@@ -0,0 +1,210 @@
+# run_history.py
+
+"""Version 1.1"""
+
+import json
+import sqlite3
+import time
+import uuid
+
+from core.run_events import RunEvent
+from core.stats import percentile
+
+
+class RunHistory:
+    """SQLite store of past runs with per-folder and per-step timings"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            started REAL NOT NULL,
+            finished REAL,
+            backend TEXT,
+            settings TEXT,
+            total INTEGER,
+            success INTEGER,
+            message TEXT
+        );
+        CREATE TABLE IF NOT EXISTS folder_results (
+            run_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            folder TEXT NOT NULL,
+            duration REAL NOT NULL,
+            outcome TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS step_results (
+            run_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            step TEXT NOT NULL,
+            duration REAL NOT NULL,
+            expected REAL,
+            outcome TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS folder_results_run ON folder_results (run_id);
+        CREATE INDEX IF NOT EXISTS step_results_run ON step_results (run_id);
+    """
+
+    # Oldest runs beyond this count are deleted when a run finishes
+    MAX_RUNS = 500
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def begin_run(self, backend, settings, total):
+        """Record the start of a run and return its id"""
+        run_id = uuid.uuid4().hex[:12]
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs (id, started, backend, settings, total) VALUES (?, ?, ?, ?, ?)",
+                (run_id, time.time(), backend, json.dumps(settings), total)
+            )
+        return run_id
+
+    def record_folder(self, run_id, index, folder, duration, outcome, steps):
+        """Write one folder and its (step, duration, expected, outcome) tuples in a single transaction"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO folder_results (run_id, idx, folder, duration, outcome) VALUES (?, ?, ?, ?, ?)",
+                (run_id, index, folder, duration, outcome)
+            )
+            self.connection.executemany(
+                "INSERT INTO step_results (run_id, idx, step, duration, expected, outcome) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, index, step, step_duration, expected, step_outcome)
+                 for step, step_duration, expected, step_outcome in steps]
+            )
+
+    def finish_run(self, run_id, success, message):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE runs SET finished = ?, success = ?, message = ? WHERE id = ?",
+                (time.time(), int(success), message, run_id)
+            )
+            self._prune()
+
+    def _prune(self):
+        old_runs = "SELECT id FROM runs ORDER BY started DESC LIMIT -1 OFFSET ?"
+        for table in ("step_results", "folder_results"):
+            self.connection.execute(f"DELETE FROM {table} WHERE run_id IN ({old_runs})", (self.MAX_RUNS,))
+        self.connection.execute(f"DELETE FROM runs WHERE id IN ({old_runs})", (self.MAX_RUNS,))
+
+    def recent_runs(self, limit=20):
+        """Return the latest runs, newest first"""
+        rows = self.connection.execute(
+            "SELECT id, started, finished, backend, total, success, message FROM runs "
+            "ORDER BY started DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [
+            {"run_id": run_id, "started": started, "finished": finished, "backend": backend, "total": total,
+             "success": None if success is None else bool(success), "message": message,
+             "duration": finished - started if finished else None}
+            for run_id, started, finished, backend, total, success, message in rows
+        ]
+
+    def _grouped(self, query, last_runs):
+        groups = {}
+        for key, duration, *extra in self.connection.execute(query, (last_runs,)):
+            groups.setdefault(key, []).append((duration, *extra))
+        return groups
+
+    def step_stats(self, last_runs=20):
+        """p50/p95 of each step over the last N runs, slowest total first.
+
+        overhead_p50 is the median time a step took beyond its configured delay
+        (the action itself, input pause and file manager response).
+        """
+        groups = self._grouped(
+            "SELECT step, duration, expected, outcome FROM step_results WHERE run_id IN "
+            "(SELECT id FROM runs ORDER BY started DESC LIMIT ?)", last_runs
+        )
+        stats = []
+        for step, rows in groups.items():
+            durations = [row[0] for row in rows]
+            expected = [row[1] for row in rows if row[1] is not None]
+            overhead = [row[0] - row[1] for row in rows if row[1] is not None]
+            stats.append({
+                "step": step,
+                "count": len(rows),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "total": sum(durations),
+                "expected_p50": percentile(expected, 50),
+                "overhead_p50": percentile(overhead, 50),
+                "failures": sum(1 for row in rows if row[2] != "ok"),
+            })
+        return sorted(stats, key=lambda item: item["total"], reverse=True)
+
+    def folder_stats(self, last_runs=20):
+        """p50/p95 of each folder over the last N runs, slowest p95 first.
+
+        overhead_p50 is the median time a folder took beyond the configured
+        delays of its steps, so it still applies after the timers changed.
+        """
+        groups = self._grouped(
+            "SELECT f.folder, f.duration, f.outcome, SUM(s.expected) FROM folder_results f "
+            "LEFT JOIN step_results s ON s.run_id = f.run_id AND s.idx = f.idx "
+            "WHERE f.idx >= 0 AND f.run_id IN (SELECT id FROM runs ORDER BY started DESC LIMIT ?) "
+            "GROUP BY f.rowid", last_runs
+        )
+        stats = []
+        for folder, rows in groups.items():
+            durations = [row[0] for row in rows]
+            overhead = [row[0] - row[2] for row in rows if row[2] is not None]
+            stats.append({
+                "folder": folder,
+                "count": len(rows),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "overhead_p50": percentile(overhead, 50),
+                "failures": sum(1 for row in rows if row[1] != "ok"),
+            })
+        return sorted(stats, key=lambda item: item["p95"], reverse=True)
+
+
+class RunHistoryRecorder:
+    """Engine event listener that stores a run in the RunHistory.
+
+    Steps are buffered by the folder index of their action and written with
+    that folder, so the steps of folders opened in several windows at once are
+    not mixed up. Storage errors disable the recorder instead of failing the run.
+    """
+
+    def __init__(self, history_path, backend, settings, total):
+        self.history = None
+        self.run_id = None
+        # Folder index -> (step, duration, expected, outcome) of its steps so far
+        self.steps = {}
+        try:
+            self.history = RunHistory(history_path)
+            self.run_id = self.history.begin_run(backend, settings, total)
+        except sqlite3.Error:
+            self.close()
+
+    def handle(self, event):
+        if self.history is None:
+            return
+        try:
+            if event.kind == RunEvent.STEP:
+                step = (event["step"], event["duration"], event["expected"], event["outcome"])
+                if event["index"] < 0:
+                    # Steps that belong to no folder (launching the file manager, opening a window) are folder -1
+                    self.history.record_folder(self.run_id, -1, "", event["duration"], event["outcome"], [step])
+                else:
+                    self.steps.setdefault(event["index"], []).append(step)
+            elif event.kind == RunEvent.FOLDER:
+                self.history.record_folder(self.run_id, event["index"], event["folder"], event["duration"],
+                                           event["outcome"], self.steps.pop(event["index"], []))
+            elif event.kind == RunEvent.FINISHED:
+                self.history.finish_run(self.run_id, event["success"], event["message"])
+                self.close()
+        except sqlite3.Error:
+            self.close()
+
+    def close(self):
+        if self.history is not None:
+            self.history.close()
+            self.history = None
@@ -0,0 +1,140 @@
+# run_queue.py
+
+"""Version 1.1"""
+
+import heapq
+import itertools
+
+# Where a run request comes from; lower priorities run first
+MANUAL, CONTROL, SCHEDULE = "manual", "control", "schedule"
+PRIORITIES = {MANUAL: 0, CONTROL: 1, SCHEDULE: 2}
+
+# What happens to a request that arrives while a run is in progress
+QUEUE, REJECT = "queue", "reject"
+POLICIES = (QUEUE, REJECT)
+DEFAULT_MAX_PENDING = 10
+
+# Outcomes of RunQueue.offer()
+START, QUEUED, MERGED, DUPLICATE, REJECTED = "start", "queued", "merged", "duplicate", "rejected"
+
+
+def queue_options(settings):
+    """Read (policy, merge, max pending) from the "run_queue" config section, ignoring invalid values"""
+    settings = settings if isinstance(settings, dict) else {}
+    policy = settings.get("policy", QUEUE)
+    if policy not in POLICIES:
+        policy = QUEUE
+    max_pending = settings.get("max_pending", DEFAULT_MAX_PENDING)
+    if isinstance(max_pending, bool) or not isinstance(max_pending, int) or max_pending < 0:
+        max_pending = DEFAULT_MAX_PENDING
+    return policy, settings.get("merge", True) is not False, max_pending
+
+
+class RunRequest:
+    """A request to open folders: the list of a profile, or an ad-hoc list when profile is None.
+
+    Requests with the same key (the profile, else the exact folder list) are
+    merged instead of queued twice. use_lanes=False opens the folders as listed.
+    """
+
+    def __init__(self, folders, profile=None, source=MANUAL, use_lanes=True):
+        self.folders = list(folders)
+        self.profile = profile
+        self.source = source
+        self.priority = PRIORITIES.get(source, PRIORITIES[SCHEDULE])
+        self.use_lanes = use_lanes
+        self.key = (profile, use_lanes) if profile else (tuple(self.folders), use_lanes)
+        self.id = None
+        self.merged = 0
+
+    def covers(self, other):
+        """Whether this request opens every folder of `other`"""
+        return self.key == other.key and set(other.folders) <= set(self.folders)
+
+    def merge(self, other):
+        """Take over the folders of `other` that this request does not open yet, and its priority"""
+        known = set(self.folders)
+        self.folders.extend(folder for folder in other.folders if folder not in known)
+        self.priority = min(self.priority, other.priority)
+        self.merged += 1 + other.merged
+
+    def describe(self):
+        name = self.profile or f"{self.source} run"
+        return f"{name} ({len(self.folders)} folders)"
+
+    def to_dict(self):
+        return {"run_id": self.id, "profile": self.profile, "source": self.source, "total": len(self.folders)}
+
+
+class RunQueue:
+    """Pending run requests: by priority, first come first served within a priority"""
+
+    def __init__(self, policy=QUEUE, merge=True, max_pending=DEFAULT_MAX_PENDING):
+        self.policy = policy
+        self.merge = merge
+        self.max_pending = max_pending
+        self._heap = []
+        self._counter = itertools.count()
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def offer(self, request, busy, running=None):
+        """Decide what to do with a new request; returns (outcome, request that carries it).
+
+        START means the caller runs the request now. A request is merged into
+        the pending one with the same key, or dropped as a DUPLICATE when the
+        running request already covers it. The others queue unless the policy
+        rejects requests during a run or max_pending are already waiting.
+        START and QUEUED requests get a new id; the others report the id of
+        the request they were folded into.
+        """
+        if not busy and not self._heap:
+            request.id = next(self._ids)
+            return START, request
+        if self.merge:
+            if running is not None and running.covers(request):
+                return DUPLICATE, running
+            for _, _, pending in self._heap:
+                if pending.key == request.key:
+                    pending.merge(request)
+                    self._reorder()
+                    return MERGED, pending
+        if self.policy == REJECT or len(self._heap) >= self.max_pending:
+            return REJECTED, request
+        request.id = next(self._ids)
+        heapq.heappush(self._heap, (request.priority, next(self._counter), request))
+        return QUEUED, request
+
+    def pop(self):
+        """Remove and return the next request to run, or None"""
+        return heapq.heappop(self._heap)[2] if self._heap else None
+
+    def pending(self):
+        """The waiting requests in run order"""
+        return [request for _, _, request in sorted(self._heap)]
+
+    def position(self, request):
+        """1-based place of a waiting request in the run order"""
+        return self.pending().index(request) + 1
+
+    def remove(self, request_id):
+        """Drop a waiting request; returns it, or None if no request has that id"""
+        for entry in self._heap:
+            if entry[2].id == request_id:
+                self._heap.remove(entry)
+                heapq.heapify(self._heap)
+                return entry[2]
+        return None
+
+    def clear(self):
+        """Drop every waiting request and return how many there were"""
+        count = len(self._heap)
+        self._heap = []
+        return count
+
+    def _reorder(self):
+        # A merge may raise the priority of a waiting request
+        self._heap = [(request.priority, order, request) for _, order, request in self._heap]
+        heapq.heapify(self._heap)
@@ -0,0 +1,208 @@
+# schedule.py
+
+"""Version 1.1"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+
+
+class CronExpression:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept *, numbers, ranges (a-b), steps (*/n, a-b/n), comma separated lists and
+    three-letter month/day names. Day-of-week 0 and 7 are Sunday. As in cron, when both
+    day fields are restricted a day matches if either of them matches.
+    """
+
+    MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+    DAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+    # Searching further than this means the expression can never match (e.g. 30 February)
+    MAX_SEARCH_DAYS = 366 * 5
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+
+        self.minutes = self._parse_field(fields[0], 0, 59)
+        self.hours = self._parse_field(fields[1], 0, 23)
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12, self.MONTH_NAMES)
+        weekdays = self._parse_field(fields[4], 0, 7, self.DAY_NAMES)
+        self.weekdays = {day % 7 for day in weekdays}
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(field, low, high, names=None):
+        values = set()
+        for part in field.lower().split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid step in cron field '{field}'")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start = CronExpression._parse_value(start_text, names)
+                end = CronExpression._parse_value(end_text, names)
+            else:
+                start = CronExpression._parse_value(part, names)
+                end = high if step > 1 else start
+
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field '{field}' is outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    @staticmethod
+    def _parse_value(text, names):
+        if names and text in names:
+            return names[text]
+        return int(text)
+
+    def _day_matches(self, moment):
+        day_match = moment.day in self.days
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, moment):
+        """Return the first matching minute strictly after moment (a naive local datetime)"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=self.MAX_SEARCH_DAYS)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+class ScheduleRule:
+    """A named rule that triggers a run of a profile on a cron expression or a fixed interval"""
+
+    def __init__(self, name, profile="default", cron=None, interval_minutes=None, catch_up=True):
+        if (cron is None) == (interval_minutes is None):
+            raise ValueError(f"Schedule '{name}' needs either 'cron' or 'interval_minutes'")
+        if interval_minutes is not None and interval_minutes <= 0:
+            raise ValueError(f"Schedule '{name}' needs a positive 'interval_minutes'")
+
+        self.name = name
+        self.profile = profile
+        self.cron = CronExpression(cron) if cron is not None else None
+        self.interval = interval_minutes * 60 if interval_minutes is not None else None
+        self.catch_up = catch_up
+
+    @classmethod
+    def from_config(cls, entry):
+        """Build a rule from a config entry such as {"name": ..., "cron": "30 8 * * 1-5"}"""
+        return cls(
+            entry.get("name") or entry.get("cron") or f"every {entry.get('interval_minutes')} min",
+            profile=entry.get("profile", "default"),
+            cron=entry.get("cron"),
+            interval_minutes=entry.get("interval_minutes"),
+            catch_up=entry.get("catch_up", True)
+        )
+
+    def next_due(self, after, previous_due=None):
+        """Return the next due timestamp strictly after the timestamp `after`"""
+        if self.cron is not None:
+            return self.cron.next_after(datetime.fromtimestamp(after)).timestamp()
+
+        # Intervals stay anchored to the previous due time so they do not drift
+        if previous_due is None:
+            return after + self.interval
+        skipped = int((after - previous_due) // self.interval) + 1
+        return previous_due + skipped * self.interval
+
+
+class ScheduleTrigger:
+    """A rule that became due: missed counts the occurrences coalesced into this trigger"""
+
+    def __init__(self, rule, due, missed):
+        self.rule = rule
+        self.due = due
+        self.missed = missed
+
+
+class RunScheduler:
+    """Min-heap of (next due time, rule) so only the earliest rule has to be armed"""
+
+    def __init__(self, missed_grace=60):
+        self.missed_grace = missed_grace
+        self._heap = []
+        self._counter = itertools.count()
+
+    def set_rules(self, rules, now):
+        self._heap = []
+        for rule in rules:
+            heapq.heappush(self._heap, (rule.next_due(now), next(self._counter), rule))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def next_due(self):
+        """Timestamp of the earliest due rule, or None if there are no rules"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """Pop every rule due at `now`, reschedule it and return the triggers to run.
+
+        Occurrences missed while the machine slept are coalesced into one trigger, or
+        dropped for rules with catch_up disabled. Rules of the same profile that are
+        due together are coalesced as well.
+        """
+        triggers = {}
+        while self._heap and self._heap[0][0] <= now:
+            due, _, rule = heapq.heappop(self._heap)
+            next_due = rule.next_due(now, due)
+            heapq.heappush(self._heap, (next_due, next(self._counter), rule))
+
+            late = now - due > self.missed_grace
+            if late and not rule.catch_up:
+                continue
+
+            missed = self._count_missed(rule, due, now) if late else 0
+            if rule.profile in triggers:
+                triggers[rule.profile].missed += missed + 1
+            else:
+                triggers[rule.profile] = ScheduleTrigger(rule, due, missed)
+        return list(triggers.values())
+
+    @staticmethod
+    def _count_missed(rule, due, now, limit=1000):
+        """Count the occurrences after `due` that also passed before `now` (capped at limit)"""
+        if rule.interval is not None:
+            return min(int((now - due) // rule.interval), limit)
+        missed = 0
+        moment = due
+        while missed < limit:
+            moment = rule.next_due(moment)
+            if moment > now:
+                break
+            missed += 1
+        return missed
+
+    def upcoming(self, count=5):
+        """Return the next `count` (due timestamp, rule) pairs in time order"""
+        return [(due, rule) for due, _, rule in heapq.nsmallest(count, self._heap)]
@@ -0,0 +1,16 @@
+# stats.py
+
+"""Version 1.1"""
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples using linear interpolation (None if empty)"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
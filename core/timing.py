@@ -0,0 +1,48 @@
+# timing.py
+
+"""Version 1.1"""
+
+import threading
+
+from core.action_program import DEFAULT_SLEEP_TIMERS
+
+
+class TimingSettings:
+    """The sleep timers of a run, shared between the thread that changes them and the engine.
+
+    Every change that alters a value bumps the version, so the engine only has
+    to compare one integer at each step boundary and takes a fresh snapshot
+    when it changed. Missing timers take their default values. Thread-safe.
+    """
+
+    def __init__(self, sleep_timers=None):
+        self._lock = threading.Lock()
+        self._timers = {**DEFAULT_SLEEP_TIMERS, **(sleep_timers or {})}
+        self.version = 0
+
+    @classmethod
+    def of(cls, sleep_timers):
+        """The TimingSettings itself, or new settings holding a dict of sleep timers"""
+        return sleep_timers if isinstance(sleep_timers, cls) else cls(sleep_timers)
+
+    def snapshot(self):
+        """Return (version, copy of the timers)"""
+        with self._lock:
+            return self.version, dict(self._timers)
+
+    def get(self, name, default=0):
+        with self._lock:
+            return self._timers.get(name, default)
+
+    def update(self, timers):
+        """Change some timers; returns the new version (unchanged if no value differs)"""
+        with self._lock:
+            changed = {name: value for name, value in timers.items() if self._timers.get(name) != value}
+            if changed:
+                self._timers.update(changed)
+                self.version += 1
+            return self.version
+
+    def replace(self, sleep_timers):
+        """Set all timers, e.g. after the configuration was saved; returns the new version"""
+        return self.update({**DEFAULT_SLEEP_TIMERS, **(sleep_timers or {})})
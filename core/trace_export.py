@@ -0,0 +1,93 @@
+# trace_export.py
+
+"""Version 1.1"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from core.run_events import RunEvent
+
+WORKER_TID = 1
+GUI_TID = 2
+
+
+class RunTrace:
+    """Collects the timeline of one run as Chrome trace events.
+
+    Engine events are fed to handle() from the thread running the engine, at the
+    moment they are emitted, so slice ends are measured on the same clock as GUI
+    slices recorded with gui_slice(). The written file opens in Perfetto
+    (ui.perfetto.dev) or chrome://tracing.
+    """
+
+    def __init__(self, worker_name="FolderOpeningThread", gui_name="GUI thread"):
+        self.pid = os.getpid()
+        self.start = time.perf_counter()
+        self.events = [
+            {"ph": "M", "name": "process_name", "pid": self.pid, "args": {"name": "Multi Folder Opener"}},
+            {"ph": "M", "name": "thread_name", "pid": self.pid, "tid": WORKER_TID, "args": {"name": worker_name}},
+            {"ph": "M", "name": "thread_name", "pid": self.pid, "tid": GUI_TID, "args": {"name": gui_name}},
+        ]
+
+    def _us(self, moment):
+        return round((moment - self.start) * 1_000_000, 1)
+
+    def slice(self, name, tid, start, end, category, **args):
+        """Add a complete ("X") event between two perf_counter() moments"""
+        event = {"ph": "X", "name": name, "cat": category, "pid": self.pid, "tid": tid,
+                 "ts": self._us(start), "dur": round((end - start) * 1_000_000, 1)}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def counter(self, name, moment=None, **values):
+        """Add a counter ("C") sample"""
+        moment = time.perf_counter() if moment is None else moment
+        self.events.append({"ph": "C", "name": name, "pid": self.pid, "ts": self._us(moment), "args": values})
+
+    def instant(self, name, tid, moment=None, **args):
+        moment = time.perf_counter() if moment is None else moment
+        self.events.append({"ph": "i", "name": name, "s": "t", "pid": self.pid, "tid": tid,
+                            "ts": self._us(moment), "args": args})
+
+    @contextmanager
+    def gui_slice(self, name, **args):
+        """Record the body as a slice on the GUI thread track"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.slice(name, GUI_TID, start, time.perf_counter(), "gui", **args)
+
+    def handle(self, event):
+        """Record an engine RunEvent on the worker track"""
+        now = time.perf_counter()
+        if event.kind == RunEvent.STEP:
+            start = now - event["duration"]
+            action_end = start + event["action_duration"]
+            self.slice(event["step"], WORKER_TID, start, now, "step",
+                       index=event["index"], outcome=event["outcome"], expected=event["expected"])
+            self.slice(event["step"], WORKER_TID, start, action_end, "action")
+            if now > action_end:
+                self.slice(f"wait {event['expected']}s", WORKER_TID, action_end, now, "wait")
+        elif event.kind == RunEvent.FOLDER:
+            self.slice(os.path.basename(os.path.normpath(event["folder"])) or event["folder"], WORKER_TID,
+                       now - event["duration"], now, "folder",
+                       index=event["index"], folder=event["folder"], outcome=event["outcome"])
+        elif event.kind == RunEvent.PROGRESS:
+            # Folders that still have to be opened, including the current one
+            self.counter("queue_depth", now, folders=event["total"] - event["index"])
+        elif event.kind == RunEvent.LANE:
+            self.instant(f"{event['lane']} lane open", WORKER_TID, now, folders=event["count"])
+        elif event.kind == RunEvent.FINISHED:
+            self.instant("finished", WORKER_TID, now, success=event["success"], message=event["message"])
+
+    def to_dict(self):
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Write the trace as a Chrome trace-event JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
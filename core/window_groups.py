@@ -0,0 +1,58 @@
+# window_groups.py
+
+"""Version 1.1"""
+
+import collections
+import math
+
+
+def window_options(settings):
+    """Read (windows, max_tabs) from the "windows" config section, ignoring invalid values"""
+    settings = settings if isinstance(settings, dict) else {}
+
+    def positive_int(key, default):
+        value = settings.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            return default
+        return value
+
+    return max(1, positive_int("count", 1)), positive_int("max_tabs", 0)
+
+
+def split_into_groups(folders, windows=1, max_tabs=0):
+    """Split folder indices into contiguous groups of near equal size, one group per window.
+
+    At least `windows` groups are made, more if a group would otherwise exceed
+    max_tabs (0 means no limit). The order of the folders is kept within each group.
+    """
+    total = len(folders)
+    count = max(1, windows)
+    if max_tabs > 0:
+        count = max(count, math.ceil(total / max_tabs))
+    count = max(1, min(count, total))
+
+    size, extra = divmod(total, count)
+    groups = []
+    start = 0
+    for number in range(count):
+        end = start + size + (1 if number < extra else 0)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+class WindowGroup:
+    """Scheduling state of one window while a run over several windows is compiled"""
+
+    def __init__(self, number, indices):
+        self.number = number
+        self.indices = collections.deque(indices)
+        self.opened = False
+        self.tabs = 0
+        # (operation, folder index, begins folder, ends folder) of the folder being opened
+        self.steps = collections.deque()
+        # Time at which the window may receive its next action
+        self.ready_at = 0.0
+
+    def has_work(self):
+        return not self.opened or bool(self.indices or self.steps)
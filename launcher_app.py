@@ -0,0 +1,415 @@
+# launcher_app.py
+
+"""Version 1.1"""
+
+import os
+import sys
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtGui import QIcon, QCloseEvent, QPaintEvent
+
+from managers.log_manager import LogManager
+from managers.dialog_manager import DialogManager
+from managers.command_line_handler import CommandLineHandler
+from managers.config_manager import ConfigManager
+from managers.systemtray_manager import SystemTrayManager
+from managers.theme_manager import ThemeManager
+from managers.folder_opening_manager import FolderOpeningManager
+from managers.single_instance_manager import SingleInstanceManager
+from managers.control_server import ControlServer
+from managers.scheduler_manager import SchedulerManager
+from managers.stall_watchdog import StallWatchdog
+from managers.metrics_manager import MetricsManager
+from managers.session_manager import SessionManager
+from ui.main_window_ui import MainWindowUI
+from app_config import CONFIG_PATH
+from core.run_events import RunEvent
+
+
+class FolderOpenerExecutionApp(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        # Startup phase timings, reported once the log widget is available
+        self.startup_timings = []
+        self._startup_start = time.perf_counter()
+        self._phase_start = self._startup_start
+        self._deferred_init_done = False
+
+        # Set application path
+        if getattr(sys, 'frozen', False):
+            self.application_path = os.path.dirname(sys.executable)
+        else:
+            self.application_path = os.path.dirname(os.path.abspath(__file__))
+
+        # Parse command line arguments
+        self.cmd_handler = CommandLineHandler()
+        self.configure_mode = self.cmd_handler.is_configure_mode()
+
+        # Initialize managers
+        self.config_manager = ConfigManager(CONFIG_PATH)
+        self.log_manager = LogManager(debug=self.cmd_handler.is_debug_mode())
+        self._mark_startup_phase("managers")
+
+        # Load configuration
+        self.load_config()
+        self._mark_startup_phase("config")
+
+        # Initialize UI (the icon is loaded after the first paint)
+        self.icon = None
+        self.ui_manager = MainWindowUI(self)
+        ui_components = self.ui_manager.setup_ui()
+
+        # Set log widget for logger
+        self.log_manager.set_log_widget(ui_components['log_text'])
+
+        # Initialize folder opening manager
+        self.folder_opening_manager = FolderOpeningManager(self, self.log_manager)
+        self.folder_opening_manager.set_ui_components(
+            ui_components['progress_bar'],
+            ui_components['execute_button'],
+            ui_components['cancel_button'],
+            ui_components['queue_label'],
+            ui_components['timing_panel']
+        )
+        self.folder_opening_manager.set_config(
+            self.folders,
+            self.sleep_timers,
+            self.auto_close,
+            self.auto_close_delay,
+            self.config_section("windows", {}),
+            self.config_section("prefetch", {}),
+            self.config_section("ordering", {}),
+            self.config_section("lanes", {}),
+            self.config_section("run_queue", {}),
+            self.config_section("input_pacing", {})
+        )
+
+        # Connect UI signals
+        ui_components['execute_button'].clicked.connect(self.execute_folder_opening)
+        ui_components['cancel_button'].clicked.connect(self.cancel_folder_opening)
+        ui_components['open_configurator_button'].clicked.connect(self.open_configurator)
+        ui_components['history_button'].clicked.connect(self.show_history_dialog)
+        ui_components['timing_panel'].timer_changed.connect(self.folder_opening_manager.set_timer)
+        ui_components['author_label'].mousePressEvent = self.show_about_dialog
+        self._mark_startup_phase("ui")
+
+        # Everything else waits for the first paint of the window (see paintEvent)
+        self.dialog_manager = None
+        self.systemtray_manager = None
+        self.single_instance_manager = None
+        self.control_server = None
+        self.scheduler_manager = None
+        self.stall_watchdog = None
+        self.hidden_in_tray = False
+        self.metrics_manager = None
+        self.session_manager = None
+        self._deferred_init_scheduled = False
+        if self.configure_mode:
+            # The window is never shown: only the configurator opens
+            self._schedule_deferred_init()
+
+    def _mark_startup_phase(self, name):
+        """Record the duration of a startup phase since the previous mark"""
+        now = time.perf_counter()
+        self.startup_timings.append((name, (now - self._phase_start) * 1000))
+        self._phase_start = now
+
+    def paintEvent(self, event: QPaintEvent):
+        """Start the deferred initialization once the window has been painted for the first time"""
+        super().paintEvent(event)
+        self._schedule_deferred_init()
+
+    def _schedule_deferred_init(self):
+        # A 0-ms timer runs once the current paint (or, in configure mode, the constructor) is done
+        if not self._deferred_init_scheduled and not self._deferred_init_done:
+            self._deferred_init_scheduled = True
+            QTimer.singleShot(0, self.deferred_init)
+
+    def deferred_init(self):
+        """Run the startup work that is not needed for the first paint"""
+        if self._deferred_init_done:
+            return
+        self._deferred_init_done = True
+        critical_ms = (self._phase_start - self._startup_start) * 1000
+        self._phase_start = time.perf_counter()
+
+        # Set application icon
+        icon_path = os.path.join(self.application_path, 'icons', 'launcher.ico')
+        if os.path.exists(icon_path):
+            self.icon = QIcon(icon_path)
+            QApplication.instance().setWindowIcon(self.icon)
+            self.setWindowIcon(self.icon)
+        self._mark_startup_phase("icon")
+
+        # Initialize dialog manager with parent and icon
+        self.dialog_manager = DialogManager(self, self.icon)
+        self._mark_startup_phase("dialogs")
+
+        # Initialize system tray manager
+        self.systemtray_manager = SystemTrayManager(self, self, self.dialog_manager)
+        self.systemtray_manager.toggle_tray_icon(self.system_tray)
+        self._mark_startup_phase("tray")
+
+        # Report freezes of the GUI thread with the stack it was stuck in
+        watchdog_settings = self.config_section("stall_watchdog", {})
+        if watchdog_settings.get("enabled", True):
+            threshold_ms = watchdog_settings.get("threshold_ms", StallWatchdog.DEFAULT_THRESHOLD_MS)
+            if isinstance(threshold_ms, bool) or not isinstance(threshold_ms, (int, float)) or threshold_ms <= 0:
+                threshold_ms = StallWatchdog.DEFAULT_THRESHOLD_MS
+            self.stall_watchdog = StallWatchdog(self, self.log_manager, threshold_ms)
+            # Paused while the launcher waits in the tray, so an idle process does not poll
+            self.folder_opening_manager.add_listener(
+                lambda event: self.update_stall_watchdog() if event.kind in (RunEvent.STARTED, RunEvent.FINISHED)
+                else None)
+            self.update_stall_watchdog()
+            self._mark_startup_phase("watchdog")
+
+        # Run and stall metrics, exported only when configured
+        metrics_settings = self.config_section("metrics", {})
+        if not self.configure_mode and (metrics_settings.get("textfile") or metrics_settings.get("port")):
+            self.metrics_manager = MetricsManager(self, self.folder_opening_manager, self.log_manager,
+                                                  metrics_settings)
+            if self.stall_watchdog:
+                self.metrics_manager.attach_stall_watchdog(self.stall_watchdog)
+            self.metrics_manager.start()
+            QApplication.instance().aboutToQuit.connect(self.metrics_manager.stop)
+            self._mark_startup_phase("metrics")
+
+        # Scheduled runs only make sense while the app stays resident in the tray
+        if not self.configure_mode:
+            self.scheduler_manager = SchedulerManager(self, self.folder_opening_manager, self.log_manager)
+            self.load_schedules()
+            self._mark_startup_phase("scheduler")
+
+            # Profiles opened from the tray run as sessions on an asyncio loop thread
+            self.session_manager = SessionManager(self, self.folder_opening_manager, self.log_manager)
+            self.folder_opening_manager.session_manager = self.session_manager
+            QApplication.instance().aboutToQuit.connect(self.session_manager.shutdown)
+            QApplication.instance().aboutToQuit.connect(self.folder_opening_manager.shutdown)
+
+        if not self.configure_mode:
+            # Setup theme
+            ThemeManager.setup_theme(
+                QApplication.instance(),
+                self.ui_manager.execute_button,
+                self.ui_manager.cancel_button
+            )
+            app = QApplication.instance()
+            app.paletteChanged.connect(self.on_palette_changed)
+
+            # Start theme check timer
+            self.current_theme = "light" if not ThemeManager.check_theme("light") else "dark"
+            self.theme_timer = QTimer(self)
+            self.theme_timer.timeout.connect(self.check_theme)
+            self.theme_timer.start(2000)
+            self._mark_startup_phase("theme")
+
+        self._report_startup_timings(critical_ms)
+
+        # Check for configurator command line argument
+        if self.configure_mode:
+            self.open_configurator_and_exit()
+            return
+
+        # Show system tray icon if enabled
+        if self.system_tray:
+            self.systemtray_manager.show_tray_icon()
+
+        # Auto-start if configured
+        if self.start_instantly:
+            self.log_manager.info("Auto-execution enabled in config. Starting folder opening process...")
+            self.execute_folder_opening()
+
+        # Show welcome dialog for first run
+        if self.is_first_run:
+            self.dialog_manager.show_welcome_dialog()
+
+    def _report_startup_timings(self, critical_ms):
+        """Log the recorded startup phases at debug level"""
+        for name, elapsed_ms in self.startup_timings:
+            self.log_manager.debug(f"Startup phase '{name}' took {elapsed_ms:.1f} ms")
+        total_ms = (time.perf_counter() - self._startup_start) * 1000
+        self.log_manager.debug(f"Critical startup path took {critical_ms:.1f} ms, "
+                               f"deferred initialization finished after {total_ms:.1f} ms")
+
+    def start_single_instance_server(self):
+        """Listen for arguments forwarded by later launches. Returns False if another instance is running."""
+        self.single_instance_manager = SingleInstanceManager()
+        self.single_instance_manager.add_handler("activate", self.on_instance_activated)
+        self.control_server = ControlServer(self.single_instance_manager, self.folder_opening_manager,
+                                            self.log_manager)
+        return self.single_instance_manager.start_server(self)
+
+    def on_instance_activated(self, socket, message):
+        """Act on the arguments of a second launch without a cold start"""
+        cmd_handler = CommandLineHandler(message.get("argv", []))
+        if cmd_handler.exit_code is not None:
+            return
+        self.deferred_init()
+        if cmd_handler.is_configure_mode():
+            self.log_manager.info("Configurator requested by another launch.")
+            QTimer.singleShot(0, self.open_configurator)
+            return
+
+        self.log_manager.info("Launcher activated by another launch.")
+        self.systemtray_manager.show_launcher()
+        self.raise_()
+        if self.start_instantly:
+            self.execute_folder_opening()
+
+    def closeEvent(self, event: QCloseEvent):
+        """Override close event to handle system tray behavior"""
+        self.deferred_init()
+        if self.system_tray:
+            self.log_manager.info("System tray enabled. Hiding to system tray instead of closing.")
+            event.ignore()
+            self.hide_to_system_tray()
+        else:
+            self.log_manager.info("Closing application.")
+            if self.stall_watchdog:
+                self.stall_watchdog.stop()
+                # Nothing restarts it once the window closes
+                self.stall_watchdog = None
+            event.accept()
+
+    def update_stall_watchdog(self):
+        """Run the stall watchdog only while the window is shown or folders are being opened.
+
+        Called when a run starts or ends and when the tray shows or hides the window
+        (which sets hidden_in_tray).
+        """
+        if not self.stall_watchdog:
+            return
+        if not self.hidden_in_tray or self.folder_opening_manager.is_running():
+            self.stall_watchdog.start()
+        else:
+            self.stall_watchdog.stop()
+
+    def load_config(self):
+        """Load configuration from config manager"""
+        self.folders, self.sleep_timers, self.start_instantly, self.auto_close, self.auto_close_delay, self.system_tray, self.is_first_run = self.config_manager.load_config()
+        # The optional sections are read once and taken with config_section()
+        self.settings = self.config_manager.load_settings()
+
+    def reload_config(self):
+        """Reload configuration after changes"""
+        self.folders, self.sleep_timers, self.start_instantly, self.auto_close, self.auto_close_delay, self.system_tray, _ = self.config_manager.load_config()
+        self.settings = self.config_manager.load_settings()
+        self.folder_opening_manager.set_config(
+            self.folders,
+            self.sleep_timers,
+            self.auto_close,
+            self.auto_close_delay,
+            self.config_section("windows", {}),
+            self.config_section("prefetch", {}),
+            self.config_section("ordering", {}),
+            self.config_section("lanes", {}),
+            self.config_section("run_queue", {}),
+            self.config_section("input_pacing", {})
+        )
+        self.deferred_init()
+        self.systemtray_manager.toggle_tray_icon(self.system_tray)
+        self.systemtray_manager.update_menu_state()
+        self.load_schedules()
+        self.log_manager.info("Configuration reloaded.")
+
+    def config_section(self, key, default):
+        """Return an optional section of the loaded configuration, or default if it is missing or invalid"""
+        return ConfigManager.section(self.settings, key, default)
+
+    def load_schedules(self):
+        """(Re)load the scheduled runs; they are active only with the system tray enabled"""
+        if self.scheduler_manager:
+            self.scheduler_manager.set_config(
+                self.config_section("schedules", []),
+                self.config_section("profiles", {}),
+                enabled=self.system_tray
+            )
+
+    def on_palette_changed(self, palette):
+        """Handle system palette changes"""
+        ThemeManager.on_palette_changed(
+            QApplication.instance(),
+            self.ui_manager.execute_button,
+            self.ui_manager.cancel_button
+        )
+
+    def check_theme(self):
+        """Periodically check for theme changes"""
+        new_theme = ThemeManager.check_theme(self.current_theme)
+        if new_theme != self.current_theme:
+            self.current_theme = new_theme
+            ThemeManager.setup_theme(
+                QApplication.instance(),
+                self.ui_manager.execute_button,
+                self.ui_manager.cancel_button,
+                True
+            )
+
+    def execute_folder_opening(self):
+        """Start the folder opening process"""
+        self.folder_opening_manager.execute_folder_opening()
+
+    def cancel_folder_opening(self):
+        """Cancel the folder opening process"""
+        self.folder_opening_manager.cancel_folder_opening()
+
+    def open_configurator(self):
+        """Open the configurator dialog"""
+        self.deferred_init()
+        self.dialog_manager.open_configurator(self.reload_config)
+
+    def open_configurator_and_exit(self):
+        """Open configurator and exit when in command line mode"""
+        self.dialog_manager.open_configurator_and_exit(QApplication.instance().quit)
+
+    def show_about_dialog(self, event):
+        """Show the about dialog"""
+        self.deferred_init()
+        self.dialog_manager.show_about_dialog()
+
+    def show_history_dialog(self):
+        """Show the timings of past runs"""
+        self.deferred_init()
+        self.dialog_manager.show_history_dialog()
+
+    def export_run_trace(self):
+        """Save the timeline of the current or last run for Perfetto / chrome://tracing"""
+        self.deferred_init()
+        self.dialog_manager.export_run_trace(self.folder_opening_manager)
+
+    def on_folder_opening_complete(self):
+        """Handle completion of folder opening process"""
+        self.log_manager.info("Folder opening process completed.")
+
+        # Check if auto-close is enabled
+        if self.auto_close:
+            self.log_manager.info(f"Auto-close enabled. Will close in {self.auto_close_delay} seconds.")
+
+            # Check if system tray is enabled
+            clock = self.folder_opening_manager.clock
+            if self.system_tray:
+                # Hide to system tray instead of closing
+                clock.call_later(self.auto_close_delay, self.hide_to_system_tray)
+            else:
+                # Close the application
+                clock.call_later(self.auto_close_delay, self.close_application)
+
+    def hide_to_system_tray(self):
+        """Hide the main window to system tray"""
+        self.log_manager.info("Hiding to system tray.")
+        self.deferred_init()
+        self.systemtray_manager.minimize_to_tray()
+
+    def close_application(self):
+        """Close the application"""
+        self.log_manager.info("Closing application.")
+        if self.system_tray:
+            self.deferred_init()
+            self.systemtray_manager.exit_application()
+        else:
+            self.close()
+
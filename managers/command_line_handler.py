@@ -2,34 +2,166 @@
 
 """Version 1.1"""
 
+import argparse
 import sys
 
+# Nothing imported here may load Qt: command line invocations are parsed
+# before (and often instead of) starting the GUI.
+from core.backends import BACKENDS
+from core.profiling import PROFILE_MODES
+
+
 class CommandLineHandler:
     def __init__(self, args=None):
         """Initialize with command line arguments or use sys.argv if not provided"""
         self.args = args if args is not None else sys.argv[1:]
+        self.parser = self._build_parser()
+        # Set when parsing failed or argparse already printed help; the value is the exit code
+        self.exit_code = None
         self.parsed_args = self._parse_args()
 
+    def _build_parser(self):
+        """Build the argument parser with its subcommands"""
+        parser = argparse.ArgumentParser(
+            prog="folder_opener",
+            description="Multi Folder Opener - open multiple folders in Explorer tabs.",
+            add_help=False
+        )
+        parser.add_argument('-c', '--configure', action='store_true', help="Open the configurator dialog")
+        parser.add_argument('-h', '--help', action='store_true', help="Display this help information")
+        parser.add_argument('-v', '--version', action='store_true', help="Display version information")
+        parser.add_argument('-d', '--debug', action='store_true',
+                            help="Log debug messages, including startup phase timings")
+        parser.add_argument('-r', '--run', action='store_true',
+                            help="Open the configured folders without the GUI and exit (same as 'open')")
+        parser.add_argument('--json', action='store_true', help="Write output as JSON lines")
+        parser.add_argument('--profile', choices=PROFILE_MODES, metavar='MODE',
+                            help="Profile the session or command: 'cprofile' writes .pstats files, "
+                                 "'sample' writes collapsed stacks for flamegraphs")
+        parser.add_argument('--profile-rate', type=self._positive_int, metavar='HZ',
+                            help="Samples per second in 'sample' mode (default: 100)")
+
+        subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+        # --json may also be given after the subcommand; SUPPRESS keeps it from
+        # overwriting a --json given before the subcommand
+        json_option = argparse.ArgumentParser(add_help=False)
+        json_option.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                                 help="Write output as JSON lines")
+
+        open_parser = subparsers.add_parser(
+            'open', parents=[json_option], help="Open folders without the GUI and exit")
+        open_parser.add_argument('--only', action='append', metavar='PATTERN',
+                                 help="Open only folders whose path or name matches the glob PATTERN "
+                                      "(case-insensitive, may be repeated)")
+        open_parser.add_argument('--limit', type=self._positive_int, metavar='N',
+                                 help="Open at most N folders")
+        open_parser.add_argument('--backend', choices=sorted(BACKENDS),
+                                 help="Backend that opens the folders (default: explorer)")
+        open_parser.add_argument('--dry-run', action='store_true',
+                                 help="List the folders that would be opened without opening them")
+        open_parser.add_argument('--windows', type=self._positive_int, metavar='N',
+                                 help="Spread the folders across N file manager windows")
+        open_parser.add_argument('--max-tabs', type=self._positive_int, metavar='N',
+                                 help="Open at most N folders per window (adds windows as needed)")
+        open_parser.add_argument('--order', choices=['list', 'locality'],
+                                 help="Open the folders in list order or grouped by drive, share and "
+                                      "parent folder (default: the \"ordering\" config section)")
+        open_parser.add_argument('--include-lazy', action='store_true',
+                                 help="Also open lazy folders that are set to open on demand")
+        open_parser.add_argument('--prefetch', type=self._non_negative_int, metavar='DEPTH',
+                                 help="Warm up to DEPTH folders ahead of the one being opened (0 turns it off)")
+        open_parser.add_argument('--trace', metavar='FILE',
+                                 help="Write the run timeline to FILE as a Chrome trace (Perfetto, chrome://tracing)")
+
+        subparsers.add_parser('validate', parents=[json_option],
+                              help="Check the configuration and the configured folder paths")
+
+        bench_parser = subparsers.add_parser(
+            'bench', parents=[json_option],
+            help="Measure the engine overhead on the configured folders with the simulated backend")
+        bench_parser.add_argument('--only', action='append', metavar='PATTERN',
+                                  help="Benchmark only folders matching PATTERN")
+        bench_parser.add_argument('--limit', type=self._positive_int, metavar='N',
+                                  help="Benchmark at most N folders")
+        bench_parser.add_argument('--repeat', type=self._positive_int, default=5, metavar='N',
+                                  help="Number of runs (default: 5)")
+
+        history_parser = subparsers.add_parser(
+            'history', parents=[json_option], help="Show step, folder or run timings of past runs")
+        history_parser.add_argument('--last', type=self._positive_int, default=20, metavar='N',
+                                    help="Use the last N runs (default: 20)")
+        history_parser.add_argument('--by', choices=['step', 'folder', 'run'], default='step',
+                                    help="Group timings by step (default), by folder, or list runs")
+
+        control_parser = subparsers.add_parser(
+            'control', help="Control the running launcher instance through its local control API")
+        control_subparsers = control_parser.add_subparsers(dest='control_action', metavar='ACTION')
+        control_subparsers.required = True
+        control_subparsers.add_parser('status', parents=[json_option], help="Show the current or last run")
+        control_start_parser = control_subparsers.add_parser(
+            'start', parents=[json_option], help="Start a run in the running instance")
+        control_start_parser.add_argument('--only', action='append', metavar='PATTERN',
+                                          help="Open only folders matching PATTERN (may be repeated)")
+        control_start_parser.add_argument('--limit', type=self._positive_int, metavar='N',
+                                          help="Open at most N folders")
+        control_start_parser.add_argument('--wait', action='store_true',
+                                          help="Stream the run's events and exit when it finishes")
+        control_subparsers.add_parser('cancel', parents=[json_option], help="Cancel the running run")
+        control_subparsers.add_parser('watch', parents=[json_option],
+                                      help="Stream run events until interrupted")
+
+        config_parser = subparsers.add_parser('config', help="Read or change configuration values")
+        config_subparsers = config_parser.add_subparsers(dest='config_action', metavar='ACTION')
+        config_subparsers.required = True
+        get_parser = config_subparsers.add_parser(
+            'get', help="Print a value, e.g. 'sleep_timers.new_tab' (the whole config if KEY is omitted)")
+        get_parser.add_argument('key', nargs='?', metavar='KEY')
+        set_parser = config_subparsers.add_parser(
+            'set', help="Change a value; VALUE is parsed as JSON when possible")
+        set_parser.add_argument('key', metavar='KEY')
+        set_parser.add_argument('value', metavar='VALUE')
+
+        return parser
+
+    @staticmethod
+    def _positive_int(value):
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError("must be a positive integer")
+        return number
+
+    @staticmethod
+    def _non_negative_int(value):
+        number = int(value)
+        if number < 0:
+            raise argparse.ArgumentTypeError("must be a non-negative integer")
+        return number
+
     def _parse_args(self):
         """Parse command line arguments into a dictionary"""
-        parsed = {
-            'configure': False,
-            'help': False,
-            'version': False,
-            # Add more options as needed
-        }
-
-        for arg in self.args:
-            if arg in ['--configure', '-c']:
-                parsed['configure'] = True
-            elif arg in ['--help', '-h']:
-                parsed['help'] = True
-            elif arg in ['--version', '-v']:
-                parsed['version'] = True
-            # Add more argument parsing as needed
+        try:
+            namespace = self.parser.parse_args(self.args)
+        except SystemExit as e:
+            # argparse has already printed the usage error (or subcommand help)
+            self.exit_code = e.code if isinstance(e.code, int) else 2
+            return {}
 
+        parsed = vars(namespace)
+        # --run is kept as a shortcut for the 'open' subcommand
+        if parsed.get('run') and not parsed.get('command'):
+            parsed['command'] = 'open'
         return parsed
 
+    def get_command(self):
+        """Return the subcommand to run without the GUI ('open', 'validate', 'bench', 'history', 'control', 'config') or None"""
+        return self.parsed_args.get('command')
+
+    def get_option(self, name, default=None):
+        """Return the value of a parsed option"""
+        value = self.parsed_args.get(name)
+        return default if value is None else value
+
     def is_configure_mode(self):
         """Check if the application should run in configurator mode"""
         return self.parsed_args.get('configure', False)
@@ -42,20 +174,26 @@ class CommandLineHandler:
         """Check if version information was requested"""
         return self.parsed_args.get('version', False)
 
+    def is_debug_mode(self):
+        """Check if debug logging (including startup timings) was requested"""
+        return self.parsed_args.get('debug', False)
+
+    def is_run_mode(self):
+        """Check if folders should be opened headlessly, without the GUI"""
+        return self.get_command() == 'open'
+
+    def get_profile_mode(self):
+        """Return the profiler requested with --profile ('cprofile', 'sample') or None"""
+        return self.parsed_args.get('profile')
+
+    def is_json_output(self):
+        """Check if output should be written as JSON lines"""
+        return self.parsed_args.get('json', False)
+
     def print_help(self):
         """Print help information to console"""
-        help_text = """
-Multi Folder Opener - Help
---------------------------
-Usage: folder_opener [options]
-
-Options:
-  -c, --configure    Open the configurator dialog
-  -h, --help         Display this help information
-  -v, --version      Display version information
-        """
-        print(help_text)
-
-    def print_version(self, version="1.0.0"):
+        self.parser.print_help()
+
+    def print_version(self, version="1.1.0"):
         """Print version information to console"""
         print(f"Multi Folder Opener v{version}")
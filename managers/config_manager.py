@@ -4,25 +4,44 @@
 
 import os
 import json
-from PySide6.QtWidgets import QMessageBox
 
 from app_config import CONFIG_PATH
+from core.action_program import DEFAULT_SLEEP_TIMERS
 
 
+# QMessageBox is imported only when a parent widget is passed, so the headless
+# run mode can load the config without importing the Qt widget modules.
 class ConfigManager:
+    DEFAULT_SLEEP_TIMERS = DEFAULT_SLEEP_TIMERS
+
+    # Expected type of each top-level setting, used by get_value/set_value
+    SETTING_TYPES = {
+        "folders": list,
+        "sleep_timers": dict,
+        "start_instantly": bool,
+        "auto_close": bool,
+        "auto_close_delay": (int, float),
+        "system_tray": bool,
+        "profiles": dict,
+        "schedules": list,
+        "profiling": dict,
+        "stall_watchdog": dict,
+        "metrics": dict,
+        "windows": dict,
+        "prefetch": dict,
+        "ordering": dict,
+        "lanes": dict,
+        "run_queue": dict,
+        "input_pacing": dict
+    }
+
     def __init__(self, config_path):
-        self.config_path = CONFIG_PATH
+        self.config_path = config_path or CONFIG_PATH
 
     def load_config(self, parent_widget=None):
         # Default values
         folders = []
-        sleep_timers = {
-            "explorer_startup": 1.5,
-            "new_tab": 0.5,
-            "address_bar_focus": 0.5,
-            "after_typing": 0.5,
-            "after_enter": 0.5
-        }
+        sleep_timers = dict(self.DEFAULT_SLEEP_TIMERS)
         start_instantly = False
         auto_close = False
         auto_close_delay = 3
@@ -59,6 +78,7 @@ class ConfigManager:
 
             except Exception as e:
                 if parent_widget:
+                    from PySide6.QtWidgets import QMessageBox
                     QMessageBox.critical(parent_widget, "Error", f"Error creating config file: {e}")
                 return folders, sleep_timers, start_instantly, auto_close, auto_close_delay, system_tray, is_first_run
 
@@ -98,32 +118,114 @@ class ConfigManager:
 
         except Exception as e:
             if parent_widget:
+                from PySide6.QtWidgets import QMessageBox
                 QMessageBox.critical(parent_widget, "Error", f"Error loading config: {e}")
 
         return folders, sleep_timers, start_instantly, auto_close, auto_close_delay, system_tray, is_first_run
 
     def save_config(self, folders, sleep_timers, start_instantly, parent_widget=None, auto_close=False,
-                    auto_close_delay=1.5, system_tray=False):
+                    auto_close_delay=1.5, system_tray=False, profiling=None, input_pacing=None):
         try:
             # Normalize all folder paths to Windows format
             normalized_folders = [os.path.normpath(folder) for folder in folders]
 
-            config = {
+            # Keep settings the configurator does not edit (profiles, schedules, ...)
+            try:
+                config = self.read_config_file()
+            except (OSError, ValueError):
+                config = {}
+
+            config.update({
                 "folders": normalized_folders,
                 "sleep_timers": sleep_timers,
                 "start_instantly": start_instantly,
                 "auto_close": auto_close,
                 "auto_close_delay": auto_close_delay,
                 "system_tray": system_tray
-            }
+            })
+            if profiling is not None:
+                config["profiling"] = profiling
+            if input_pacing is not None:
+                config["input_pacing"] = input_pacing
 
             with open(self.config_path, 'w') as f:
                 json.dump(config, f, indent=2)
 
             if parent_widget:
+                from PySide6.QtWidgets import QMessageBox
                 QMessageBox.information(parent_widget, "Success", "Configuration saved successfully!")
             return True
         except Exception as e:
             if parent_widget:
+                from PySide6.QtWidgets import QMessageBox
                 QMessageBox.critical(parent_widget, "Error", f"Error saving config: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def read_config_file(self):
+        """Return the raw config dictionary. Raises OSError or ValueError if it cannot be read."""
+        with open(self.config_path, 'r') as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError("The config file does not contain a JSON object")
+        return config
+
+    def write_config_file(self, config):
+        """Write the raw config dictionary"""
+        with open(self.config_path, 'w') as f:
+            json.dump(config, f, indent=2)
+
+    def load_settings(self):
+        """Return the raw config dictionary to take several sections from, or {} if it is unreadable"""
+        try:
+            return self.read_config_file()
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def section(config, key, default):
+        """Return an optional top-level setting of a loaded config, or default if it is missing or invalid"""
+        value = config.get(key, default)
+        return value if isinstance(value, type(default)) else default
+
+    def load_section(self, key, default):
+        """Return an optional top-level setting, or default if it is missing, invalid or unreadable"""
+        return self.section(self.load_settings(), key, default)
+
+    def get_value(self, key):
+        """Return a setting by dotted key, e.g. 'sleep_timers.new_tab'. Raises KeyError if missing."""
+        value = self.read_config_file()
+        for part in key.split('.'):
+            if not isinstance(value, dict) or part not in value:
+                raise KeyError(key)
+            value = value[part]
+        return value
+
+    def set_value(self, key, value):
+        """Change a setting by dotted key and save the config. Raises KeyError or ValueError if invalid."""
+        parts = key.split('.')
+        top_level = parts[0]
+        if top_level not in self.SETTING_TYPES or len(parts) > 2:
+            raise KeyError(key)
+
+        if len(parts) == 2:
+            if top_level != "sleep_timers" or parts[1] not in self.DEFAULT_SLEEP_TIMERS:
+                raise KeyError(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"'{key}' must be a non-negative number")
+        else:
+            expected_type = self.SETTING_TYPES[top_level]
+            if isinstance(value, bool) and expected_type is not bool:
+                raise ValueError(f"'{key}' must not be a boolean")
+            if not isinstance(value, expected_type):
+                raise ValueError(f"'{key}' has the wrong type")
+            if top_level == "folders" and not all(isinstance(folder, str) for folder in value):
+                raise ValueError(f"'{key}' must be a list of folder paths (strings)")
+
+        config = self.read_config_file()
+        if len(parts) == 2:
+            config.setdefault(top_level, dict(self.DEFAULT_SLEEP_TIMERS))[parts[1]] = value
+        elif top_level == "folders":
+            config[top_level] = [os.path.normpath(folder) for folder in value]
+        else:
+            config[top_level] = value
+        self.write_config_file(config)
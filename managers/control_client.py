@@ -0,0 +1,179 @@
+# control_client.py
+
+"""Version 1.1"""
+
+import getpass
+import json
+import os
+import queue
+import re
+import socket
+import tempfile
+import threading
+import time
+
+# Windows error of a pipe whose instances are all connected to other clients
+ERROR_PIPE_BUSY = 231
+
+
+def get_server_name():
+    """Name of the local socket shared by all instances of the current user"""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    return "MultiFolderOpener-" + re.sub(r'[^A-Za-z0-9_.-]', '_', user)
+
+
+def get_server_address():
+    """Address passed to QLocalServer: a pipe name on Windows, an absolute socket path elsewhere"""
+    if os.name == 'nt':
+        return get_server_name()
+    return os.path.join(tempfile.gettempdir(), get_server_name())
+
+
+class ControlError(Exception):
+    """Raised when the running instance cannot be reached or rejects a command"""
+
+
+class ControlClient:
+    """Talks to the local control API of a running launcher without importing Qt.
+
+    Messages are newline-delimited JSON objects. Each command gets exactly one
+    reply ({"reply": <command>, "ok": ...}); after "subscribe" the server also
+    streams run events ({"event": "log" | "progress" | "started" | "finished" | "queue", ...}).
+    """
+
+    def __init__(self, address=None, timeout=5.0):
+        self.address = address or get_server_address()
+        self.timeout = timeout
+        self._stream = None
+        self._socket = None
+        # Lines read from a Windows pipe by its reader thread
+        self._lines = None
+        self._pending_events = []
+
+    def connect(self):
+        try:
+            if os.name == 'nt':
+                self._stream = self._open_pipe(r'\\.\pipe\%s' % self.address)
+                # Reads of a pipe file cannot time out, so a thread reads the lines and the client waits for them
+                self._lines = queue.Queue()
+                threading.Thread(target=self._read_pipe, args=(self._stream, self._lines), daemon=True).start()
+            else:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self.timeout)
+                self._socket.connect(self.address)
+                self._stream = self._socket.makefile('rwb', buffering=0)
+        except OSError as e:
+            self.close()
+            raise ControlError(f"No running launcher instance found ({e})") from e
+        return self
+
+    def _open_pipe(self, path):
+        """Open the pipe, waiting up to the timeout while all its instances are busy"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                return open(path, 'r+b', buffering=0)
+            except OSError as e:
+                if getattr(e, "winerror", None) != ERROR_PIPE_BUSY or time.monotonic() >= deadline:
+                    raise
+            time.sleep(0.05)
+
+    @staticmethod
+    def _read_pipe(stream, lines):
+        while True:
+            try:
+                line = stream.readline()
+            except (OSError, ValueError):
+                line = b""
+            lines.put(line)
+            if not line:
+                return
+
+    def close(self):
+        for resource in (self._stream, self._socket):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._stream = None
+        self._socket = None
+        self._lines = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _send(self, message):
+        self._stream.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    def _read_message(self, timeout=None):
+        """Read the next JSON message; None when the server closed the connection"""
+        if self._lines is not None:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise socket.timeout(f"No message within {timeout}s") from None
+            if not line:
+                # Keep the end of the stream for the next read
+                self._lines.put(line)
+        else:
+            if self._socket is not None:
+                self._socket.settimeout(timeout)
+            line = self._stream.readline()
+        if not line:
+            return None
+        return json.loads(line.decode("utf-8"))
+
+    def request(self, command, **params):
+        """Send a command and return its reply. Events received meanwhile are kept for events()."""
+        self._send({"command": command, **params})
+        while True:
+            try:
+                message = self._read_message(self.timeout)
+            except socket.timeout as e:
+                raise ControlError(f"No reply to '{command}'") from e
+            if message is None:
+                raise ControlError("Connection closed by the launcher")
+            if message.get("reply") == command:
+                if not message.get("ok", False):
+                    raise ControlError(message.get("error", f"'{command}' failed"))
+                return message
+            self._pending_events.append(message)
+
+    def status(self):
+        return self.request("status")
+
+    def start(self, only=None, limit=None):
+        """Start a run of all configured folders, or the subset matching only/limit.
+
+        Returns the reply: "run_id", "total" and, when the run waits for the
+        current one, its "queued" position (0 if the current run opens the same folders).
+        """
+        return self.request("start", only=only, limit=limit)
+
+    def cancel(self):
+        return self.request("cancel")["cancelled"]
+
+    def subscribe(self):
+        return self.request("subscribe")
+
+    def events(self, timeout=None):
+        """Yield streamed events until the connection closes (or no event arrives within timeout)"""
+        while True:
+            if self._pending_events:
+                yield self._pending_events.pop(0)
+                continue
+            try:
+                message = self._read_message(timeout)
+            except socket.timeout:
+                return
+            if message is None:
+                return
+            if "event" in message:
+                yield message
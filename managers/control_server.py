@@ -0,0 +1,91 @@
+# control_server.py
+
+"""Version 1.1"""
+
+from core.folder_selection import select_folders
+from core.run_queue import CONTROL, DUPLICATE, REJECT, REJECTED, START
+from managers.single_instance_manager import SingleInstanceManager
+
+
+class ControlServer:
+    """Local control API of the resident launcher, served by the FolderOpeningManager.
+
+    Commands (one JSON object per line, each answered with {"reply": <command>, "ok": ...}):
+      {"command": "start", "only": [patterns], "limit": N}  start a run, optionally a subset
+      {"command": "cancel"}                                 cancel the running run
+      {"command": "status"}                                 describe the current or last run
+      {"command": "subscribe"} / {"command": "unsubscribe"} stream run events to this client
+    """
+
+    def __init__(self, instance_manager, folder_opening_manager, logger=None):
+        self.instance_manager = instance_manager
+        self.folder_opening_manager = folder_opening_manager
+        self.logger = logger
+        self.subscribers = []
+
+        instance_manager.add_handler("start", self.on_start)
+        instance_manager.add_handler("cancel", self.on_cancel)
+        instance_manager.add_handler("status", self.on_status)
+        instance_manager.add_handler("subscribe", self.on_subscribe)
+        instance_manager.add_handler("unsubscribe", self.on_unsubscribe)
+        instance_manager.add_disconnect_handler(self.on_unsubscribe)
+        folder_opening_manager.add_listener(self.broadcast)
+
+    def reply(self, socket, message, ok=True, **data):
+        response = {"reply": message.get("command"), "ok": ok, **data}
+        if "id" in message:
+            response["id"] = message["id"]
+        SingleInstanceManager.send(socket, response)
+
+    def on_start(self, socket, message):
+        only, limit = message.get("only"), message.get("limit")
+        if only is not None and (not isinstance(only, list) or not all(isinstance(item, str) for item in only)):
+            self.reply(socket, message, False, error="'only' must be a list of folder patterns (strings)")
+            return
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 0):
+            self.reply(socket, message, False, error="'limit' must be a non-negative integer")
+            return
+
+        manager = self.folder_opening_manager
+        folders = select_folders(manager.folders, only, limit)
+        if not folders:
+            self.reply(socket, message, False, error="No configured folder matches the request")
+            return
+
+        if self.logger:
+            self.logger.info(f"Run of {len(folders)} folders requested through the control API.")
+        outcome, request = manager.request_run(folders, source=CONTROL)
+        if outcome is None:
+            self.reply(socket, message, False, error="The run could not be started")
+        elif outcome == REJECTED:
+            error = "A run is already in progress" if manager.queue.policy == REJECT else "The run queue is full"
+            self.reply(socket, message, False, error=error, run_id=manager.run_id)
+        elif outcome == START:
+            self.reply(socket, message, run_id=request.id, total=len(request.folders))
+        else:
+            # Queued, or folded into a queued or running run of the same folders
+            position = manager.queue.position(request) if outcome != DUPLICATE else 0
+            self.reply(socket, message, run_id=request.id, total=len(request.folders), queued=position)
+
+    def on_cancel(self, socket, message):
+        self.reply(socket, message, cancelled=self.folder_opening_manager.cancel_folder_opening())
+
+    def on_status(self, socket, message):
+        self.reply(socket, message, **self.folder_opening_manager.get_status())
+
+    def on_subscribe(self, socket, message):
+        if socket not in self.subscribers:
+            self.subscribers.append(socket)
+        self.reply(socket, message, **self.folder_opening_manager.get_status())
+
+    def on_unsubscribe(self, socket, message=None):
+        if socket in self.subscribers:
+            self.subscribers.remove(socket)
+        if message is not None:
+            self.reply(socket, message)
+
+    def broadcast(self, event):
+        """Send a run event to every subscribed client"""
+        record = event.to_dict()
+        for socket in list(self.subscribers):
+            SingleInstanceManager.send(socket, record)
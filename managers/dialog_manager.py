@@ -2,8 +2,10 @@
 
 """Version 1.1"""
 
-from PySide6.QtWidgets import QMessageBox, QDialog
+from PySide6.QtWidgets import QMessageBox, QDialog, QFileDialog
+from app_config import HISTORY_PATH
 from ui.about_dialog import AboutDialog
+from ui.history_dialog import HistoryDialog
 from ui.settings.configurator import ConfiguratorDialog
 
 
@@ -49,6 +51,37 @@ class DialogManager:
             dialog.setWindowIcon(self.icon)
         dialog.exec()
 
+    def show_history_dialog(self):
+        """Show step and folder timings of past runs"""
+        if not self.parent:
+            return
+
+        dialog = HistoryDialog(HISTORY_PATH, self.parent)
+        if self.icon:
+            dialog.setWindowIcon(self.icon)
+        dialog.exec()
+
+    def export_run_trace(self, folder_opening_manager):
+        """Ask for a file name and save the timeline of the current or last run as a Chrome trace"""
+        if not self.parent:
+            return
+
+        if not folder_opening_manager.trace:
+            QMessageBox.information(self.parent, "Export Run Trace", "There is no run to export yet.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self.parent, "Export Run Trace", f"run-trace-{folder_opening_manager.run_id}.json",
+            "Chrome trace files (*.json)"
+        )
+        if not path:
+            return
+
+        try:
+            folder_opening_manager.export_trace(path)
+        except OSError as e:
+            self.show_error_dialog("Export Run Trace", f"Could not write the trace: {e}")
+
     def open_configurator(self, config_reload_callback=None):
         """Open the configurator dialog and reload config if accepted"""
         if not self.parent:
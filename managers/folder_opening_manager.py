@@ -3,34 +3,170 @@
 """Version 1.1"""
 
 from PySide6.QtCore import QTimer
-from core.folder_operations import FolderOpeningThread
+from core.backends import get_backend_class, pacing_options
+from core.eta import format_duration
+from managers.folder_opening_thread import FolderOpeningThread
+from core.lanes import LANES, lane_options, lane_plan
+from core.ordering import locality_order, ordering_options
+from core.prefetch import prefetch_options
+from core.run_events import RunEvent
+from core.run_queue import (DUPLICATE, MANUAL, MERGED, QUEUED, REJECT, START, RunQueue, RunRequest,
+                            queue_options)
+from core.timing import TimingSettings
+from core.trace_export import RunTrace
+from core.window_groups import window_options
+from managers.qt_clock import QtClock
 import logging
 
 
 class FolderOpeningManager:
-    def __init__(self, parent=None, logger=None):
+    def __init__(self, parent=None, logger=None, clock=None):
         self.parent = parent
         self.logger = logger
+        # Shared with the worker thread; a VirtualClock replays whole runs and the auto-close instantly
+        self.clock = clock or QtClock()
         self.folder_thread = None
         self.progress_bar = None
         self.execute_button = None
+        self.cancel_button = None
+        self.queue_label = None
+        self.timing_panel = None
         self.folders = []
-        self.sleep_timers = {}
+        # Read by the engine at every action, so the live timing sliders apply to the run in progress
+        self.timing = TimingSettings()
+        # Last measured (duration, configured wait) of each step, written by the worker thread
+        self.step_timings = {}
         self.auto_close = False
         self.auto_close_delay = 0
+        self.windows = 1
+        self.max_tabs = 0
+        self.prefetch_depth, self.scan_limit = prefetch_options({})
+        self.optimize_order, self.keep_order = ordering_options({})
+        self.pinned, self.lazy, self.defer_lazy, self.auto_close_after = lane_options({})
+        self.input_pause, self.failsafe = pacing_options({})
+        # Requests that arrive during a run wait here, or are merged or rejected
+        self.queue = RunQueue(*queue_options({}))
 
-    def set_ui_components(self, progress_bar, execute_button, cancel_button):
+        # Run state shared with the control API
+        self.listeners = []
+        self.worker_listeners = []
+        self.run_id = 0
+        self.run_request = None
+        # Set while the cancelled run finishes its current action
+        self.cancelling = False
+        self.run_folders = []
+        self.progress_index = 0
+        self.last_result = None
+        # (lane, folder count) of the current run, and lazy folders left for on-demand opening
+        self.run_lanes = []
+        self.deferred_folders = []
+        self.auto_close_scheduled = False
+        self.close_when_finished = False
+        # Timeline of the current or last run, exportable as a Chrome trace
+        self.trace = None
+        # Set by the launcher; keystroke sessions and the main run exclude each other
+        self.session_manager = None
+
+        # Time left of the current run, refreshed every second while it runs
+        self.estimator = None
+        self.eta_timer = QTimer(parent)
+        self.eta_timer.setInterval(1000)
+        self.eta_timer.timeout.connect(self.update_eta)
+        self.eta_timer.timeout.connect(self.update_timing_readout)
+
+    @property
+    def sleep_timers(self):
+        """The current sleep timers, including the changes made with set_timer()"""
+        return self.timing.snapshot()[1]
+
+    def set_ui_components(self, progress_bar, execute_button, cancel_button, queue_label=None, timing_panel=None):
         """Set UI components that will be updated during folder opening"""
         self.progress_bar = progress_bar
         self.execute_button = execute_button
         self.cancel_button = cancel_button
+        self.queue_label = queue_label
+        self.timing_panel = timing_panel
+        self.update_queue_label()
+        if self.timing_panel:
+            self.timing_panel.set_timers(self.sleep_timers)
 
-    def set_config(self, folders, sleep_timers, auto_close, auto_close_delay):
+    def set_config(self, folders, sleep_timers, auto_close, auto_close_delay, window_settings=None,
+                   prefetch_settings=None, ordering_settings=None, lane_settings=None, queue_settings=None,
+                   pacing_settings=None):
         """Set configuration parameters for folder opening"""
         self.folders = folders
-        self.sleep_timers = sleep_timers
+        # Saved timers replace the ones changed with the live sliders
+        self.timing.replace(sleep_timers)
+        if self.timing_panel:
+            self.timing_panel.set_timers(self.sleep_timers)
         self.auto_close = auto_close
         self.auto_close_delay = auto_close_delay
+        self.windows, self.max_tabs = window_options(window_settings)
+        self.prefetch_depth, self.scan_limit = prefetch_options(prefetch_settings)
+        self.optimize_order, self.keep_order = ordering_options(ordering_settings)
+        self.pinned, self.lazy, self.defer_lazy, self.auto_close_after = lane_options(lane_settings)
+        self.queue.policy, self.queue.merge, self.queue.max_pending = queue_options(queue_settings)
+        self.input_pause, self.failsafe = pacing_options(pacing_settings)
+
+    def add_listener(self, listener):
+        """Register a callback that receives a RunEvent for every log line, progress step and result"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def add_worker_listener(self, listener):
+        """Register a thread-safe callback that receives every engine RunEvent on the worker thread"""
+        if listener not in self.worker_listeners:
+            self.worker_listeners.append(listener)
+
+    def set_timer(self, name, seconds):
+        """Change a sleep timer for this session; a run in progress uses it from its next action on"""
+        if self.timing.get(name) == seconds:
+            return
+        version = self.timing.update({name: seconds})
+        if self.estimator:
+            self.estimator.retime(self.sleep_timers)
+            self.update_eta()
+        self.log(f"Timer '{name}' set to {seconds}s for this session (timing version {version}).")
+
+    def _record_step(self, event):
+        """Keep the last timing of each step for the live timing readout (called on the worker thread)"""
+        if event.kind == RunEvent.STEP and event["outcome"] == "ok":
+            self.step_timings[event["step"]] = (event["duration"], event["expected"])
+
+    def update_timing_readout(self):
+        """Show the last measured duration of each step next to the live timing sliders"""
+        if self.timing_panel:
+            self.timing_panel.show_step_timings(dict(self.step_timings))
+
+    def _notify(self, kind, **data):
+        event = RunEvent(kind, run_id=self.run_id, **data)
+        for listener in list(self.listeners):
+            listener(event)
+
+    def is_running(self):
+        return self.run_request is not None
+
+    def get_status(self):
+        """Describe the current or last run"""
+        return {
+            "running": self.is_running(),
+            "run_id": self.run_id or None,
+            "index": self.progress_index,
+            "total": len(self.run_folders),
+            "eta_seconds": self.get_eta(),
+            "last_result": self.last_result,
+            "queued": [request.to_dict() for request in self.queue.pending()],
+        }
+
+    def get_eta(self):
+        """Estimated seconds left in the current run, or None when nothing runs"""
+        if not self.estimator or not self.is_running():
+            return None
+        return round(self.estimator.remaining(self.clock.now()), 1)
 
     def log(self, message, level=logging.INFO):
         """Log a message using the logger if available"""
@@ -42,15 +178,105 @@ class FolderOpeningManager:
             elif level == logging.ERROR:
                 self.logger.error(message)
 
-    def execute_folder_opening(self):
-        """Start the folder opening process"""
-        if self.folder_thread and self.folder_thread.isRunning():
-            self.log("Folder opening process is already running.")
-            return
+    def execute_folder_opening(self, folders=None, use_lanes=True, profile=None, source=MANUAL):
+        """Open the configured folders (or the given subset of a profile), now or after the current run.
+
+        Folders open lane by lane (pinned, normal, lazy) unless use_lanes is False.
+        Returns the id of the started, queued or merged run, or None if nothing will run.
+        """
+        outcome, request = self.request_run(folders, use_lanes, profile, source)
+        return request.id if outcome in (START, QUEUED, MERGED, DUPLICATE) else None
 
-        if not self.folders:
+    def request_run(self, folders=None, use_lanes=True, profile=None, source=MANUAL):
+        """Offer a run to the queue and start it if nothing else runs.
+
+        A request made while a run is in progress is queued by priority (manual,
+        control API, schedule), merged into a waiting request of the same profile
+        or rejected, as the "run_queue" settings say. Returns (outcome, request):
+        a core.run_queue outcome and the request that carries the run, or
+        (None, None) when nothing will run.
+        """
+        if folders is None:
+            folders, profile = self.folders, profile or "default"
+        if not folders:
             self.log("No folders configured. Please add folders in the configurator.", logging.WARNING)
+            return None, None
+
+        request = RunRequest(folders, profile, source, use_lanes)
+        outcome, carrier = self.queue.offer(request, self._must_wait(), self.run_request)
+        if outcome == START:
+            if self._start_run(carrier) is None:
+                return None, None
+        elif outcome == DUPLICATE:
+            self.log(f"Run {carrier.id} already opens {request.describe()}.")
+        elif outcome == MERGED:
+            self.log(f"Request merged into queued run {carrier.id}: {carrier.describe()}.")
+        elif outcome == QUEUED:
+            self.log(f"Run {carrier.id} queued at position {self.queue.position(carrier)}: {carrier.describe()}.")
+        else:
+            reason = "a run is already in progress" if self.queue.policy == REJECT else "the run queue is full"
+            self.log(f"{request.describe()} not started: {reason}.", logging.WARNING)
+        if outcome in (QUEUED, MERGED):
+            self._queue_changed()
+        return outcome, carrier
+
+    def start_next_run(self):
+        """Start the next queued run unless one is in progress. Returns its id or None."""
+        while self.queue and not self._must_wait():
+            request = self.queue.pop()
+            self._queue_changed()
+            if self._start_run(request) is not None:
+                return request.id
+        return None
+
+    def remove_queued_run(self, run_id):
+        """Drop a queued run. Returns True if it was waiting."""
+        request = self.queue.remove(run_id)
+        if request is None:
+            return False
+        self.log(f"Queued run {run_id} removed: {request.describe()}.")
+        self._queue_changed()
+        return True
+
+    def clear_queue(self):
+        """Drop every queued run and return how many there were"""
+        count = self.queue.clear()
+        if count:
+            self.log(f"{count} queued runs removed.")
+            self._queue_changed()
+        return count
+
+    def _must_wait(self):
+        """Whether a new run has to wait: one is in progress, or a profile session is typing"""
+        if self.is_running():
+            return True
+        return bool(self.session_manager and self.session_manager.drives_input() and
+                    not get_backend_class().concurrent_windows)
+
+    def _queue_changed(self):
+        self.update_queue_label()
+        self._notify(RunEvent.QUEUE, queued=[request.to_dict() for request in self.queue.pending()])
+
+    def update_queue_label(self):
+        """List the waiting runs under the progress bar"""
+        if not self.queue_label:
             return
+        pending = self.queue.pending()
+        self.queue_label.setText("Queued: " + ", ".join(request.describe() for request in pending))
+        self.queue_label.setVisible(bool(pending))
+
+    def _start_run(self, request):
+        """Start a run that may run now. Returns its id, or None if it has no folder to open."""
+        folders, use_lanes = request.folders, request.use_lanes
+        order = (lambda part: locality_order(part, self.keep_order)) if self.optimize_order else None
+        if use_lanes:
+            positions, lanes, deferred = lane_plan(folders, self.pinned, self.lazy, self.defer_lazy, order)
+        else:
+            positions, lanes, deferred = order(folders) if order else list(range(len(folders))), [], []
+        self.deferred_folders = [folders[i] for i in deferred]
+        if not positions:
+            self.log(f"All {len(folders)} folders are lazy. Open them from the tray with 'Open Deferred Folders'.")
+            return None
 
         if self.execute_button:
             self.execute_button.setEnabled(False)
@@ -64,42 +290,157 @@ class FolderOpeningManager:
         if self.logger:
             self.logger.clear_log_widget()
 
+        self.run_id = request.id
+        self.run_request = request
+        self.run_folders = [folders[i] for i in positions]
+        # A single lane needs no lane events
+        self.run_lanes = lanes if len(lanes) > 1 else []
+        self.progress_index = 0
+        self.auto_close_scheduled = False
+        self.close_when_finished = False
+        self.cancelling = False
         self.log("Starting folder opening process...")
+        if self.optimize_order and any(position != i for i, position in enumerate(positions)):
+            self.log("Folders reordered to open each location together")
+        if self.run_lanes:
+            self.log("Opening " + ", then ".join(f"{count} {lane}" for lane, count in self.run_lanes) + " folders")
+        if self.deferred_folders:
+            self.log(f"{len(self.deferred_folders)} lazy folders left for 'Open Deferred Folders' in the tray")
+        # The worker estimates the run from the history and announces it with estimate_signal
+        self.estimator = None
+        self._notify(RunEvent.STARTED, total=len(self.run_folders))
 
-        self.folder_thread = FolderOpeningThread(self.folders, self.sleep_timers)
-        self.folder_thread.log_signal.connect(self._on_log)
-        self.folder_thread.progress_signal.connect(self.update_progress)
-        self.folder_thread.finished_signal.connect(self.on_folder_opening_finished)
-        self.folder_thread.start()
+        self.trace = RunTrace()
+        self.step_timings = {}
+        self._worker().submit(self.run_id, self.run_folders, self.timing,
+                              listeners=[self.trace.handle, self._record_step] + self.worker_listeners,
+                              windows=self.windows,
+                              max_tabs=self.max_tabs, prefetch_depth=self.prefetch_depth,
+                              scan_limit=self.scan_limit, lanes=self.run_lanes, input_pause=self.input_pause,
+                              failsafe=self.failsafe)
+        self.eta_timer.start()
+        self.update_eta()
+        return self.run_id
 
-    def on_folder_opening_finished(self, success, message):
-        """Handle completion of folder opening process"""
-        if self.execute_button:
-            self.execute_button.setEnabled(True)
+    def _worker(self):
+        """The persistent worker thread, created with the first run"""
+        if self.folder_thread is None:
+            self.folder_thread = FolderOpeningThread(clock=self.clock)
+            self.folder_thread.log_signal.connect(self._on_log)
+            self.folder_thread.progress_signal.connect(self._on_progress)
+            self.folder_thread.timing_signal.connect(self._on_timing)
+            self.folder_thread.lane_signal.connect(self._on_lane)
+            self.folder_thread.estimate_signal.connect(self._on_estimate)
+            self.folder_thread.finished_signal.connect(self.on_folder_opening_finished)
+        return self.folder_thread
 
-        if self.cancel_button:
-            self.cancel_button.setEnabled(False)  # Disable cancel button when process finishes
+    def shutdown(self):
+        """Stop the worker thread (call before the application quits)"""
+        if self.folder_thread is not None:
+            self.folder_thread.stop()
 
-        if success:
-            self.log("Folder opening process completed successfully.")
-            if self.auto_close:
-                delay_ms = int(self.auto_close_delay * 1000)
-                self.log(f"Auto-close enabled. Closing application in {self.auto_close_delay} seconds...")
-                QTimer.singleShot(delay_ms, self._auto_close)
-        else:
-            self.log(f"Folder opening process failed: {message}", logging.ERROR)
+    def _is_current(self, run_id):
+        """Whether a worker signal belongs to the run in progress, not to one cancelled before it"""
+        return run_id == self.run_id and self.is_running()
 
-    def _on_log(self, message):
+    def _on_log(self, run_id, message):
         """Handle log messages from the folder opening thread"""
-        self.log(message)
+        # The last lines of a cancelled run may still be logged, unless the next run has started
+        if run_id != self.run_id:
+            return
+        with self.trace.gui_slice("log append"):
+            self.log(message)
+            self._notify(RunEvent.LOG, message=message)
+
+    def _on_progress(self, run_id, value):
+        if self._is_current(run_id):
+            self.update_progress(value)
+
+    def _on_lane(self, run_id, lane):
+        if self._is_current(run_id):
+            self.on_lane_finished(lane)
+
+    def _on_estimate(self, run_id):
+        """Take over the run estimate made by the worker thread"""
+        estimator = self.folder_thread.take_estimate(run_id)
+        if estimator is None or not self._is_current(run_id):
+            return
+        # The sliders may have moved since the worker read the timers
+        estimator.retime(self.sleep_timers)
+        estimator.start(self.clock.now())
+        self.estimator = estimator
+        self.log(f"Estimated duration: {format_duration(estimator.predicted_total())}")
+        self.update_eta()
+
+    def _on_timing(self, run_id, kind, index, duration):
+        """Feed measured step and folder durations to the run estimate"""
+        if self.estimator and self._is_current(run_id):
+            self.estimator.handle(RunEvent(kind, index=index, duration=duration), self.clock.now())
 
     def update_progress(self, value):
         """Update the progress bar"""
-        if self.progress_bar:
-            self.progress_bar.setValue((value + 1) * 100 / len(self.folders))
+        with self.trace.gui_slice("progress update", index=value):
+            self.progress_index = value
+            if self.progress_bar:
+                self.progress_bar.setValue((value + 1) * 100 / len(self.run_folders))
+            self.update_eta()
+            self.update_timing_readout()
+            self._notify(RunEvent.PROGRESS, index=value, total=len(self.run_folders), eta_seconds=self.get_eta())
+
+    def update_eta(self):
+        """Show the estimated time left next to the percentage"""
+        if not self.progress_bar:
+            return
+        eta = self.get_eta()
+        if eta is None:
+            self.progress_bar.setFormat("%p%")
+        else:
+            self.progress_bar.setFormat(f"%p% - about {format_duration(eta)} left")
+
+    def _stop_eta(self):
+        self.eta_timer.stop()
+        self.estimator = None
+        self.update_eta()
+
+    def export_trace(self, path):
+        """Write the timeline of the current or last run as a Chrome trace. Returns False if there is none."""
+        if not self.trace:
+            return False
+        self.trace.write(path)
+        return True
+
+    def open_deferred_folders(self):
+        """Open the lazy folders the last run left for on-demand opening. Returns the run id or None."""
+        if not self.deferred_folders:
+            self.log("No deferred folders to open.")
+            return None
+        return self.execute_folder_opening(list(self.deferred_folders), use_lanes=False, profile="deferred")
 
-    def on_folder_opening_finished(self, success, message):
-        """Handle completion of folder opening process"""
+    def on_lane_finished(self, lane):
+        """A lane of the run is open; auto-close may trigger before the lanes that follow"""
+        self.log(f"All {lane} folders are open.")
+        self._notify(RunEvent.LANE, lane=lane)
+
+        names = [name for name, _ in self.run_lanes]
+        later = names[names.index(lane) + 1:] if lane in names else []
+        target = LANES.index(self.auto_close_after)
+        if self.auto_close and later and not self.queue and all(LANES.index(name) > target for name in later):
+            self._schedule_auto_close()
+
+    def _schedule_auto_close(self):
+        if self.auto_close_scheduled:
+            return
+        self.auto_close_scheduled = True
+        self.log(f"Auto-close enabled. Closing application in {self.auto_close_delay} seconds...")
+        self.clock.call_later(self.auto_close_delay, self._auto_close)
+
+    def on_folder_opening_finished(self, run_id, success, message, cancelled=False):
+        """Handle completion of folder opening process, also when it stopped after cancel_folder_opening()"""
+        if not self._is_current(run_id):
+            # A late signal of an earlier run
+            return
+        self.run_request = None
+        self.cancelling = False
         self.log("Folder opening process finished, disabling cancel button")
         if self.execute_button:
             self.execute_button.setEnabled(True)
@@ -107,29 +448,57 @@ class FolderOpeningManager:
         if self.cancel_button:
             self.cancel_button.setEnabled(False)
 
+        if cancelled and self.progress_bar:
+            self.progress_bar.setValue(0)
+
+        self._stop_eta()
+        self.update_timing_readout()
+        self.last_result = {"run_id": self.run_id, "success": success, "message": message}
+        if cancelled:
+            self._notify(RunEvent.FINISHED, success=success, message=message, cancelled=True)
+        else:
+            self._notify(RunEvent.FINISHED, success=success, message=message)
+
         if success:
             self.log("Folder opening process completed successfully.")
-            if self.auto_close:
-                delay_ms = int(self.auto_close_delay * 1000)
-                self.log(f"Auto-close enabled. Closing application in {self.auto_close_delay} seconds...")
-                QTimer.singleShot(delay_ms, self._auto_close)
+        elif cancelled:
+            self.log("Folder opening process cancelled.", logging.WARNING)
         else:
             self.log(f"Folder opening process failed: {message}", logging.ERROR)
 
+        # Auto-close waits until the queued runs are done too
+        self.start_next_run()
+        if success and not self.is_running() and not self.queue:
+            if self.close_when_finished:
+                self._auto_close()
+            elif self.auto_close:
+                self._schedule_auto_close()
+
     def _auto_close(self):
         """Close the application (should be connected to the main window's close method)"""
+        if self.is_running() or self.queue:
+            # Wait for the remaining lanes and queued runs, also when closing would only hide the window in the tray
+            self.log("Closing once the remaining folders are open.")
+            self.close_when_finished = True
+            return
         if self.parent:
             self.parent.close()
 
-    def cancel_folder_opening(self):
-        """Cancel the ongoing folder opening process"""
-        if self.folder_thread and self.folder_thread.isRunning():
-            self.folder_thread.terminate()
-            self.folder_thread.wait()
-            self.log("Folder opening process cancelled.", logging.WARNING)
-            if self.execute_button:
-                self.execute_button.setEnabled(True)
-            if self.progress_bar:
-                self.progress_bar.setValue(0)
+    def cancel_folder_opening(self, clear_queue=False):
+        """Cancel the ongoing folder opening process. Returns True if a run was cancelled.
+
+        Returns at once: the run counts as running until the worker reports it
+        stopped (on_folder_opening_finished). The next queued run starts then,
+        unless clear_queue drops the queue as well.
+        """
+        if clear_queue:
+            self.clear_queue()
+        if self.is_running() and not self.cancelling:
+            # The engine stops at its next wait or action; at most one backend action is left to finish
+            self.cancelling = True
+            self.folder_thread.cancel()
+            self.log("Cancelling after the current action...", logging.WARNING)
             if self.cancel_button:
                 self.cancel_button.setEnabled(False)
+            return True
+        return False
@@ -0,0 +1,139 @@
+# folder_opening_thread.py
+
+"""Version 1.1"""
+
+import threading
+
+from PySide6.QtCore import QThread, Signal
+
+from app_config import HISTORY_PATH
+from core.api import open_folders
+from core.backends import get_backend_class
+from core.eta import RunEstimator
+from core.profiling import profile_thread
+from core.run_events import RunEvent
+from core.timing import TimingSettings
+
+
+class FolderOpeningThread(QThread):
+    """Persistent worker that runs the Qt-free core (core.api.open_folders) and forwards its events as Qt signals.
+
+    The thread is started with the first submitted run and then waits for the
+    next one, so runs do not pay for a new thread each time. One run can wait
+    while the previous one finishes; stop() ends the thread.
+    """
+
+    # Every signal carries the run id first, so events of a cancelled run can be told apart from the next one's
+    log_signal = Signal(int, str)
+    progress_signal = Signal(int, int)
+    # (run id, success, message, cancelled)
+    finished_signal = Signal(int, bool, str, bool)
+    # (run id), emitted before the run starts, when take_estimate() has its RunEstimator
+    estimate_signal = Signal(int)
+    # (run id, event kind, index, duration)
+    timing_signal = Signal(int, str, int, float)
+    lane_signal = Signal(int, str)
+
+    def __init__(self, backend_name=None, clock=None):
+        super().__init__()
+        self.backend_name = backend_name
+        self.clock = clock
+        self.condition = threading.Condition()
+        self.job = None
+        self.running = False
+        self.stopping = False
+        self.cancel_event = threading.Event()
+        # Run id -> RunEstimator of the last started run, until the GUI thread takes it
+        self.estimates = {}
+
+    def submit(self, run_id, folders, sleep_timers, listeners=(), **options):
+        """Hand a run to the worker; listeners are called with every engine RunEvent on the worker thread.
+
+        sleep_timers may be a core.timing.TimingSettings shared with the GUI
+        thread. options are keyword arguments of core.api.open_folders
+        (windows, max_tabs, prefetch_depth, scan_limit, lanes, input_pause, failsafe).
+        Every signal carries run_id, so late events of an earlier run can be told apart.
+        """
+        with self.condition:
+            if self.job is not None:
+                raise RuntimeError("A run is already waiting for the worker")
+            self.cancel_event = threading.Event()
+            self.job = (run_id, list(folders), sleep_timers, list(listeners), options, self.cancel_event)
+            self.condition.notify_all()
+        if not self.isRunning():
+            self.start()
+
+    def cancel(self):
+        """Ask the engine to stop the last submitted run; it finishes after the current action.
+
+        Does not wait: finished_signal reports the run, with cancelled set, once it has stopped.
+        """
+        self.cancel_event.set()
+
+    def take_estimate(self, run_id):
+        """Return the RunEstimator announced by estimate_signal; it then belongs to the caller"""
+        with self.condition:
+            return self.estimates.pop(run_id, None)
+
+    def stop(self):
+        """Cancel the current run and end the thread"""
+        with self.condition:
+            self.stopping = True
+            self.job = None
+            self.cancel_event.set()
+            self.condition.notify_all()
+        self.wait()
+
+    def run(self):
+        with profile_thread("FolderOpeningThread"):
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.job is not None or self.stopping)
+                    if self.stopping:
+                        return
+                    job, self.job = self.job, None
+                    self.running = True
+                try:
+                    self._run_job(*job)
+                finally:
+                    with self.condition:
+                        self.running = False
+                        self.condition.notify_all()
+
+    def _run_job(self, run_id, folders, sleep_timers, listeners, options, cancel_event):
+        def on_event(event):
+            for listener in listeners:
+                listener(event)
+            self._forward_event(run_id, event)
+
+        # The history is read and written from this thread so the GUI thread never waits on SQLite
+        estimator = self._estimate(folders, sleep_timers, options)
+        with self.condition:
+            self.estimates = {run_id: estimator}
+        self.estimate_signal.emit(run_id)
+        open_folders(folders, self.backend_name, on_event, sleep_timers, clock=self.clock, cancel_event=cancel_event,
+                     history_path=HISTORY_PATH, **options)
+
+    def _estimate(self, folders, sleep_timers, options):
+        try:
+            concurrent = get_backend_class(self.backend_name).concurrent_windows
+        except ValueError:
+            # open_folders reports the unknown backend
+            concurrent = False
+        return RunEstimator.from_history(folders, TimingSettings.of(sleep_timers).snapshot()[1], HISTORY_PATH,
+                                         windows=options.get("windows", 1), max_tabs=options.get("max_tabs", 0),
+                                         concurrent=concurrent, lanes=options.get("lanes"))
+
+    def _forward_event(self, run_id, event):
+        """Forward engine events to the Qt signals (delivered on the GUI thread)"""
+        if event.kind == RunEvent.LOG:
+            self.log_signal.emit(run_id, event["message"])
+        elif event.kind == RunEvent.PROGRESS:
+            self.progress_signal.emit(run_id, event["index"])
+        elif event.kind == RunEvent.FOLDER or (event.kind == RunEvent.STEP and event["index"] < 0):
+            # Finished folders and the Explorer launch are enough for the run estimate
+            self.timing_signal.emit(run_id, event.kind, event["index"], event["duration"])
+        elif event.kind == RunEvent.LANE:
+            self.lane_signal.emit(run_id, event["lane"])
+        elif event.kind == RunEvent.FINISHED:
+            self.finished_signal.emit(run_id, event["success"], event["message"], bool(event.get("cancelled")))
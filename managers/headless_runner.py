@@ -0,0 +1,468 @@
+# headless_runner.py
+
+"""Version 1.1"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from app_config import CONFIG_PATH, HISTORY_PATH
+from core.action_program import compile_run
+from core.api import open_folders
+from core.backends import get_backend, get_backend_class, pacing_options
+from core.clock import VirtualClock
+from core.folder_selection import select_folders
+from core.lanes import lane_options, lane_plan
+from core.eta import RunEstimator, format_duration
+from core.metrics import RunMetrics
+from core.opening_engine import FolderOpeningEngine
+from core.ordering import locality_order, ordering_options
+from core.prefetch import prefetch_options
+from core.run_history import RunHistory, RunHistoryRecorder
+from core.trace_export import RunTrace
+from core.window_groups import window_options
+from core.run_events import RunEvent
+from managers.config_manager import ConfigManager
+from managers.control_client import ControlClient, ControlError
+
+
+class HeadlessRunner:
+    """Runs the command line subcommands without building the GUI.
+
+    Must not import any Qt widget module, so that scripted runs skip GUI startup.
+    """
+
+    EXIT_SUCCESS = 0
+    EXIT_FAILED = 1
+    EXIT_CONFIG_ERROR = 2
+    EXIT_NOT_RUNNING = 3
+    EXIT_INTERRUPTED = 130
+
+    def __init__(self, config_path=CONFIG_PATH, json_output=False, backend_name=None, stream=None,
+                 history_path=HISTORY_PATH, settings=None):
+        self.config_manager = ConfigManager(config_path)
+        # The config dictionary when the caller already loaded it, read by run() otherwise
+        self.settings = settings
+        self.history_path = history_path
+        self.json_output = json_output
+        self.backend_name = backend_name
+        self.stream = stream or sys.stdout
+
+    def run_command(self, cmd_handler):
+        """Run the subcommand parsed by a CommandLineHandler and return a process exit code"""
+        command = cmd_handler.get_command()
+        if command == 'open':
+            self.backend_name = cmd_handler.get_option('backend', self.backend_name)
+            return self.run(
+                patterns=cmd_handler.get_option('only'),
+                limit=cmd_handler.get_option('limit'),
+                dry_run=cmd_handler.get_option('dry_run', False),
+                trace_path=cmd_handler.get_option('trace'),
+                windows=cmd_handler.get_option('windows'),
+                max_tabs=cmd_handler.get_option('max_tabs'),
+                prefetch_depth=cmd_handler.get_option('prefetch'),
+                order=cmd_handler.get_option('order'),
+                include_lazy=cmd_handler.get_option('include_lazy', False)
+            )
+        if command == 'validate':
+            return self.validate()
+        if command == 'bench':
+            return self.bench(
+                patterns=cmd_handler.get_option('only'),
+                limit=cmd_handler.get_option('limit'),
+                repeat=cmd_handler.get_option('repeat', 5)
+            )
+        if command == 'control':
+            return self.control(
+                cmd_handler.get_option('control_action'),
+                patterns=cmd_handler.get_option('only'),
+                limit=cmd_handler.get_option('limit'),
+                wait=cmd_handler.get_option('wait', False)
+            )
+        if command == 'history':
+            return self.history(
+                last_runs=cmd_handler.get_option('last', 20),
+                view=cmd_handler.get_option('by', 'step')
+            )
+        if command == 'config':
+            if cmd_handler.get_option('config_action') == 'set':
+                return self.config_set(cmd_handler.get_option('key'), cmd_handler.get_option('value'))
+            return self.config_get(cmd_handler.get_option('key'))
+
+        self.write(f"Unknown command: {command}", {"event": "error", "message": f"Unknown command: {command}"})
+        return self.EXIT_CONFIG_ERROR
+
+    def load_folders(self, patterns=None, limit=None):
+        """Load the config and return (folders, sleep_timers), or None if nothing is configured"""
+        folders, sleep_timers, _, _, _, _, is_first_run = self.config_manager.load_config()
+        if is_first_run or not folders:
+            self.report(RunEvent(RunEvent.FINISHED, success=False,
+                                 message="No folders configured. Run with --configure to add folders."))
+            return None
+
+        selected = select_folders(folders, patterns, limit)
+        if not selected:
+            self.report(RunEvent(RunEvent.FINISHED, success=False,
+                                 message="No configured folder matches the given --only patterns."))
+            return None
+        return selected, sleep_timers
+
+    def run(self, patterns=None, limit=None, dry_run=False, trace_path=None, windows=None, max_tabs=None,
+            prefetch_depth=None, order=None, include_lazy=False):
+        """Load the config, open the selected folders and return a process exit code.
+
+        windows and max_tabs override the "windows" config section, prefetch_depth
+        the "prefetch" section and order ('list' or 'locality') the "ordering" section.
+        Lazy folders set to open on demand are skipped unless include_lazy is True.
+        """
+        loaded = self.load_folders(patterns, limit)
+        if loaded is None:
+            return self.EXIT_CONFIG_ERROR
+        folders, sleep_timers = loaded
+        settings = self.config_manager.load_settings() if self.settings is None else self.settings
+
+        config_windows, config_max_tabs = window_options(ConfigManager.section(settings, "windows", {}))
+        windows = windows or config_windows
+        max_tabs = config_max_tabs if max_tabs is None else max_tabs
+
+        optimize, keep_order = ordering_options(ConfigManager.section(settings, "ordering", {}))
+        if order is not None:
+            optimize = order == "locality"
+        pinned, lazy, defer_lazy, _ = lane_options(ConfigManager.section(settings, "lanes", {}))
+        positions, lanes, deferred = lane_plan(
+            folders, pinned, lazy, defer_lazy and not include_lazy,
+            (lambda part: locality_order(part, keep_order)) if optimize else None)
+        if deferred:
+            self.write(f"Skipping {len(deferred)} lazy folders (open them with --include-lazy)",
+                       {"event": "deferred", "folders": [folders[i] for i in deferred]})
+        if not positions:
+            self.report(RunEvent(RunEvent.FINISHED, success=False, message="Only lazy folders to open."))
+            return self.EXIT_CONFIG_ERROR
+        folders = [folders[i] for i in positions]
+        # A single lane needs no lane events
+        lanes = lanes if len(lanes) > 1 else None
+
+        if dry_run:
+            return self.dry_run(folders, sleep_timers, windows, max_tabs, positions, lanes)
+
+        try:
+            backend = get_backend(self.backend_name,
+                                  *pacing_options(ConfigManager.section(settings, "input_pacing", {})))
+        except Exception as e:
+            self.report(RunEvent(RunEvent.FINISHED, success=False, message=str(e)))
+            return self.EXIT_CONFIG_ERROR
+
+        recorder = RunHistoryRecorder(self.history_path, backend.name, sleep_timers, len(folders))
+        trace = RunTrace(worker_name="Engine", gui_name="Output") if trace_path else None
+        metrics_file = ConfigManager.section(settings, "metrics", {}).get("textfile")
+        metrics = RunMetrics() if metrics_file else None
+
+        def on_event(event):
+            recorder.handle(event)
+            if metrics:
+                metrics.handle(event)
+            if trace:
+                trace.handle(event)
+                with trace.gui_slice(event.kind):
+                    self.report(event)
+            else:
+                self.report(event)
+
+        config_depth, scan_limit = prefetch_options(ConfigManager.section(settings, "prefetch", {}))
+        depth = config_depth if prefetch_depth is None else prefetch_depth
+        try:
+            success = open_folders(folders, backend, on_event, sleep_timers, windows, max_tabs, depth, scan_limit, lanes)
+        except KeyboardInterrupt:
+            on_event(RunEvent(RunEvent.FINISHED, success=False, message="Interrupted", error_class="KeyboardInterrupt"))
+            return self.EXIT_INTERRUPTED
+        finally:
+            recorder.close()
+            if trace:
+                self.write_trace(trace, trace_path)
+            if metrics:
+                self.write_metrics(metrics, metrics_file)
+
+        return self.EXIT_SUCCESS if success else self.EXIT_FAILED
+
+    def dry_run(self, folders, sleep_timers, windows, max_tabs, positions=None, lanes=None):
+        """Print the compiled action program with the predicted start of each action.
+
+        positions holds the list position of each folder when the run was reordered,
+        lanes the (lane, folder count) of each part of the run.
+        """
+        try:
+            concurrent = get_backend_class(self.backend_name).concurrent_windows
+        except ValueError as e:
+            self.report(RunEvent(RunEvent.FINISHED, success=False, message=str(e)))
+            return self.EXIT_CONFIG_ERROR
+
+        positions = positions or list(range(len(folders)))
+        moved = sum(position != i for i, position in enumerate(positions))
+        if moved:
+            self.write(f"Run order: {moved} of {len(folders)} folders moved from their list position",
+                       {"event": "ordering", "moved": moved, "total": len(folders), "positions": positions})
+
+        estimator = RunEstimator.from_history(folders, sleep_timers, self.history_path, windows=windows,
+                                              max_tabs=max_tabs, concurrent=concurrent, lanes=lanes)
+        program = compile_run(folders, sleep_timers, windows, max_tabs, concurrent, estimator.step_overhead, lanes)
+        folder_lanes = [lane for lane, count in lanes or [] for _ in range(count)]
+        for action in program.actions:
+            if action.begins_folder:
+                i = action.index
+                listed = f", list position {positions[i] + 1}" if positions[i] != i else ""
+                lane = f" [{folder_lanes[i]}]" if folder_lanes else ""
+                self.write(f"{i + 1:>4}. {action.folder}{lane}  (~{estimator.predictions[i]:.1f}s{listed})",
+                           {"event": "planned", "index": i, "folder": action.folder, "window": action.window,
+                            "lane": folder_lanes[i] if folder_lanes else None, "list_position": positions[i],
+                            "estimated_seconds": round(estimator.predictions[i], 3)})
+            self.write(f"      {action.at:8.2f}s  {action.describe()}", {"event": "action", **action.to_dict()})
+
+        self.write(f"Predicted duration: {format_duration(program.duration)} for {len(folders)} folders "
+                   f"({len(program)} actions)",
+                   {"event": "estimate", "total": len(folders), "actions": len(program),
+                    "estimated_seconds": round(program.duration, 3)})
+        return self.EXIT_SUCCESS
+
+    def write_trace(self, trace, path):
+        try:
+            trace.write(path)
+        except OSError as e:
+            print(f"Could not write the trace to {path}: {e}", file=sys.stderr)
+
+    def write_metrics(self, metrics, path):
+        try:
+            metrics.write_textfile(path)
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {e}", file=sys.stderr)
+
+    def validate(self):
+        """Check the config file and the folder paths. Warnings do not fail validation."""
+        try:
+            config = self.config_manager.read_config_file()
+        except (OSError, ValueError) as e:
+            self.write(f"ERROR: Cannot read {self.config_manager.config_path}: {e}",
+                       {"event": "validation", "level": "error", "message": str(e)})
+            return self.EXIT_CONFIG_ERROR
+
+        errors = 0
+        issues = []
+        folders = config.get('folders', [])
+        if not isinstance(folders, list) or not folders:
+            issues.append(("error", "No folders configured"))
+            folders = []
+
+        seen = set()
+        for folder in folders:
+            if not isinstance(folder, str):
+                issues.append(("error", f"Folder entry is not a path: {folder!r}"))
+                continue
+            key = os.path.normcase(os.path.normpath(folder))
+            if key in seen:
+                issues.append(("warning", f"Duplicate folder: {folder}"))
+            seen.add(key)
+            if not os.path.isdir(folder):
+                issues.append(("warning", f"Folder does not exist or is not reachable: {folder}"))
+
+        sleep_timers = config.get('sleep_timers', {})
+        for name in ConfigManager.DEFAULT_SLEEP_TIMERS:
+            value = sleep_timers.get(name) if isinstance(sleep_timers, dict) else None
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                issues.append(("error", f"Sleep timer '{name}' must be a non-negative number"))
+
+        delay = config.get('auto_close_delay', 0)
+        if isinstance(delay, bool) or not isinstance(delay, (int, float)) or delay < 0:
+            issues.append(("error", "'auto_close_delay' must be a non-negative number"))
+
+        for level, message in issues:
+            errors += level == "error"
+            self.write(f"{level.upper()}: {message}", {"event": "validation", "level": level, "message": message})
+
+        summary = f"{len(folders)} folders, {errors} errors, {len(issues) - errors} warnings"
+        self.write(("FAILED: " if errors else "OK: ") + summary,
+                   {"event": "validated", "success": not errors, "folders": len(folders),
+                    "errors": errors, "warnings": len(issues) - errors})
+        return self.EXIT_FAILED if errors else self.EXIT_SUCCESS
+
+    def bench(self, patterns=None, limit=None, repeat=5):
+        """Time the engine on the configured folders with the simulated backend and virtual sleeps"""
+        loaded = self.load_folders(patterns, limit)
+        if loaded is None:
+            return self.EXIT_CONFIG_ERROR
+        folders, sleep_timers = loaded
+
+        # The program is compiled once and replayed, so the timings cover the engine only
+        program = compile_run(folders, sleep_timers)
+        durations = []
+        for _ in range(repeat):
+            clock = VirtualClock()
+            engine = FolderOpeningEngine(folders, sleep_timers, get_backend("simulated"), clock=clock)
+            start = time.perf_counter()
+            if not engine.run(program):
+                return self.EXIT_FAILED
+            durations.append(time.perf_counter() - start)
+
+        best = min(durations)
+        configured_sleep = clock.slept
+        self.write(
+            f"{len(folders)} folders, best of {repeat}: {best * 1000:.2f} ms engine overhead "
+            f"({len(folders) / best if best else float('inf'):.0f} folders/s); "
+            f"configured sleeps add {configured_sleep:.1f} s per run",
+            {"event": "bench", "folders": len(folders), "repeat": repeat,
+             "durations": durations, "configured_sleep": configured_sleep}
+        )
+        return self.EXIT_SUCCESS
+
+    def control(self, action, patterns=None, limit=None, wait=False):
+        """Drive the running instance through its control API"""
+        try:
+            with ControlClient() as client:
+                if action == 'status':
+                    status = client.status()
+                    self.write(self.describe_status(status), status)
+                    return self.EXIT_SUCCESS
+                if action == 'cancel':
+                    cancelled = client.cancel()
+                    self.write("Run cancelled." if cancelled else "No run in progress.",
+                               {"event": "cancel", "cancelled": cancelled})
+                    return self.EXIT_SUCCESS
+                if action == 'start':
+                    if wait:
+                        # Subscribe first so no event of the new run is missed
+                        client.subscribe()
+                    reply = client.start(only=patterns, limit=limit)
+                    run_id, position = reply["run_id"], reply.get("queued")
+                    if position is None:
+                        self.write(f"Started run {run_id}.", {"event": "started", "run_id": run_id})
+                    else:
+                        self.write(f"Run {run_id} queued at position {position}." if position else
+                                   f"Run {run_id} in progress already opens these folders.",
+                                   {"event": "queued", "run_id": run_id, "position": position})
+                    return self.watch(client, run_id) if wait else self.EXIT_SUCCESS
+                client.subscribe()
+                return self.watch(client)
+        except ControlError as e:
+            self.write(f"ERROR: {e}", {"event": "error", "message": str(e)})
+            return self.EXIT_NOT_RUNNING
+        except KeyboardInterrupt:
+            return self.EXIT_INTERRUPTED
+
+    def watch(self, client, run_id=None):
+        """Print streamed events; with a run id, return once that run finishes"""
+        for record in client.events():
+            if run_id is not None and record.get("run_id") != run_id:
+                continue
+            if self.json_output:
+                self.write(None, record)
+            elif record["event"] == "log":
+                self.write(record["message"], record)
+            elif record["event"] == "finished":
+                self.write(f"{'OK' if record['success'] else 'FAILED'}: {record['message']}", record)
+            if run_id is not None and record["event"] == "finished":
+                return self.EXIT_SUCCESS if record["success"] else self.EXIT_FAILED
+        return self.EXIT_SUCCESS if run_id is None else self.EXIT_NOT_RUNNING
+
+    @staticmethod
+    def describe_status(status):
+        if status.get("running"):
+            description = f"Run {status['run_id']} in progress: folder {status['index'] + 1} of {status['total']}"
+            if status.get("eta_seconds") is not None:
+                description += f", about {format_duration(status['eta_seconds'])} left"
+            if status.get("queued"):
+                description += f"; {len(status['queued'])} more runs queued"
+            return description
+        last_result = status.get("last_result")
+        if last_result:
+            return (f"Idle. Last run {last_result['run_id']} "
+                    f"{'succeeded' if last_result['success'] else 'failed'}: {last_result['message']}")
+        return "Idle. No run since the launcher started."
+
+    def history(self, last_runs=20, view='step'):
+        """Print timing statistics of the last runs from the history store"""
+        try:
+            history = RunHistory(self.history_path)
+        except sqlite3.Error as e:
+            self.write(f"Cannot open the run history: {e}", {"event": "error", "message": str(e)})
+            return self.EXIT_CONFIG_ERROR
+
+        try:
+            if view == 'run':
+                for run in history.recent_runs(last_runs):
+                    status = {True: "OK", False: "FAILED", None: "INCOMPLETE"}[run["success"]]
+                    duration = f"{run['duration']:.1f}s" if run["duration"] is not None else "-"
+                    self.write(f"{datetime.fromtimestamp(run['started']):%Y-%m-%d %H:%M}  {run['run_id']}  "
+                               f"{run['total']:>4} folders  {duration:>8}  {status}  {run['backend']}",
+                               {"event": "history_run", **run})
+            elif view == 'folder':
+                for item in history.folder_stats(last_runs):
+                    self.write(f"p50 {item['p50']:7.2f}s  p95 {item['p95']:7.2f}s  n={item['count']:<4} "
+                               f"failures={item['failures']:<3} {item['folder']}",
+                               {"event": "history_folder", **item})
+            else:
+                for item in history.step_stats(last_runs):
+                    overhead = f"{item['overhead_p50']:+7.3f}s" if item["overhead_p50"] is not None else "       -"
+                    self.write(f"{item['step']:<18} p50 {item['p50']:7.3f}s  p95 {item['p95']:7.3f}s  "
+                               f"over config {overhead}  total {item['total']:9.1f}s  n={item['count']}",
+                               {"event": "history_step", **item})
+        finally:
+            history.close()
+        return self.EXIT_SUCCESS
+
+    def config_get(self, key=None):
+        """Print the whole config or one value as JSON"""
+        try:
+            value = self.config_manager.read_config_file() if not key else self.config_manager.get_value(key)
+        except KeyError:
+            self.write(f"Unknown setting: {key}", {"event": "error", "message": f"Unknown setting: {key}"})
+            return self.EXIT_FAILED
+        except (OSError, ValueError) as e:
+            self.write(f"Cannot read config: {e}", {"event": "error", "message": str(e)})
+            return self.EXIT_CONFIG_ERROR
+
+        self.write(json.dumps(value, indent=2), {"event": "config", "key": key, "value": value})
+        return self.EXIT_SUCCESS
+
+    def config_set(self, key, raw_value):
+        """Change one value; raw_value is parsed as JSON and used as a string if that fails"""
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            value = raw_value
+
+        try:
+            self.config_manager.set_value(key, value)
+        except KeyError:
+            self.write(f"Unknown setting: {key}", {"event": "error", "message": f"Unknown setting: {key}"})
+            return self.EXIT_FAILED
+        except (OSError, json.JSONDecodeError) as e:
+            self.write(f"Cannot set {key}: {e}", {"event": "error", "message": str(e)})
+            return self.EXIT_CONFIG_ERROR
+        except ValueError as e:
+            # An invalid value, like an unknown setting, is the caller's mistake
+            self.write(f"Cannot set {key}: {e}", {"event": "error", "message": str(e)})
+            return self.EXIT_FAILED
+
+        self.write(f"{key} = {json.dumps(value)}", {"event": "config", "key": key, "value": value})
+        return self.EXIT_SUCCESS
+
+    def write(self, text, record):
+        """Write a line of output as plain text or as a JSON record"""
+        print(json.dumps(record) if self.json_output else text, file=self.stream, flush=True)
+
+    def report(self, event):
+        """Write an engine event to the console as text or as a JSON line"""
+        if self.json_output:
+            line = json.dumps(event.to_dict())
+        elif event.kind == RunEvent.LOG:
+            line = event["message"]
+        elif event.kind == RunEvent.LANE:
+            line = f"All {event['lane']} folders are open."
+        elif event.kind == RunEvent.FINISHED:
+            status = "OK" if event["success"] else "FAILED"
+            line = f"{status}: {event['message']}"
+        else:
+            return
+
+        print(line, file=self.stream, flush=True)
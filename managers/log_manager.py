@@ -8,17 +8,18 @@ from PySide6.QtWidgets import QTextEdit
 
 
 class LogManager:
-    def __init__(self, log_text_widget=None):
+    def __init__(self, log_text_widget=None, debug=False):
         self.log_text_widget = log_text_widget
+        level = logging.DEBUG if debug else logging.INFO
 
         # Configure Python's logging system
         self.logger = logging.getLogger('FolderOpener')
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(level)
 
         # Create file handler for logging to file
         try:
             file_handler = logging.FileHandler('folder_opener.log')
-            file_handler.setLevel(logging.INFO)
+            file_handler.setLevel(level)
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
@@ -31,6 +32,10 @@ class LogManager:
 
     def log(self, message, level=logging.INFO):
         """Log a message to both the UI and log file"""
+        # Skip messages below the configured level (debug output is opt-in)
+        if not self.logger.isEnabledFor(level):
+            return
+
         # Log to file using Python's logging
         if level == logging.INFO:
             self.logger.info(message)
@@ -47,6 +52,10 @@ class LogManager:
             log_entry = f"[{timestamp}] {message}"
             self.log_text_widget.append(log_entry)
 
+    def write_to_file(self, message, level=logging.WARNING):
+        """Log a message to the log file only (for details too long for the log widget)"""
+        self.logger.log(level, message)
+
     def info(self, message):
         """Log an info message"""
         self.log(message, logging.INFO)
@@ -0,0 +1,103 @@
+# metrics_manager.py
+
+"""Version 1.1"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PySide6.QtCore import QTimer
+
+from core.metrics import RunMetrics
+
+
+class MetricsManager:
+    """Keeps the launcher's run metrics and exports them in the Prometheus text format.
+
+    Exports are opt-in through the "metrics" config section: "textfile" is a path
+    rewritten every "interval_seconds" (for the node-exporter textfile collector),
+    "port" serves /metrics on 127.0.0.1.
+    """
+
+    DEFAULT_INTERVAL_SECONDS = 60
+
+    def __init__(self, parent, folder_opening_manager, logger=None, settings=None):
+        settings = settings or {}
+        self.logger = logger
+        self.metrics = RunMetrics()
+        self.textfile = settings.get("textfile")
+        self.port = settings.get("port")
+        self.server = None
+        self._textfile_error = None
+
+        # Counted on the worker thread, which also reports cancelled runs
+        folder_opening_manager.add_worker_listener(self.metrics.handle)
+
+        interval = settings.get("interval_seconds", self.DEFAULT_INTERVAL_SECONDS)
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+            interval = self.DEFAULT_INTERVAL_SECONDS
+        self.flush_timer = QTimer(parent)
+        self.flush_timer.setInterval(int(interval * 1000))
+        self.flush_timer.timeout.connect(self.flush)
+
+    def start(self):
+        if self.textfile:
+            self.flush()
+            self.flush_timer.start()
+        if isinstance(self.port, int) and not isinstance(self.port, bool):
+            self.start_server(self.port)
+
+    def stop(self):
+        self.flush_timer.stop()
+        if self.textfile:
+            self.flush()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def attach_stall_watchdog(self, stall_watchdog):
+        stall_watchdog.stall_detected.connect(lambda duration_ms, stack: self.metrics.record_stall(duration_ms))
+
+    def flush(self):
+        """Rewrite the metrics text file"""
+        if not self.textfile:
+            return
+        try:
+            self.metrics.write_textfile(self.textfile)
+            self._textfile_error = None
+        except OSError as e:
+            # Report a failing path once, not on every flush
+            if self.logger and str(e) != self._textfile_error:
+                self.logger.warning(f"Could not write metrics to {self.textfile}: {e}")
+            self._textfile_error = str(e)
+
+    def start_server(self, port):
+        """Serve the metrics on http://127.0.0.1:<port>/metrics from a background thread"""
+        metrics = self.metrics
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer(('127.0.0.1', port), MetricsRequestHandler)
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"Could not serve metrics on port {port}: {e}")
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="MetricsServer", daemon=True).start()
+        if self.logger:
+            self.logger.debug(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+        return True
@@ -0,0 +1,14 @@
+# qt_clock.py
+
+"""Version 1.1"""
+
+from PySide6.QtCore import QTimer
+
+from core.clock import RealClock
+
+
+class QtClock(RealClock):
+    """The real clock with timers on the Qt event loop, so callbacks run on the GUI thread"""
+
+    def call_later(self, seconds, callback):
+        QTimer.singleShot(int(seconds * 1000), callback)
@@ -0,0 +1,108 @@
+# scheduler_manager.py
+
+"""Version 1.1"""
+
+import time
+from datetime import datetime
+
+from PySide6.QtCore import QTimer
+
+from core.folder_selection import select_folders
+from core.run_queue import DUPLICATE, MERGED, QUEUED, SCHEDULE, START
+from core.schedule import RunScheduler, ScheduleRule
+
+
+class SchedulerManager:
+    """Starts scheduled runs in the tray-resident app.
+
+    Rules are kept in a min-heap and a single QTimer is armed for the earliest one, so
+    nothing polls while idle. The timer never waits longer than MAX_TIMER_INTERVAL_MS so
+    that a wall clock jump after sleep or resume is noticed; occurrences missed in the
+    meantime are coalesced into one run (or skipped for rules with "catch_up": false).
+    """
+
+    MAX_TIMER_INTERVAL_MS = 15 * 60 * 1000
+    MISSED_GRACE_SECONDS = 60
+
+    def __init__(self, parent, folder_opening_manager, logger=None):
+        self.folder_opening_manager = folder_opening_manager
+        self.logger = logger
+        self.scheduler = RunScheduler(self.MISSED_GRACE_SECONDS)
+        self.profiles = {}
+
+        self.timer = QTimer(parent)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._on_timeout)
+
+    def log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def set_config(self, schedules, profiles, enabled=True):
+        """Load schedule entries and profiles from the config and arm the timer"""
+        self.profiles = profiles
+        rules = []
+        if enabled:
+            for entry in schedules:
+                try:
+                    rules.append(ScheduleRule.from_config(entry))
+                except (ValueError, TypeError, AttributeError) as e:
+                    if self.logger:
+                        self.logger.warning(f"Ignoring invalid schedule {entry!r}: {e}")
+
+        self.scheduler.set_rules(rules, time.time())
+        if rules:
+            self.log(f"Scheduler loaded {len(rules)} rule(s).")
+        self._arm()
+
+    def stop(self):
+        self.timer.stop()
+        self.scheduler.set_rules([], time.time())
+
+    def _arm(self):
+        """Arm the single timer for the earliest due rule"""
+        self.timer.stop()
+        next_due = self.scheduler.next_due()
+        if next_due is not None:
+            delay_ms = max(0, int((next_due - time.time()) * 1000))
+            self.timer.start(min(delay_ms, self.MAX_TIMER_INTERVAL_MS))
+
+    def _on_timeout(self):
+        for trigger in self.scheduler.pop_due(time.time()):
+            self._run_trigger(trigger)
+        self._arm()
+
+    def _run_trigger(self, trigger):
+        rule = trigger.rule
+        if trigger.missed:
+            self.log(f"Schedule '{rule.name}': {trigger.missed} missed or overlapping trigger(s) coalesced.")
+
+        folders = self.get_profile_folders(rule.profile)
+        if not folders:
+            self.log(f"Schedule '{rule.name}' skipped: profile '{rule.profile}' has no folders.")
+            return
+
+        # A run in progress queues the trigger, or folds it into a queued run of the same profile
+        outcome, request = self.folder_opening_manager.request_run(folders, profile=rule.profile, source=SCHEDULE)
+        if outcome == START:
+            self.log(f"Schedule '{rule.name}' started a run of profile '{rule.profile}'.")
+        elif outcome == QUEUED:
+            self.log(f"Schedule '{rule.name}' queued run {request.id} of profile '{rule.profile}'.")
+        elif outcome in (MERGED, DUPLICATE):
+            self.log(f"Schedule '{rule.name}' joined run {request.id} of profile '{rule.profile}'.")
+        else:
+            self.log(f"Schedule '{rule.name}' skipped: the run could not be started or queued.")
+
+    def get_profile_folders(self, profile):
+        """Folders of a profile: 'default' is the full list, other profiles select with only/limit"""
+        folders = self.folder_opening_manager.folders
+        if profile == "default":
+            return folders
+        selection = self.profiles.get(profile)
+        if not isinstance(selection, dict):
+            return []
+        return select_folders(folders, selection.get("only"), selection.get("limit"))
+
+    def upcoming(self, count=5):
+        """Return (datetime, rule) pairs of the next scheduled runs"""
+        return [(datetime.fromtimestamp(due), rule) for due, rule in self.scheduler.upcoming(count)]
@@ -0,0 +1,107 @@
+# session_manager.py
+
+"""Version 1.1"""
+
+from PySide6.QtCore import QObject, Signal
+
+from app_config import HISTORY_PATH
+from core.backends import get_backend_class
+from core.run_events import RunEvent
+
+
+class SessionManager(QObject):
+    """Runs folder lists as concurrent sessions on an asyncio loop thread.
+
+    Sessions are started from the GUI thread; their log lines and results come
+    back through event_signal, which Qt delivers on the GUI thread. Sessions on
+    a keystroke backend take turns (SessionPool's input slots); they do not
+    start while the main run types, and main runs requested while they type
+    wait in the run queue. Sessions share the main run's timing settings, so
+    the live timing sliders apply to them too. The loop thread starts with the
+    first session.
+    """
+
+    # (session name, RunEvent)
+    event_signal = Signal(str, object)
+
+    def __init__(self, parent, folder_opening_manager, logger=None, input_sessions=1):
+        super().__init__(parent)
+        self.folder_opening_manager = folder_opening_manager
+        self.logger = logger
+        self.input_sessions = input_sessions
+        self.loop_thread = None
+        self.pool = None
+        # Sessions started and not yet finished, as seen from the GUI thread
+        self.running = {}
+        self.listeners = []
+        self.event_signal.connect(self._on_event)
+
+    def log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def add_listener(self, listener):
+        """Register a callback that receives (session name, RunEvent) for log lines and results"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def drives_input(self):
+        """Whether a running session types into the focused window"""
+        return any(not get_backend_class(backend).concurrent_windows for backend in self.running.values())
+
+    def start_session(self, name, folders, backend=None):
+        """Start opening folders as a session named `name`. Returns False if it was not started."""
+        manager = self.folder_opening_manager
+        if name in self.running:
+            self.log(f"Session '{name}' is already running.")
+            return False
+        try:
+            backend_class = get_backend_class(backend)
+        except ValueError as e:
+            self.log(f"Session '{name}' not started: {e}")
+            return False
+        if not backend_class.concurrent_windows and manager.is_running():
+            self.log(f"Session '{name}' not started: the main run is typing.")
+            return False
+
+        if self.loop_thread is None:
+            # asyncio is only loaded once a session runs
+            from core.async_engine import EventLoopThread, SessionPool
+            self.loop_thread = EventLoopThread("SessionLoop")
+            self.pool = SessionPool(self.input_sessions)
+
+        def on_event(event):
+            # Only log lines and results cross to the GUI thread
+            if event.kind in (RunEvent.LOG, RunEvent.FINISHED):
+                self.event_signal.emit(name, event)
+
+        self.running[name] = backend
+        self.loop_thread.call(lambda: self.pool.start(
+            name, folders, backend=backend, on_event=on_event, sleep_timers=manager.timing,
+            windows=manager.windows, max_tabs=manager.max_tabs, prefetch_depth=manager.prefetch_depth,
+            scan_limit=manager.scan_limit, history_path=HISTORY_PATH, input_pause=manager.input_pause,
+            failsafe=manager.failsafe))
+        self.log(f"Session '{name}' started with {len(folders)} folders.")
+        return True
+
+    def cancel_session(self, name=None):
+        """Cancel one session, or all of them"""
+        if self.loop_thread and self.running:
+            self.loop_thread.call(self.pool.cancel, name)
+
+    def shutdown(self):
+        """Cancel the sessions and stop the loop thread (call before the application quits)"""
+        if self.loop_thread:
+            self.loop_thread.stop()
+            self.loop_thread = None
+            self.running.clear()
+
+    def _on_event(self, name, event):
+        if event.kind == RunEvent.LOG:
+            self.log(f"[{name}] {event['message']}")
+        elif event.kind == RunEvent.FINISHED:
+            self.running.pop(name, None)
+            # A queued main run may have waited for this session to stop typing
+            self.folder_opening_manager.start_next_run()
+        for listener in list(self.listeners):
+            listener(name, event)
@@ -0,0 +1,125 @@
+# single_instance_manager.py
+
+"""Version 1.1"""
+
+import json
+
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from managers.control_client import get_server_address
+
+
+class SingleInstanceManager:
+    """Keeps a single launcher instance per user.
+
+    The first instance listens on a local socket (a named pipe on Windows, a Unix
+    domain socket elsewhere). Later invocations forward their command line
+    arguments to it as one JSON line and exit instead of starting a second app.
+    The same socket carries the control API (see ControlServer), so every
+    message is a JSON object whose "command" selects a registered handler.
+    """
+
+    CONNECT_TIMEOUT_MS = 100
+    WRITE_TIMEOUT_MS = 500
+
+    def __init__(self, server_name=None):
+        self.server_name = server_name or get_server_address()
+        self.server = None
+        self.handlers = {}
+        self.disconnect_handlers = []
+        self._buffers = {}
+
+    @staticmethod
+    def forward_arguments(argv, server_name=None):
+        """Send argv to a running instance. Returns True if one received it."""
+        return SingleInstanceManager.send_message({"command": "activate", "argv": list(argv)}, server_name)
+
+    @staticmethod
+    def send_message(message, server_name=None):
+        """Send one JSON message to a running instance. Returns True if it was delivered."""
+        socket = QLocalSocket()
+        socket.connectToServer(server_name or get_server_address())
+        if not socket.waitForConnected(SingleInstanceManager.CONNECT_TIMEOUT_MS):
+            return False
+
+        socket.write((json.dumps(message) + "\n").encode("utf-8"))
+        delivered = socket.waitForBytesWritten(SingleInstanceManager.WRITE_TIMEOUT_MS)
+        socket.disconnectFromServer()
+        return delivered
+
+    def add_handler(self, command, handler):
+        """Register handler(socket, message) for messages with the given command"""
+        self.handlers[command] = handler
+
+    def add_disconnect_handler(self, handler):
+        """Register handler(socket) called when a client disconnects"""
+        self.disconnect_handlers.append(handler)
+
+    @staticmethod
+    def send(socket, message):
+        """Write one JSON message to a connected client"""
+        if socket.state() == QLocalSocket.ConnectedState:
+            socket.write((json.dumps(message) + "\n").encode("utf-8"))
+            socket.flush()
+
+    def start_server(self, parent=None):
+        """Start listening for other instances. Returns False if another instance owns the name."""
+        self.server = QLocalServer(parent)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.server.listen(self.server_name):
+            if self.server.serverError() != QLocalSocket.AddressInUseError:
+                return False
+
+            # Either another instance started at the same time or a crashed one left its socket behind
+            probe = QLocalSocket()
+            probe.connectToServer(self.server_name)
+            if probe.waitForConnected(self.CONNECT_TIMEOUT_MS):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(self.server_name)
+            if not self.server.listen(self.server_name):
+                return False
+
+        self.server.newConnection.connect(self._on_new_connection)
+        return True
+
+    def stop_server(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+
+    def _on_new_connection(self):
+        while self.server and self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+
+    def _on_ready_read(self, socket):
+        """Split the incoming data into lines and dispatch each JSON message"""
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        *lines, remainder = data.split(b"\n")
+        self._buffers[socket] = remainder
+        for line in lines:
+            if line.strip():
+                self._dispatch(socket, line)
+
+    def _dispatch(self, socket, line):
+        try:
+            message = json.loads(line.decode("utf-8"))
+            command = message.get("command")
+        except (ValueError, AttributeError):
+            self.send(socket, {"reply": None, "ok": False, "error": "Malformed message"})
+            return
+
+        handler = self.handlers.get(command)
+        if handler:
+            handler(socket, message)
+        else:
+            self.send(socket, {"reply": command, "ok": False, "error": f"Unknown command: {command}"})
+
+    def _on_disconnected(self, socket):
+        self._buffers.pop(socket, None)
+        for handler in self.disconnect_handlers:
+            handler(socket)
+        socket.deleteLater()
@@ -0,0 +1,108 @@
+# stall_watchdog.py
+
+"""Version 1.1"""
+
+import collections
+import sys
+import threading
+import time
+import traceback
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class StallWatchdog(QObject):
+    """Detects freezes of the GUI event loop and records where the GUI thread was stuck.
+
+    A heartbeat timer on the GUI thread stamps the time of every beat. A monitor
+    thread checks the stamp; once the loop is late by more than the threshold it
+    captures the GUI thread's stack while the stall is still going on. The next
+    beat measures the full stall and records it. stop() and start() pause and
+    resume the checks; the stall counters are kept.
+    """
+
+    stall_detected = Signal(float, str)  # duration in ms, GUI thread stack
+
+    HEARTBEAT_MS = 50
+    DEFAULT_THRESHOLD_MS = 250
+    MAX_RECORDED_STALLS = 50
+
+    def __init__(self, parent=None, logger=None, threshold_ms=DEFAULT_THRESHOLD_MS):
+        super().__init__(parent)
+        self.logger = logger
+        self.threshold = threshold_ms / 1000
+        self.gui_thread_id = threading.get_ident()
+
+        self.last_beat = time.monotonic()
+        # (beat the stall started after, stack); written by the monitor thread, consumed by the heartbeat
+        self.captured = None
+
+        self.stalls = collections.deque(maxlen=self.MAX_RECORDED_STALLS)
+        self.stall_count = 0
+        self.total_stall_ms = 0.0
+        self.max_stall_ms = 0.0
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(self.HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._on_heartbeat)
+        self._stop_event = threading.Event()
+        self._monitor = None
+
+    def start(self):
+        if self._monitor is not None:
+            return
+        self.last_beat = time.monotonic()
+        self.heartbeat.start()
+        self._stop_event.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="StallWatchdog", daemon=True)
+        self._monitor.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        if self._monitor is not None:
+            self._stop_event.set()
+            self._monitor.join()
+            self._monitor = None
+
+    def _monitor_loop(self):
+        poll_interval = self.HEARTBEAT_MS / 2000
+        while not self._stop_event.wait(poll_interval):
+            beat = self.last_beat
+            if time.monotonic() - beat <= self.threshold + self.HEARTBEAT_MS / 1000:
+                continue
+            if self.captured is not None and self.captured[0] == beat:
+                continue  # Already captured for this stall
+            frame = sys._current_frames().get(self.gui_thread_id)
+            if frame is not None:
+                self.captured = (beat, "".join(traceback.format_stack(frame)))
+
+    def _on_heartbeat(self):
+        now = time.monotonic()
+        previous_beat, self.last_beat = self.last_beat, now
+        lag = now - previous_beat - self.HEARTBEAT_MS / 1000
+
+        captured, self.captured = self.captured, None
+        if lag <= self.threshold:
+            return
+        stack = captured[1] if captured and captured[0] == previous_beat else "(stack not captured)\n"
+        self._record(lag * 1000, stack)
+
+    def _record(self, duration_ms, stack):
+        self.stall_count += 1
+        self.total_stall_ms += duration_ms
+        self.max_stall_ms = max(self.max_stall_ms, duration_ms)
+        self.stalls.append({"time": time.time(), "duration_ms": round(duration_ms, 1), "stack": stack})
+
+        if self.logger:
+            self.logger.warning(f"GUI was unresponsive for {duration_ms:.0f} ms (stack in folder_opener.log)")
+            self.logger.write_to_file(f"GUI thread stack during {duration_ms:.0f} ms stall:\n{stack.rstrip()}")
+        self.stall_detected.emit(duration_ms, stack)
+
+    def get_stats(self):
+        """Counters of the stalls seen since start"""
+        return {
+            "stall_count": self.stall_count,
+            "total_stall_ms": round(self.total_stall_ms, 1),
+            "max_stall_ms": round(self.max_stall_ms, 1),
+            "threshold_ms": self.threshold * 1000,
+        }
@@ -4,8 +4,6 @@
 
 import os
 import sys
-import pythoncom
-import win32com.client
 from PySide6.QtWidgets import QMessageBox
 
 
@@ -52,6 +50,7 @@ class StartupManager:
             shortcut_path = os.path.join(startup_folder, "Folder Opener.lnk")
 
             # Create the shortcut exactly like desktop shortcut
+            import win32com.client
             shell = win32com.client.Dispatch("WScript.Shell")
             shortcut = shell.CreateShortCut(shortcut_path)
             shortcut.Targetpath = app_path
@@ -4,10 +4,14 @@
 
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu, QApplication, QInputDialog
 from PySide6.QtGui import QIcon, QAction
+from core.eta import format_duration
+from core.run_events import RunEvent
 import os
 
 
 class SystemTrayManager:
+    TOOLTIP = "Multi Folder Opener"
+
     def __init__(self, main_app, launcher, configurator):
         self.main_app = main_app
         self.launcher = launcher
@@ -29,6 +33,12 @@ class SystemTrayManager:
         execute_folders_action = self.tray_menu.addAction("Execute Folder Opening")
         execute_folders_action.triggered.connect(self.execute_folder_opening)
 
+        # Lazy folders a run left for on-demand opening
+        self.deferred_action = self.tray_menu.addAction("Open Deferred Folders")
+        self.deferred_action.triggered.connect(self.open_deferred_folders)
+        self.deferred_action.setEnabled(False)
+        self.tray_menu.aboutToShow.connect(self.update_deferred_action)
+
         self.tray_menu.addSeparator()
 
         # Main options
@@ -62,6 +72,27 @@ class SystemTrayManager:
         configure_delay_action = launch_options_menu.addAction("Configure Delay...")
         configure_delay_action.triggered.connect(self.configure_delay)
 
+        # Run history
+        history_action = self.tray_menu.addAction("Run History...")
+        history_action.triggered.connect(self.show_history)
+        export_trace_action = self.tray_menu.addAction("Export Run Trace...")
+        export_trace_action.triggered.connect(self.main_app.export_run_trace)
+
+        # Upcoming scheduled runs, filled in when the submenu opens
+        self.upcoming_menu = QMenu("Upcoming Runs")
+        self.upcoming_menu.aboutToShow.connect(self.update_upcoming_menu)
+        self.tray_menu.addMenu(self.upcoming_menu)
+
+        # Runs waiting for the current one; choosing a run removes it
+        self.queue_menu = QMenu("Queued Runs")
+        self.queue_menu.aboutToShow.connect(self.update_queue_menu)
+        self.tray_menu.addMenu(self.queue_menu)
+
+        # Profiles run as concurrent sessions next to the main run
+        self.profile_menu = QMenu("Run Profile")
+        self.profile_menu.aboutToShow.connect(self.update_profile_menu)
+        self.tray_menu.addMenu(self.profile_menu)
+
         # Exit option
         self.tray_menu.addSeparator()
         exit_action = self.tray_menu.addAction("Exit")
@@ -69,6 +100,82 @@ class SystemTrayManager:
 
         self.tray_icon.setContextMenu(self.tray_menu)
         self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        self.tray_icon.setToolTip(self.TOOLTIP)
+        self.main_app.folder_opening_manager.add_listener(self.on_run_event)
+
+    def on_run_event(self, event):
+        """Show the progress and estimated time left of a run in the tooltip"""
+        if event.kind == RunEvent.PROGRESS:
+            position = min(event["index"] + 1, event["total"])
+            tooltip = f"{self.TOOLTIP} - opening {position}/{event['total']}"
+            if event.get("eta_seconds") is not None:
+                tooltip += f", about {format_duration(event['eta_seconds'])} left"
+            self.tray_icon.setToolTip(tooltip)
+        elif event.kind == RunEvent.FINISHED:
+            self.tray_icon.setToolTip(self.TOOLTIP)
+
+    def update_deferred_action(self):
+        """Show how many lazy folders wait for on-demand opening"""
+        count = len(self.main_app.folder_opening_manager.deferred_folders)
+        self.deferred_action.setText(f"Open Deferred Folders ({count})" if count else "Open Deferred Folders")
+        self.deferred_action.setEnabled(bool(count))
+
+    def update_upcoming_menu(self):
+        """List the next scheduled runs"""
+        self.upcoming_menu.clear()
+        scheduler = getattr(self.main_app, 'scheduler_manager', None)
+        upcoming = scheduler.upcoming() if scheduler else []
+        if not upcoming:
+            self.upcoming_menu.addAction("No scheduled runs").setEnabled(False)
+            return
+
+        for due, rule in upcoming:
+            action = self.upcoming_menu.addAction(f"{due:%a %H:%M} - {rule.name} ({rule.profile})")
+            action.setEnabled(False)
+
+    def update_queue_menu(self):
+        """List the queued runs in run order"""
+        self.queue_menu.clear()
+        manager = self.main_app.folder_opening_manager
+        pending = manager.queue.pending()
+        if not pending:
+            self.queue_menu.addAction("No queued runs").setEnabled(False)
+            return
+
+        for request in pending:
+            action = self.queue_menu.addAction(f"Remove run {request.id}: {request.describe()}")
+            action.triggered.connect(lambda checked=False, run_id=request.id: manager.remove_queued_run(run_id))
+        self.queue_menu.addSeparator()
+        self.queue_menu.addAction("Clear Queue").triggered.connect(lambda checked=False: manager.clear_queue())
+
+    def update_profile_menu(self):
+        """List the profiles; a running profile session is cancelled from its entry"""
+        self.profile_menu.clear()
+        scheduler = getattr(self.main_app, 'scheduler_manager', None)
+        sessions = getattr(self.main_app, 'session_manager', None)
+        if not scheduler or not sessions:
+            self.profile_menu.addAction("Not available").setEnabled(False)
+            return
+
+        for profile in ["default"] + sorted(scheduler.profiles):
+            if profile in sessions.running:
+                action = self.profile_menu.addAction(f"Cancel {profile}")
+                action.triggered.connect(lambda checked=False, name=profile: sessions.cancel_session(name))
+            else:
+                action = self.profile_menu.addAction(profile)
+                action.triggered.connect(lambda checked=False, name=profile: self.run_profile(name))
+        if len(sessions.running) > 1:
+            self.profile_menu.addSeparator()
+            self.profile_menu.addAction("Cancel All Sessions").triggered.connect(
+                lambda checked=False: sessions.cancel_session())
+
+    def run_profile(self, profile):
+        """Open the folders of a profile as a session"""
+        folders = self.main_app.scheduler_manager.get_profile_folders(profile)
+        if not folders:
+            self.main_app.log_manager.warning(f"Profile '{profile}' has no folders to open.")
+            return
+        self.main_app.session_manager.start_session(profile, folders)
 
     def execute_folder_opening(self):
         """Execute folder opening directly from the system tray"""
@@ -78,6 +185,11 @@ class SystemTrayManager:
         self.show_launcher()
         self.main_app.execute_folder_opening()
 
+    def open_deferred_folders(self):
+        """Open the lazy folders left by the last run"""
+        self.main_app.log_manager.info("Opening deferred folders from system tray")
+        self.main_app.folder_opening_manager.open_deferred_folders()
+
     def update_menu_state(self):
         """Update menu checkboxes to reflect current config"""
         self.auto_close_action.setChecked(self.main_app.auto_close)
@@ -168,16 +280,23 @@ class SystemTrayManager:
     def show_launcher(self):
         self.launcher.show()
         self.launcher.activateWindow()
+        self.main_app.hidden_in_tray = False
+        self.main_app.update_stall_watchdog()
 
     def open_configurator(self):
         self.configurator.open_configurator()
 
+    def show_history(self):
+        self.main_app.show_history_dialog()
+
     def exit_application(self):
         QApplication.quit()
 
     def minimize_to_tray(self):
         self.launcher.hide()
         self.show_tray_icon()
+        self.main_app.hidden_in_tray = True
+        self.main_app.update_stall_watchdog()
 
     def update_menu_state(self):
         self.auto_close_action.setChecked(self.main_app.auto_close)
@@ -0,0 +1,14 @@
+# conftest.py
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The application object shared by the tests that need Qt (a QApplication, so widgets work too)"""
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
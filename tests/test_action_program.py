@@ -0,0 +1,93 @@
+# test_action_program.py
+
+import pytest
+
+from core.action_program import action_timers, compile_run
+
+TIMERS = {"explorer_startup": 1.0, "new_tab": 0.1, "address_bar_focus": 0.2, "after_typing": 0.3,
+          "after_enter": 0.4}
+FOLDERS = [f"C:\\Projects\\{i}" for i in range(6)]
+
+
+def folder_ops(program, index):
+    return [action.op for action in program.actions if action.index == index and action.op != "focus_window"]
+
+
+def test_single_window_opens_the_folders_in_order():
+    program = compile_run(FOLDERS[:3], TIMERS)
+    assert [action.op for action in program.actions] == [
+        "launch",
+        "focus_address_bar", "type_path", "press_enter",
+        "new_tab", "focus_address_bar", "type_path", "press_enter",
+        "new_tab", "focus_address_bar", "type_path", "press_enter",
+    ]
+    assert program.folder_order() == FOLDERS[:3]
+    assert not program.addressed
+    # Launch, the first folder without a new tab, then two folders with one
+    assert program.duration == pytest.approx(1.0 + 0.9 + 2 * 1.0)
+    starts = [action.at for action in program.actions]
+    assert starts == sorted(starts)
+
+
+def test_step_overhead_is_added_to_the_predicted_duration():
+    plain = compile_run(FOLDERS[:3], TIMERS)
+    slow = compile_run(FOLDERS[:3], TIMERS, step_overhead={"type_path": 0.5})
+    assert slow.duration == pytest.approx(plain.duration + 3 * 0.5)
+
+
+def test_window_focus_defaults_to_the_address_bar_focus():
+    assert action_timers(TIMERS)["window_focus"] == 0.2
+    assert action_timers({**TIMERS, "window_focus": 0.05})["window_focus"] == 0.05
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_every_folder_is_opened_once_in_several_windows(concurrent):
+    program = compile_run(FOLDERS, TIMERS, windows=3, concurrent=concurrent)
+    assert program.windows == 3
+    assert program.addressed == concurrent
+    assert sorted(program.folder_order()) == sorted(FOLDERS)
+    for index in range(len(FOLDERS)):
+        assert folder_ops(program, index)[-3:] == ["focus_address_bar", "type_path", "press_enter"]
+        assert sum(action.begins_folder for action in program.actions if action.index == index) == 1
+        assert sum(action.ends_folder for action in program.actions if action.index == index) == 1
+
+
+def test_keystroke_backend_switches_focus_before_serving_another_window():
+    program = compile_run(FOLDERS, TIMERS, windows=2)
+    focused = None
+    for action in program.actions:
+        if action.op in ("open_window", "focus_window"):
+            focused = action.window
+        elif action.window is not None:
+            assert action.window == focused
+
+
+def test_concurrent_windows_overlap_their_waits():
+    sequential = compile_run(FOLDERS, TIMERS, concurrent=True)
+    parallel = compile_run(FOLDERS, TIMERS, windows=3, concurrent=True)
+    assert parallel.duration < sequential.duration / 2
+    assert not [action for action in parallel.actions if action.op == "focus_window"]
+
+
+def test_max_tabs_opens_more_windows():
+    program = compile_run(FOLDERS, TIMERS, windows=1, max_tabs=2)
+    assert program.windows == 3
+    assert len([action for action in program.actions if action.op == "open_window"]) == 3
+
+
+def test_the_first_lane_is_served_before_the_lower_ones():
+    plain = compile_run(FOLDERS, TIMERS, windows=2, step_overhead={"type_path": 0.05})
+    assert plain.folder_order()[:2] == [FOLDERS[0], FOLDERS[3]]
+
+    # The first window holds the first lane: the second one may only fill its waits
+    program = compile_run(FOLDERS, TIMERS, windows=2, step_overhead={"type_path": 0.05},
+                          lanes=[("urgent", 3), ("normal", 3)])
+    ended = [action.folder for action in program.actions if action.ends_folder]
+    assert ended == FOLDERS
+
+
+def test_an_empty_folder_list_compiles_to_nothing():
+    program = compile_run([], TIMERS)
+    assert len(program) == 0
+    assert program.total == 0
+    assert program.duration == 0.0
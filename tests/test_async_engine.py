@@ -0,0 +1,53 @@
+# test_async_engine.py
+
+import asyncio
+import time
+
+from core.api import open_folders_async
+from core.backends import ParallelSimulatedBackend
+
+TIMERS = {"explorer_startup": 0.05, "new_tab": 0.01, "address_bar_focus": 0.01, "after_typing": 0.01,
+          "after_enter": 0.01}
+
+
+class SlowTypingBackend(ParallelSimulatedBackend):
+    """Types each path in a blocking call, like keystrokes with an input pause"""
+
+    def type_path(self, path, window=None):
+        time.sleep(0.2)
+        super().type_path(path, window)
+
+
+def test_blocking_backend_calls_do_not_stall_the_event_loop():
+    async def main():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        result = await open_folders_async(["C:\\a", "C:\\b"], SlowTypingBackend(), sleep_timers=TIMERS)
+        tick_task.cancel()
+        return result, max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+
+    result, longest_gap = asyncio.run(main())
+    assert result
+    assert longest_gap < 0.15
+
+
+def test_cancelling_during_a_backend_call_reports_a_cancelled_run():
+    events = []
+
+    async def main():
+        task = asyncio.create_task(open_folders_async(["C:\\a"], SlowTypingBackend(), events.append,
+                                                      sleep_timers=TIMERS))
+        await asyncio.sleep(0.15)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    finished = [event for event in events if event.kind == "finished"]
+    assert len(finished) == 1 and finished[0].get("cancelled")
+    assert not [event for event in events if event.kind == "step" and event["outcome"] == "error"]
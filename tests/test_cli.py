@@ -0,0 +1,121 @@
+# test_cli.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from managers.command_line_handler import CommandLineHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "folders_config.json"
+    path.write_text(json.dumps({"folders": ["C:\\Projects\\app"], "auto_close": False}))
+    return path
+
+
+def launcher(config_path, *args):
+    """Run the launcher's command line against config_path and return the completed process"""
+    env = {**os.environ, "FOLDER_OPENER_CONFIG": str(config_path),
+           "FOLDER_OPENER_HISTORY": str(config_path.with_name("history.sqlite3"))}
+    return subprocess.run([sys.executable, os.path.join(ROOT, "main_launcher.py"), *args],
+                          capture_output=True, text=True, env=env, cwd=str(config_path.parent), timeout=60)
+
+
+def test_subcommand_options_are_parsed():
+    handler = CommandLineHandler(["--json", "open", "--only", "*app", "--only", "*lib", "--limit", "3",
+                                  "--backend", "simulated", "--dry-run", "--windows", "2", "--prefetch", "0"])
+    assert handler.exit_code is None
+    assert handler.get_command() == "open"
+    assert handler.is_run_mode()
+    assert handler.is_json_output()
+    assert handler.get_option("only") == ["*app", "*lib"]
+    assert handler.get_option("limit") == 3
+    assert handler.get_option("backend") == "simulated"
+    assert handler.get_option("dry_run")
+    assert handler.get_option("windows") == 2
+    assert handler.get_option("prefetch") == 0
+    assert handler.get_option("max_tabs", 0) == 0
+
+
+def test_json_is_accepted_after_the_subcommand():
+    handler = CommandLineHandler(["history", "--json", "--by", "folder"])
+    assert handler.is_json_output()
+    assert handler.get_option("by") == "folder"
+    assert handler.get_option("last") == 20
+
+
+def test_run_is_a_shortcut_for_open():
+    handler = CommandLineHandler(["--run"])
+    assert handler.get_command() == "open"
+    assert CommandLineHandler([]).get_command() is None
+
+
+@pytest.mark.parametrize("args", [
+    ["open", "--limit", "0"],
+    ["open", "--prefetch", "-1"],
+    ["open", "--backend", "nope"],
+    ["history", "--by", "week"],
+    ["--profile", "nope"],
+    ["no_such_command"],
+    ["config", "set", "auto_close"],
+])
+def test_bad_arguments_set_the_usage_exit_code(args, capsys):
+    handler = CommandLineHandler(args)
+    assert handler.exit_code == 2
+    assert handler.get_command() is None
+    assert "usage:" in capsys.readouterr().err
+
+
+def test_help_and_version_exit_with_success(config_path):
+    result = launcher(config_path, "--help")
+    assert result.returncode == 0
+    assert "usage: folder_opener" in result.stdout
+    result = launcher(config_path, "--version")
+    assert result.returncode == 0
+    assert result.stdout.startswith("Multi Folder Opener v")
+
+
+def test_subcommand_help_exits_with_success(config_path):
+    result = launcher(config_path, "open", "--help")
+    assert result.returncode == 0
+    assert "--dry-run" in result.stdout
+
+
+def test_bad_arguments_exit_with_the_usage_code(config_path):
+    result = launcher(config_path, "open", "--limit", "0")
+    assert result.returncode == 2
+    assert "must be a positive integer" in result.stderr
+
+
+def test_config_set_changes_the_value(config_path):
+    result = launcher(config_path, "config", "set", "auto_close", "true")
+    assert result.returncode == 0
+    assert json.loads(config_path.read_text())["auto_close"] is True
+
+
+def test_config_set_rejects_folders_that_are_not_strings(config_path):
+    result = launcher(config_path, "config", "set", "folders", "[1, 2]")
+    assert result.returncode == 1
+    assert "list of folder paths" in result.stdout
+    assert json.loads(config_path.read_text())["folders"] == ["C:\\Projects\\app"]
+
+
+def test_config_set_rejects_a_value_of_the_wrong_type(config_path):
+    assert launcher(config_path, "config", "set", "auto_close", "[1]").returncode == 1
+
+
+def test_config_set_rejects_an_unknown_setting(config_path):
+    result = launcher(config_path, "--json", "config", "set", "no_such_setting", "1")
+    assert result.returncode == 1
+    assert json.loads(result.stdout.splitlines()[-1])["event"] == "error"
+
+
+def test_config_set_reports_an_unreadable_config(config_path):
+    config_path.write_text("{not json")
+    assert launcher(config_path, "config", "set", "auto_close", "true").returncode == 2
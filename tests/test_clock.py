@@ -0,0 +1,85 @@
+# test_clock.py
+
+import threading
+import time
+
+import pytest
+
+from core.action_program import compile_run
+from core.backends import get_backend
+from core.clock import RealClock, VirtualClock
+from core.opening_engine import FolderOpeningEngine
+from core.run_events import RunEvent
+
+TIMERS = {"explorer_startup": 1.5, "new_tab": 0.5, "address_bar_focus": 0.5, "after_typing": 0.5,
+          "after_enter": 0.5}
+FOLDERS = ["/tmp/a", "/tmp/b", "/tmp/c"]
+
+
+def test_virtual_sleeps_only_advance_the_time():
+    clock = VirtualClock(start=10.0)
+    start = time.perf_counter()
+    clock.sleep(3600)
+    assert time.perf_counter() - start < 1
+    assert clock.now() == 3610.0
+    assert clock.slept == 3600
+
+
+def test_callbacks_run_in_due_order_as_the_time_passes():
+    clock = VirtualClock()
+    calls = []
+    clock.call_later(2.0, lambda: calls.append(("late", clock.now())))
+    clock.call_later(1.0, lambda: calls.append(("early", clock.now())))
+    clock.call_later(1.0, lambda: calls.append(("early, second", clock.now())))
+    clock.advance(1.5)
+    assert calls == [("early", 1.0), ("early, second", 1.0)]
+    assert clock.now() == 1.5
+    clock.advance(1.0)
+    assert calls[-1] == ("late", 2.0)
+    assert clock.now() == 2.5
+
+
+def test_a_wait_ends_when_a_callback_sets_the_event():
+    clock = VirtualClock()
+    event = threading.Event()
+    clock.call_later(0.75, event.set)
+    assert clock.wait(event, 5.0)
+    assert clock.now() == 0.75
+    assert clock.slept == 0.75
+    # An event that is already set returns without passing time
+    assert clock.wait(event, 5.0)
+    assert clock.now() == 0.75
+
+
+def test_a_wait_without_the_event_passes_the_whole_timeout():
+    clock = VirtualClock()
+    assert not clock.wait(threading.Event(), 2.0)
+    assert clock.now() == 2.0
+
+
+def test_the_engine_on_a_virtual_clock_takes_the_compiled_duration():
+    clock = VirtualClock()
+    engine = FolderOpeningEngine(FOLDERS, TIMERS, get_backend("simulated"), clock=clock)
+    assert engine.run()
+    assert clock.slept == pytest.approx(compile_run(FOLDERS, TIMERS).duration)
+
+
+def test_a_scheduled_cancel_stops_the_engine_at_its_virtual_time():
+    clock = VirtualClock()
+    events = []
+    engine = FolderOpeningEngine(FOLDERS, TIMERS, get_backend("simulated"), on_event=events.append, clock=clock)
+    # The first folder is open after 3 s; this falls in the second folder's new tab wait
+    clock.call_later(3.2, engine.cancel)
+    assert not engine.run()
+    assert clock.now() == pytest.approx(3.2)
+    assert [event["index"] for event in events if event.kind == RunEvent.FOLDER] == [0]
+    assert events[-1].kind == RunEvent.FINISHED and events[-1]["cancelled"]
+
+
+def test_real_clock_calls_later_on_a_timer_thread():
+    called = threading.Event()
+    clock = RealClock()
+    start = clock.now()
+    clock.call_later(0.05, called.set)
+    assert clock.wait(called, 5)
+    assert clock.now() - start >= 0.04
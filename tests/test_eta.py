@@ -0,0 +1,61 @@
+# test_eta.py
+
+import pytest
+
+from core.action_program import compile_run
+from core.eta import FOLDER_STEPS, RunEstimator
+from core.run_history import RunHistory
+
+FOLDERS = [f"C:\\Projects\\{i}" for i in range(5)]
+FAST = {"explorer_startup": 0.3, "new_tab": 0.05, "address_bar_focus": 0.05, "after_typing": 0.05,
+        "after_enter": 0.05}
+SLOW = {**FAST, "new_tab": 0.3, "address_bar_focus": 0.3, "after_typing": 0.3, "after_enter": 0.3}
+# Time each recorded folder took beyond its configured delays
+OVERHEAD = 0.2
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    """A history of one run at the FAST timers"""
+    path = str(tmp_path / "history.sqlite3")
+    history = RunHistory(path)
+    run_id = history.begin_run("simulated", FAST, len(FOLDERS))
+    for index, folder in enumerate(FOLDERS):
+        steps = FOLDER_STEPS if index > 0 else FOLDER_STEPS[1:]
+        waits = [FAST[timer] for _, timer in steps]
+        records = [(step, wait + OVERHEAD / len(steps), wait, "ok") for (step, _), wait in zip(steps, waits)]
+        history.record_folder(run_id, index, folder, sum(waits) + OVERHEAD, "ok", records)
+    history.finish_run(run_id, True, "done")
+    history.close()
+    return path
+
+
+def test_folder_history_keeps_its_overhead_when_timers_change(history_path):
+    estimator = RunEstimator.from_history(FOLDERS, SLOW, history_path)
+    assert estimator.predictions[0] == pytest.approx(3 * 0.3 + OVERHEAD)
+    assert estimator.predictions[1:] == pytest.approx([4 * 0.3 + OVERHEAD] * 4)
+
+
+def test_retime_changes_predictions_of_folders_with_history(history_path):
+    estimator = RunEstimator.from_history(FOLDERS, FAST, history_path)
+    assert estimator.predictions[1] == pytest.approx(4 * 0.05 + OVERHEAD)
+    before = estimator.remaining(0.0)
+    estimator.retime(SLOW)
+    assert estimator.predictions[1] == pytest.approx(4 * 0.3 + OVERHEAD)
+    assert estimator.remaining(0.0) > before
+
+
+def test_concurrent_windows_predict_the_compiled_program_duration(history_path):
+    program = compile_run(FOLDERS, SLOW, 3, 0, True)
+    estimator = RunEstimator.from_history(FOLDERS, SLOW, history_path, windows=3, concurrent=True)
+    sequential = RunEstimator.from_history(FOLDERS, SLOW, history_path)
+    assert estimator.predicted_total() < sequential.predicted_total() / 2
+    assert estimator.predicted_total() == pytest.approx(program.duration, rel=0.25)
+    assert estimator.remaining(0.0) == pytest.approx(estimator.predicted_total())
+
+
+def test_windows_without_concurrent_backend_keep_the_sequential_prediction(history_path):
+    estimator = RunEstimator.from_history(FOLDERS, SLOW, history_path, windows=3, concurrent=False)
+    assert estimator.overlap == 1.0
+    assert estimator.predicted_total() == pytest.approx(RunEstimator.from_history(FOLDERS, SLOW, history_path)
+                                                        .predicted_total())
@@ -0,0 +1,88 @@
+# test_lanes.py
+
+import pytest
+
+from PySide6.QtCore import QObject
+
+from core.lanes import LAZY, NORMAL, PINNED, folder_lane, lane_options, lane_plan
+from core.ordering import locality_order
+from core.run_queue import RunRequest
+from core.trace_export import RunTrace
+from managers.folder_opening_manager import FolderOpeningManager
+
+FOLDERS = ["C:\\Work", "D:\\Archive", "C:\\Inbox", "D:\\Old\\Logs", "C:\\Temp"]
+
+
+class Window(QObject):
+    """Stands in for the launcher window"""
+
+    def __init__(self, system_tray):
+        super().__init__()
+        self.system_tray = system_tray
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+def test_a_folder_matching_both_patterns_is_pinned():
+    assert folder_lane("C:\\Inbox", ["*inbox"], ["*inbox"]) == PINNED
+    assert folder_lane("C:\\Temp", ["*inbox"], ["*temp"]) == LAZY
+    assert folder_lane("C:\\Work", ["*inbox"], ["*temp"]) == NORMAL
+
+
+def test_lane_plan_opens_pinned_then_normal_then_lazy_folders():
+    positions, lanes, deferred = lane_plan(FOLDERS, ["*inbox"], ["*archive", "*old*"])
+    assert positions == [2, 0, 4, 1, 3]
+    assert lanes == [(PINNED, 1), (NORMAL, 2), (LAZY, 2)]
+    assert deferred == []
+
+
+def test_deferred_lazy_folders_are_left_out_of_the_run():
+    positions, lanes, deferred = lane_plan(FOLDERS, ["*inbox"], ["*archive", "*old*"], defer_lazy=True)
+    assert positions == [2, 0, 4]
+    assert lanes == [(PINNED, 1), (NORMAL, 2)]
+    assert deferred == [1, 3]
+
+
+def test_lane_plan_orders_each_lane_on_its_own():
+    folders = ["D:\\One", "C:\\Two", "D:\\Three", "C:\\Pinned"]
+    positions, lanes, _ = lane_plan(folders, ["*pinned"], order=locality_order)
+    # The pinned folder stays first although the D: folders come first in the list
+    assert positions == [3, 0, 2, 1]
+    assert lanes == [(PINNED, 1), (NORMAL, 3)]
+
+
+def test_lane_plan_without_patterns_is_one_normal_lane():
+    assert lane_plan(FOLDERS) == ([0, 1, 2, 3, 4], [(NORMAL, 5)], [])
+    assert lane_plan([]) == ([], [], [])
+
+
+@pytest.mark.parametrize("settings, expected", [
+    ({"pinned": ["*inbox"], "lazy": ["*old*", 1], "lazy_mode": "on_demand", "auto_close_after": "pinned"},
+     (["*inbox"], ["*old*"], True, PINNED)),
+    ({"pinned": "*inbox", "lazy_mode": "later", "auto_close_after": "never"}, ([], [], False, NORMAL)),
+    (None, ([], [], False, NORMAL)),
+])
+def test_lane_options_ignore_invalid_values(settings, expected):
+    assert lane_options(settings) == expected
+
+
+@pytest.mark.parametrize("system_tray", [False, True])
+def test_auto_close_waits_for_the_lazy_lane(qapp, system_tray):
+    window = Window(system_tray)
+    manager = FolderOpeningManager(window)
+    manager.set_config(["/tmp/a", "/tmp/b"], {}, True, 0)
+    manager.run_id = 1
+    manager.run_request = RunRequest(["/tmp/a", "/tmp/b"], profile="default")
+    manager.run_folders = ["/tmp/a", "/tmp/b"]
+    manager.run_lanes = [("normal", 1), ("lazy", 1)]
+    manager.trace = RunTrace()
+
+    manager.on_lane_finished("normal")
+    assert manager.auto_close_scheduled
+    manager._auto_close()
+    assert window.closed == 0
+
+    manager.on_folder_opening_finished(1, True, "All folders opened successfully!")
+    assert window.closed == 1
@@ -0,0 +1,82 @@
+# test_metrics.py
+
+import os
+
+from core.metrics import MetricsRegistry, RunMetrics
+from core.run_events import RunEvent
+
+
+def sample_lines(text):
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+def test_counters_render_help_type_and_labelled_samples():
+    registry = MetricsRegistry()
+    plain = registry.counter("demo_total", "A plain counter")
+    labelled = registry.counter("demo_runs_total", "Runs by outcome", ["outcome"])
+    labelled.inc(outcome="success")
+    labelled.inc(2, outcome="failure")
+    assert registry.render() == (
+        "# HELP demo_total A plain counter\n"
+        "# TYPE demo_total counter\n"
+        "demo_total 0\n"
+        "# HELP demo_runs_total Runs by outcome\n"
+        "# TYPE demo_runs_total counter\n"
+        'demo_runs_total{outcome="failure"} 2\n'
+        'demo_runs_total{outcome="success"} 1\n'
+    )
+    assert plain.get() == 0
+    assert labelled.get(outcome="failure") == 2
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Escaping", ["path"])
+    counter.inc(path='C:\\a "b"\nc')
+    assert 'demo_total{path="C:\\\\a \\"b\\"\\nc"} 1' in registry.render()
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Durations", [1.0, 0.5], ["step"])
+    for value in (0.2, 0.5, 0.7, 3.0):
+        histogram.observe(value, step="type_path")
+    assert sample_lines(registry.render()) == [
+        'demo_seconds_bucket{step="type_path",le="0.5"} 2',
+        'demo_seconds_bucket{step="type_path",le="1.0"} 3',
+        'demo_seconds_bucket{step="type_path",le="+Inf"} 4',
+        'demo_seconds_sum{step="type_path"} 4.4',
+        'demo_seconds_count{step="type_path"} 4',
+    ]
+    assert "# TYPE demo_seconds histogram" in registry.render()
+
+
+def test_run_metrics_count_the_events_of_a_run():
+    metrics = RunMetrics()
+    metrics.handle(RunEvent(RunEvent.STARTED, total=2))
+    metrics.handle(RunEvent(RunEvent.STEP, step="type_path", duration=0.6, action_duration=0.1, expected=0.5))
+    metrics.handle(RunEvent(RunEvent.FOLDER, index=0, outcome="ok", duration=1.0))
+    metrics.handle(RunEvent(RunEvent.FOLDER, index=1, outcome="error", duration=1.0))
+    metrics.handle(RunEvent(RunEvent.FINISHED, success=False, error_class="timeout"))
+    metrics.handle(RunEvent(RunEvent.FINISHED, success=False, cancelled=True))
+    metrics.record_stall(1500)
+
+    assert metrics.folders_opened.get() == 1
+    assert metrics.folders_failed.get() == 1
+    assert metrics.runs.get(outcome="failure") == 1
+    assert metrics.runs.get(outcome="cancelled") == 1
+    assert metrics.failures.get(error_class="timeout") == 1
+    text = metrics.render()
+    assert "folder_opener_run_duration_seconds_count 1" in text
+    assert 'folder_opener_step_action_duration_seconds_bucket{step="type_path",le="0.1"} 1' in text
+    assert 'folder_opener_gui_stall_duration_seconds_bucket{le="1.0"} 0' in text
+    assert 'folder_opener_gui_stall_duration_seconds_bucket{le="2.0"} 1' in text
+
+
+def test_textfile_is_replaced_without_leaving_temporary_files(tmp_path):
+    metrics = RunMetrics()
+    path = tmp_path / "folder_opener.prom"
+    path.write_text("stale\n")
+    metrics.write_textfile(str(path))
+    assert path.read_text() == metrics.render()
+    assert os.listdir(tmp_path) == ["folder_opener.prom"]
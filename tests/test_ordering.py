@@ -0,0 +1,72 @@
+# test_ordering.py
+
+import pytest
+
+from core import ordering
+from core.ordering import LOCAL, MAPPED, NETWORK, locality_order, location, ordering_options
+
+
+def ordered(folders, keep_order=()):
+    return [folders[index] for index in locality_order(folders, keep_order)]
+
+
+def test_location_of_local_and_unc_paths():
+    assert location("C:\\Projects\\App") == (LOCAL, "c:", ["c:", "projects", "app"])
+    assert location("\\\\server\\share\\docs") == (NETWORK, "server", ["\\\\server\\share", "docs"])
+
+
+def test_mapped_drives_come_after_local_disks(monkeypatch):
+    monkeypatch.setattr(ordering, "drive_is_remote", lambda drive: drive == "z:")
+    assert location("Z:\\Reports")[0] == MAPPED
+    folders = ["\\\\server\\share\\a", "Z:\\Reports", "C:\\Work"]
+    assert ordered(folders) == ["C:\\Work", "Z:\\Reports", "\\\\server\\share\\a"]
+
+
+def test_folders_of_one_location_are_grouped_in_first_seen_order():
+    folders = [
+        "D:\\Media\\Music",
+        "C:\\Projects\\App",
+        "D:\\Media\\Photos",
+        "\\\\nas\\backup",
+        "C:\\Projects\\Lib",
+        "C:\\Users\\me",
+    ]
+    assert ordered(folders) == [
+        "D:\\Media\\Music",
+        "D:\\Media\\Photos",
+        "C:\\Projects\\App",
+        "C:\\Projects\\Lib",
+        "C:\\Users\\me",
+        "\\\\nas\\backup",
+    ]
+
+
+def test_a_grouped_list_is_left_as_it_is():
+    folders = ["C:\\b", "C:\\b\\sub", "C:\\a", "D:\\x", "\\\\nas\\share"]
+    assert locality_order(folders) == list(range(len(folders)))
+
+
+def test_parents_come_before_subfolders_and_duplicates_keep_their_order():
+    folders = ["C:\\Work\\App\\src", "C:\\Work\\App", "C:\\Work\\App\\src"]
+    assert locality_order(folders) == [1, 0, 2]
+
+
+def test_kept_folders_stay_in_place():
+    folders = ["D:\\One", "C:\\Keep", "D:\\Two", "C:\\Other"]
+    # C:\Keep stays second; the others are grouped around it
+    assert ordered(folders, ["*keep"]) == ["D:\\One", "C:\\Keep", "D:\\Two", "C:\\Other"]
+    assert ordered(folders) == ["D:\\One", "D:\\Two", "C:\\Keep", "C:\\Other"]
+
+
+def test_an_empty_list_has_no_order():
+    assert locality_order([]) == []
+
+
+@pytest.mark.parametrize("settings, expected", [
+    ({"optimize": True, "keep_order": ["*keep", 3]}, (True, ["*keep"])),
+    ({"optimize": "yes", "keep_order": "*keep"}, (False, [])),
+    ({}, (False, [])),
+    (None, (False, [])),
+])
+def test_ordering_options_ignore_invalid_values(settings, expected):
+    assert ordering_options(settings) == expected
@@ -0,0 +1,62 @@
+# test_run_history.py
+
+import sqlite3
+
+import pytest
+
+from core import open_folders
+from core.clock import VirtualClock
+from core.run_history import RunHistory
+
+TIMERS = {"explorer_startup": 1.0, "new_tab": 0.1, "address_bar_focus": 0.2, "after_typing": 0.3,
+          "after_enter": 0.4}
+FOLDERS = [f"C:\\Projects\\{i}" for i in range(6)]
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    """The history of one run of FOLDERS in two windows"""
+    path = str(tmp_path / "history.sqlite3")
+    assert open_folders(FOLDERS, "simulated", sleep_timers=TIMERS, windows=2, clock=VirtualClock(),
+                        history_path=path)
+    return path
+
+
+def folder_steps(path):
+    """{folder index: [step names]} as recorded"""
+    connection = sqlite3.connect(path)
+    try:
+        steps = {}
+        for index, step in connection.execute("SELECT idx, step FROM step_results WHERE idx >= 0 ORDER BY rowid"):
+            steps.setdefault(index, []).append(step)
+        return steps
+    finally:
+        connection.close()
+
+
+def test_steps_are_recorded_with_their_own_folder_in_several_windows(history_path):
+    steps = folder_steps(history_path)
+    assert sorted(steps) == list(range(len(FOLDERS)))
+    for index, names in steps.items():
+        # The first folder of each window needs no new tab; the others may be preceded by a focus switch
+        names = [name for name in names if name != "focus_window"]
+        assert names[-3:] == ["focus_address_bar", "type_path", "press_enter"], index
+        assert names.count("new_tab") <= 1
+
+
+def test_folder_delays_are_summed_from_its_own_steps(history_path):
+    # Switching windows waits as long as focusing the address bar
+    waits = {"focus_window": 0.2, "new_tab": 0.1, "focus_address_bar": 0.2, "type_path": 0.3, "press_enter": 0.4}
+    steps = folder_steps(history_path)
+    connection = sqlite3.connect(history_path)
+    try:
+        rows = connection.execute(
+            "SELECT f.idx, f.duration, SUM(s.expected) FROM folder_results f "
+            "JOIN step_results s ON s.run_id = f.run_id AND s.idx = f.idx WHERE f.idx >= 0 GROUP BY f.rowid"
+        ).fetchall()
+    finally:
+        connection.close()
+    assert len(rows) == len(FOLDERS)
+    for index, duration, expected in rows:
+        assert expected == pytest.approx(sum(waits[name] for name in steps[index])), index
+        assert duration >= expected - 1e-9
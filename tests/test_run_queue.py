@@ -0,0 +1,89 @@
+# test_run_queue.py
+
+import time
+
+import pytest
+
+from core.action_program import DEFAULT_SLEEP_TIMERS
+from core.run_events import RunEvent
+from core.run_queue import QUEUED, REJECTED, SCHEDULE, RunRequest
+from core.trace_export import RunTrace
+from managers import folder_opening_thread
+from managers.folder_opening_manager import FolderOpeningManager
+
+
+@pytest.fixture
+def manager(qapp):
+    manager = FolderOpeningManager()
+    manager.set_config(["/tmp/a", "/tmp/b"], {}, False, 0)
+    # Pretend a run is in progress, so new requests go through the queue
+    manager.run_request = RunRequest(["/tmp/a", "/tmp/b"], profile="default")
+    return manager
+
+
+def test_reject_policy_rejects_requests_during_a_run(manager):
+    manager.set_config(["/tmp/a", "/tmp/b"], {}, False, 0, queue_settings={"policy": "reject"})
+    outcome, request = manager.request_run(["/tmp/c"], source=SCHEDULE)
+    assert outcome == REJECTED
+    assert request.folders == ["/tmp/c"]
+    assert len(manager.queue) == 0
+
+
+def test_full_queue_rejects_requests(manager):
+    manager.set_config(["/tmp/a", "/tmp/b"], {}, False, 0, queue_settings={"max_pending": 1, "merge": False})
+    assert manager.request_run(["/tmp/c"])[0] == QUEUED
+    outcome, _ = manager.request_run(["/tmp/d"])
+    assert outcome == REJECTED
+    assert [request.folders for request in manager.queue.pending()] == [["/tmp/c"]]
+
+
+def test_signals_of_a_cancelled_run_do_not_reach_the_next_run(manager):
+    # Run 1 was cancelled and run 2 started from the queue before run 1's last signals arrived
+    manager.run_id = 2
+    manager.run_folders = ["/tmp/a", "/tmp/b"]
+    manager.trace = RunTrace()
+    manager.auto_close = True
+    manager.run_lanes = [("pinned", 1), ("normal", 1)]
+    messages = []
+    manager.add_listener(lambda event: messages.append(event))
+
+    manager._on_log(1, "Folder opening cancelled.")
+    manager._on_progress(1, 1)
+    manager._on_lane(1, "pinned")
+    manager.on_folder_opening_finished(1, False, "Cancelled")
+
+    assert messages == []
+    assert manager.progress_index == 0
+    assert not manager.auto_close_scheduled
+    assert manager.is_running()
+
+    manager._on_progress(2, 1)
+    assert manager.progress_index == 1
+
+
+def test_cancel_returns_at_once_and_the_queued_run_starts_when_the_worker_stopped(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv("FOLDER_OPENER_BACKEND", "simulated")
+    monkeypatch.setattr(folder_opening_thread, "HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+    manager = FolderOpeningManager()
+    manager.set_config(["/tmp/a", "/tmp/b"], {name: 0.5 for name in DEFAULT_SLEEP_TIMERS}, False, 0)
+    finished = []
+    manager.add_listener(lambda event: finished.append(event) if event.kind == RunEvent.FINISHED else None)
+    try:
+        first = manager.execute_folder_opening()
+        second = manager.execute_folder_opening(["/tmp/c"])
+
+        start = time.perf_counter()
+        assert manager.cancel_folder_opening()
+        assert time.perf_counter() - start < 0.1
+        # The cancelled run counts as running until the worker reports it stopped
+        assert manager.is_running() and manager.run_id == first
+        assert not manager.cancel_folder_opening()
+
+        deadline = time.monotonic() + 10
+        while len(finished) < 2 and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+        assert [(event["run_id"], event.get("cancelled")) for event in finished] == [(first, True), (second, None)]
+        assert finished[1]["success"]
+    finally:
+        manager.shutdown()
@@ -0,0 +1,137 @@
+# test_schedule.py
+
+from datetime import datetime
+
+import pytest
+
+from core.schedule import CronExpression, RunScheduler, ScheduleRule
+
+# A Monday
+MONDAY = datetime(2024, 1, 1, 8, 0)
+
+
+def timestamp(*args):
+    return datetime(*args).timestamp()
+
+
+def test_cron_fields_accept_ranges_steps_lists_and_names():
+    cron = CronExpression("*/15 8-10,14 * jan-mar mon-fri")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == {8, 9, 10, 14}
+    assert cron.months == {1, 2, 3}
+    assert cron.weekdays == {1, 2, 3, 4, 5}
+    assert CronExpression("0 0 * * 7").weekdays == {0}
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * * * 8", "*/0 * * * *", "5-1 * * * *"])
+def test_invalid_cron_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_next_after_is_strictly_after_the_moment():
+    cron = CronExpression("30 8 * * mon-fri")
+    assert cron.next_after(MONDAY) == datetime(2024, 1, 1, 8, 30)
+    assert cron.next_after(datetime(2024, 1, 1, 8, 30)) == datetime(2024, 1, 2, 8, 30)
+    # Friday evening skips the weekend
+    assert cron.next_after(datetime(2024, 1, 5, 9, 0)) == datetime(2024, 1, 8, 8, 30)
+
+
+def test_restricted_day_fields_match_either_day():
+    # The 15th or any Sunday
+    cron = CronExpression("0 12 15 * sun")
+    assert cron.next_after(MONDAY) == datetime(2024, 1, 7, 12, 0)
+    assert cron.next_after(datetime(2024, 1, 7, 12, 0)) == datetime(2024, 1, 14, 12, 0)
+    assert cron.next_after(datetime(2024, 1, 14, 12, 0)) == datetime(2024, 1, 15, 12, 0)
+
+
+def test_an_expression_that_never_matches_raises():
+    with pytest.raises(ValueError, match="never matches"):
+        CronExpression("0 0 30 feb *").next_after(MONDAY)
+
+
+def test_a_rule_needs_exactly_one_trigger():
+    with pytest.raises(ValueError):
+        ScheduleRule("both", cron="* * * * *", interval_minutes=5)
+    with pytest.raises(ValueError):
+        ScheduleRule("neither")
+    with pytest.raises(ValueError):
+        ScheduleRule("zero", interval_minutes=0)
+
+
+def test_rules_from_config_get_a_name():
+    assert ScheduleRule.from_config({"cron": "0 9 * * *"}).name == "0 9 * * *"
+    rule = ScheduleRule.from_config({"interval_minutes": 30, "profile": "work", "catch_up": False})
+    assert rule.name == "every 30 min"
+    assert rule.profile == "work"
+    assert not rule.catch_up
+
+
+def test_intervals_stay_anchored_to_the_previous_due_time():
+    rule = ScheduleRule("poll", interval_minutes=10)
+    start = MONDAY.timestamp()
+    assert rule.next_due(start) == start + 600
+    # Handled 45 s late, the next run keeps its slot
+    assert rule.next_due(start + 645, start + 600) == start + 1200
+
+
+def test_the_earliest_rule_is_due_first():
+    scheduler = RunScheduler()
+    late = ScheduleRule("late", profile="b", interval_minutes=30)
+    early = ScheduleRule("early", profile="a", interval_minutes=10)
+    now = MONDAY.timestamp()
+    scheduler.set_rules([late, early], now)
+    assert len(scheduler) == 2
+    assert scheduler.next_due() == now + 600
+    assert [rule for _, rule in scheduler.upcoming()] == [early, late]
+    assert scheduler.pop_due(now + 599) == []
+
+    triggers = scheduler.pop_due(now + 600)
+    assert [(trigger.rule, trigger.missed) for trigger in triggers] == [(early, 0)]
+    assert scheduler.next_due() == now + 1200
+
+
+def test_runs_missed_while_asleep_are_coalesced_into_one_trigger():
+    scheduler = RunScheduler(missed_grace=60)
+    rule = ScheduleRule("poll", interval_minutes=10)
+    now = MONDAY.timestamp()
+    scheduler.set_rules([rule], now)
+
+    # Woken 35 minutes later: due at +10, missed +20 and +30
+    triggers = scheduler.pop_due(now + 35 * 60)
+    assert len(triggers) == 1
+    assert triggers[0].due == now + 600
+    assert triggers[0].missed == 2
+    assert scheduler.next_due() == now + 40 * 60
+
+
+def test_missed_cron_runs_are_counted():
+    scheduler = RunScheduler()
+    rule = ScheduleRule("hourly", cron="0 * * * *")
+    scheduler.set_rules([rule], MONDAY.timestamp())
+    triggers = scheduler.pop_due(timestamp(2024, 1, 1, 12, 30))
+    assert triggers[0].due == timestamp(2024, 1, 1, 9, 0)
+    assert triggers[0].missed == 3
+
+
+def test_late_rules_without_catch_up_are_dropped_but_rescheduled():
+    scheduler = RunScheduler(missed_grace=60)
+    rule = ScheduleRule("poll", interval_minutes=10, catch_up=False)
+    now = MONDAY.timestamp()
+    scheduler.set_rules([rule], now)
+    assert scheduler.pop_due(now + 600 + 30)[0].missed == 0
+    assert scheduler.pop_due(now + 35 * 60) == []
+    assert scheduler.next_due() == now + 40 * 60
+
+
+def test_rules_of_one_profile_due_together_trigger_once():
+    scheduler = RunScheduler()
+    first = ScheduleRule("first", profile="work", interval_minutes=10)
+    second = ScheduleRule("second", profile="work", interval_minutes=10)
+    other = ScheduleRule("other", profile="home", interval_minutes=10)
+    now = MONDAY.timestamp()
+    scheduler.set_rules([first, second, other], now)
+    triggers = scheduler.pop_due(now + 600)
+    assert sorted(trigger.rule.profile for trigger in triggers) == ["home", "work"]
+    work = next(trigger for trigger in triggers if trigger.rule.profile == "work")
+    assert work.missed == 1
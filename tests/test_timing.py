@@ -0,0 +1,77 @@
+# test_timing.py
+
+import threading
+
+import pytest
+
+from core.action_program import DEFAULT_SLEEP_TIMERS
+from core.backends import get_backend
+from core.clock import VirtualClock
+from core.opening_engine import FolderOpeningEngine
+from core.timing import TimingSettings
+
+
+def test_missing_timers_take_their_defaults():
+    timing = TimingSettings({"after_enter": 2.0})
+    version, timers = timing.snapshot()
+    assert version == 0
+    assert timers == {**DEFAULT_SLEEP_TIMERS, "after_enter": 2.0}
+    assert timing.get("explorer_startup") == DEFAULT_SLEEP_TIMERS["explorer_startup"]
+    assert timing.get("unknown", 7) == 7
+
+
+def test_only_changed_values_bump_the_version():
+    timing = TimingSettings()
+    assert timing.update({"new_tab": DEFAULT_SLEEP_TIMERS["new_tab"]}) == 0
+    assert timing.update({"new_tab": 0.2, "after_typing": 0.3}) == 1
+    assert timing.update({"new_tab": 0.2}) == 1
+    assert timing.update({"new_tab": 0.25}) == 2
+
+
+def test_a_snapshot_is_a_copy():
+    timing = TimingSettings()
+    _, timers = timing.snapshot()
+    timers["new_tab"] = 9.0
+    assert timing.get("new_tab") == DEFAULT_SLEEP_TIMERS["new_tab"]
+
+
+def test_replace_resets_the_timers_it_is_not_given():
+    timing = TimingSettings({"new_tab": 0.2, "after_enter": 2.0})
+    assert timing.replace({"new_tab": 0.2}) == 1
+    assert timing.snapshot()[1] == {**DEFAULT_SLEEP_TIMERS, "new_tab": 0.2}
+    assert timing.replace({"new_tab": 0.2}) == 1
+
+
+def test_of_shares_settings_and_wraps_dicts():
+    timing = TimingSettings()
+    assert TimingSettings.of(timing) is timing
+    wrapped = TimingSettings.of({"new_tab": 0.2})
+    assert isinstance(wrapped, TimingSettings)
+    assert wrapped.get("new_tab") == 0.2
+
+
+def test_concurrent_updates_each_bump_the_version_once():
+    timing = TimingSettings()
+
+    def change(n):
+        for i in range(100):
+            timing.update({"new_tab": n * 1000 + i})
+
+    threads = [threading.Thread(target=change, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timing.version == 400
+
+
+def test_the_engine_applies_a_change_from_the_next_action():
+    timing = TimingSettings({"explorer_startup": 1.5, "new_tab": 0.5, "address_bar_focus": 0.5,
+                             "after_typing": 0.5, "after_enter": 0.5})
+    clock = VirtualClock()
+    engine = FolderOpeningEngine(["/tmp/a", "/tmp/b"], timing, get_backend("simulated"), clock=clock)
+    # Changed during the launch wait, which keeps its 1.5 s
+    clock.call_later(0.1, lambda: timing.update({"after_enter": 2.0}))
+    assert engine.run()
+    # Launch, then 0.5 + 0.5 + 2.0 and 0.5 + 0.5 + 0.5 + 2.0
+    assert clock.now() == pytest.approx(1.5 + 3.0 + 3.5)
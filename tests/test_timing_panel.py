@@ -0,0 +1,28 @@
+# test_timing_panel.py
+
+import pytest
+
+from core.action_program import DEFAULT_SLEEP_TIMERS
+from ui.timing_panel import SLIDER_STEP, LiveTimingPanel
+
+
+@pytest.fixture
+def panel(qapp):
+    panel = LiveTimingPanel()
+    yield panel
+    panel.deleteLater()
+
+
+def test_timers_longer_than_the_slider_range_are_not_clamped(panel):
+    changes = []
+    panel.timer_changed.connect(lambda timer, seconds: changes.append((timer, seconds)))
+    panel.set_timers({**DEFAULT_SLEEP_TIMERS, "explorer_startup": 8.0})
+
+    slider = panel.sliders["explorer_startup"]
+    assert slider.value() * SLIDER_STEP == pytest.approx(8.0)
+    assert panel.value_labels["explorer_startup"].text() == "8.00s"
+    assert changes == []
+
+    # One step down from the configured value, not from the end of the default range
+    slider.setValue(slider.value() - 1)
+    assert changes == [("explorer_startup", 7.95)]
@@ -0,0 +1,114 @@
+# history_dialog.py
+
+"""Version 1.1"""
+
+import sqlite3
+from datetime import datetime
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QTabWidget,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QPushButton)
+from PySide6.QtCore import Qt
+
+from core.run_history import RunHistory
+
+
+class HistoryDialog(QDialog):
+    """Shows step and folder timings of past runs, to find which settings or folders are slow"""
+
+    def __init__(self, history_path, parent=None):
+        super().__init__(parent)
+        self.history_path = history_path
+        self.setWindowTitle("Run History")
+        self.resize(720, 480)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # Number of runs the statistics are computed over
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Last runs:"))
+        self.last_runs_spinbox = QSpinBox()
+        self.last_runs_spinbox.setRange(1, 500)
+        self.last_runs_spinbox.setValue(20)
+        self.last_runs_spinbox.valueChanged.connect(self.refresh)
+        controls_layout.addWidget(self.last_runs_spinbox)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+
+        self.tabs = QTabWidget()
+        self.steps_table = self._create_table(["Step", "Runs", "p50 (s)", "p95 (s)", "Configured (s)", "Overhead (s)",
+                                              "Failures"])
+        self.folders_table = self._create_table(["Folder", "Runs", "p50 (s)", "p95 (s)", "Failures"])
+        self.runs_table = self._create_table(["Started", "Folders", "Duration (s)", "Result", "Backend"])
+        self.tabs.addTab(self.steps_table, "Steps")
+        self.tabs.addTab(self.folders_table, "Folders")
+        self.tabs.addTab(self.runs_table, "Runs")
+        layout.addWidget(self.tabs)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def _create_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        return table
+
+    def _fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, item)
+
+    def refresh(self):
+        """Reload the tables from the history store"""
+        last_runs = self.last_runs_spinbox.value()
+        try:
+            history = RunHistory(self.history_path)
+        except sqlite3.Error as e:
+            self.status_label.setText(f"Cannot open the run history: {e}")
+            return
+
+        try:
+            steps = history.step_stats(last_runs)
+            folders = history.folder_stats(last_runs)
+            runs = history.recent_runs(last_runs)
+        finally:
+            history.close()
+
+        self._fill_table(self.steps_table, [
+            [item["step"], str(item["count"]), f"{item['p50']:.3f}", f"{item['p95']:.3f}",
+             f"{item['expected_p50']:.3f}" if item["expected_p50"] is not None else "-",
+             f"{item['overhead_p50']:+.3f}" if item["overhead_p50"] is not None else "-", str(item["failures"])]
+            for item in steps
+        ])
+        self._fill_table(self.folders_table, [
+            [item["folder"], str(item["count"]), f"{item['p50']:.2f}", f"{item['p95']:.2f}", str(item["failures"])]
+            for item in folders
+        ])
+        self._fill_table(self.runs_table, [
+            [f"{datetime.fromtimestamp(run['started']):%Y-%m-%d %H:%M:%S}", str(run["total"]),
+             f"{run['duration']:.1f}" if run["duration"] is not None else "-",
+             {True: "OK", False: "Failed", None: "Incomplete"}[run["success"]], run["backend"]]
+            for run in runs
+        ])
+
+        if runs:
+            self.status_label.setText(f"Statistics over the last {len(runs)} run(s)")
+        else:
+            self.status_label.setText("No runs recorded yet")
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLa
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 from ui.ui_components import ModernTextEdit, ModernProgressBar, ModernButton
+from ui.timing_panel import LiveTimingPanel
 
 
 class MainWindowUI:
@@ -16,9 +17,12 @@ class MainWindowUI:
         # UI components that will be accessed by the main application
         self.log_text = None
         self.progress_bar = None
+        self.queue_label = None
+        self.timing_panel = None
         self.execute_button = None
         self.cancel_button = None
         self.open_configurator_button = None
+        self.history_button = None
         self.author_label = None
 
     def setup_ui(self):
@@ -52,9 +56,13 @@ class MainWindowUI:
         warning_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(warning_label)
 
-        # Open Configurator button - moved to top
+        # Open Configurator button - moved to top, with the run history next to it
+        top_buttons_layout = QHBoxLayout()
         self.open_configurator_button = QPushButton("Open Configurator")
-        main_layout.addWidget(self.open_configurator_button)
+        top_buttons_layout.addWidget(self.open_configurator_button, 1)
+        self.history_button = QPushButton("Run History")
+        top_buttons_layout.addWidget(self.history_button)
+        main_layout.addLayout(top_buttons_layout)
 
         # Log text area
         self.log_text = ModernTextEdit()
@@ -65,6 +73,16 @@ class MainWindowUI:
         self.progress_bar = ModernProgressBar()
         main_layout.addWidget(self.progress_bar)
 
+        # Runs waiting for the current one, hidden while the queue is empty
+        self.queue_label = QLabel()
+        self.queue_label.setWordWrap(True)
+        self.queue_label.setVisible(False)
+        main_layout.addWidget(self.queue_label)
+
+        # Sleep timers that can be changed while a run is in progress
+        self.timing_panel = LiveTimingPanel()
+        main_layout.addWidget(self.timing_panel)
+
         # Action buttons layout (Cancel and Execute side by side)
         buttons_layout = QHBoxLayout()
 
@@ -100,8 +118,11 @@ class MainWindowUI:
         return {
             'log_text': self.log_text,
             'progress_bar': self.progress_bar,
+            'queue_label': self.queue_label,
+            'timing_panel': self.timing_panel,
             'execute_button': self.execute_button,
             'cancel_button': self.cancel_button,
             'open_configurator_button': self.open_configurator_button,
+            'history_button': self.history_button,
             'author_label': self.author_label
         }
@@ -7,6 +7,7 @@ from PySide6.QtGui import QShortcut, QKeySequence, QUndoStack
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QMessageBox, QSizePolicy, QLayout
 import os
 
+from core.backends import pacing_options
 from managers.config_manager import ConfigManager
 from managers.startup_manager import StartupManager
 from ui.settings.configurator_ui import ConfiguratorUI
@@ -29,6 +30,9 @@ class ConfiguratorDialog(QDialog):
         # Initialize folders list and sleep timers
         self.folders, self.sleep_timers, self.start_instantly, self.auto_close, self.auto_close_delay, self.system_tray, _ = self.config_manager.load_config(
             self)
+        settings = self.config_manager.load_settings()
+        self.profiling = ConfigManager.section(settings, "profiling", {})
+        self.input_pause, self.failsafe = pacing_options(ConfigManager.section(settings, "input_pacing", {}))
 
         # Create main layout for the dialog
         self.main_layout = QVBoxLayout(self)
@@ -54,6 +58,10 @@ class ConfiguratorDialog(QDialog):
         self.redo_shortcut = QShortcut(QKeySequence.Redo, self)
         self.redo_shortcut.activated.connect(self.undo_stack.redo)
 
+        # Hidden developer options (profiling), revealed with Ctrl+Shift+P
+        self.developer_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.developer_shortcut.activated.connect(self.ui.toggle_developer_options)
+
     def save_config(self):
         # Update sleep timers from UI
         self.sleep_timers["explorer_startup"] = self.ui.explorer_startup_spin.value()
@@ -67,6 +75,9 @@ class ConfiguratorDialog(QDialog):
         self.auto_close = self.ui.auto_close_checkbox.isChecked()
         self.auto_close_delay = self.ui.auto_close_delay_spin.value()
         self.system_tray = self.ui.system_tray_checkbox.isChecked()
+        self.profiling = {"mode": self.ui.profile_mode_combo.currentData(), "rate": self.ui.profile_rate_spin.value()}
+        self.input_pause = round(self.ui.input_pause_spin.value(), 2)
+        self.failsafe = self.ui.failsafe_checkbox.isChecked()
 
         # Check if shortcuts need to be created
         needs_shortcuts = (self.start_instantly or self.auto_close) and not self.system_tray
@@ -123,7 +134,9 @@ class ConfiguratorDialog(QDialog):
             self,
             auto_close=self.auto_close,
             auto_close_delay=self.auto_close_delay,
-            system_tray=self.system_tray
+            system_tray=self.system_tray,
+            profiling=self.profiling,
+            input_pacing={"pause": self.input_pause, "failsafe": self.failsafe}
         )
 
         if saved:
@@ -5,7 +5,7 @@
 import os
 import subprocess
 from PySide6.QtWidgets import QMessageBox, QMenu, QFileDialog
-from core.folder_operations import FolderOperations
+from ui.settings.folder_operations import FolderOperations
 from ui.settings.undo_commands import DeleteFolderCommand, AddFolderCommand, MoveFolderCommand, EditFolderCommand
 
 
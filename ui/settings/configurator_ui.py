@@ -2,9 +2,11 @@
 
 """Version 1.1"""
 
+import sqlite3
+
 from PySide6.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
                                QDoubleSpinBox, QGridLayout, QGroupBox, QCheckBox, QWidget,
-                               QScrollArea)
+                               QScrollArea, QComboBox, QSpinBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 
@@ -14,7 +16,11 @@ from managers.startup_manager import StartupManager
 from ui.settings.ui_resources import UIResources
 from ui.about_dialog import AboutDialog
 from ui.collapsible_section import CollapsibleSection
-from core.folder_operations import FolderOperations
+from ui.settings.folder_operations import FolderOperations
+from core.profiling import DEFAULT_SAMPLE_RATE
+from core.eta import FOLDER_STEPS, LAUNCH_STEP
+from core.run_history import RunHistory
+from app_config import HISTORY_PATH
 
 
 class ConfiguratorUI:
@@ -232,9 +238,65 @@ class ConfiguratorUI:
         self.after_enter_spin.setToolTip(self.tooltips["after_enter"])
         timing_controls.addWidget(self.after_enter_spin, 2, 1)
 
+        # Input pause after every keystroke, which the delays above do not include
+        input_pause_label = QLabel("Keystroke Pause:")
+        input_pause_label.setToolTip(self.tooltips["input_pause"])
+        timing_controls.addWidget(input_pause_label, 2, 2)
+        self.input_pause_spin = QDoubleSpinBox()
+        self.input_pause_spin.setRange(0.0, 1.0)
+        self.input_pause_spin.setSingleStep(0.05)
+        self.input_pause_spin.setValue(self.dialog.input_pause)
+        self.input_pause_spin.setToolTip(self.tooltips["input_pause"])
+        timing_controls.addWidget(self.input_pause_spin, 2, 3)
+
+        self.failsafe_checkbox = QCheckBox("Abort a run when the mouse reaches a screen corner")
+        self.failsafe_checkbox.setChecked(self.dialog.failsafe)
+        self.failsafe_checkbox.setToolTip(self.tooltips["failsafe"])
+        timing_layout.addWidget(self.failsafe_checkbox)
+
+        # What the delays cost in recent runs
+        self.measured_delays_label = QLabel()
+        self.measured_delays_label.setWordWrap(True)
+        self.measured_delays_label.setStyleSheet("color: #666666; font-style: italic;")
+        timing_layout.addWidget(self.measured_delays_label)
+        self.show_measured_delays({
+            "explorer_startup": self.explorer_startup_spin,
+            "new_tab": self.new_tab_spin,
+            "address_bar_focus": self.address_bar_spin,
+            "after_typing": self.after_typing_spin,
+            "after_enter": self.after_enter_spin,
+        })
+
         # Add the widget to the collapsible section
         self.timing_section.add_widget(timing_widget)
 
+    def show_measured_delays(self, spins):
+        """Add the measured duration of each delay's step to its tooltip and summarize the overhead"""
+        try:
+            history = RunHistory(HISTORY_PATH)
+            try:
+                stats = {item["step"]: item for item in history.step_stats()}
+            finally:
+                history.close()
+        except sqlite3.Error:
+            stats = {}
+
+        overheads = []
+        for step, timer in (LAUNCH_STEP,) + FOLDER_STEPS:
+            item = stats.get(step)
+            if not item or item["expected_p50"] is None:
+                continue
+            spins[timer].setToolTip(f"{self.tooltips[timer]}\n\nRecent runs: this step took {item['p50']:.2f}s "
+                                    f"for {item['expected_p50']:.2f}s configured.")
+            if step != LAUNCH_STEP[0]:
+                overheads.append(item["overhead_p50"])
+
+        if overheads:
+            self.measured_delays_label.setText(
+                f"In recent runs each folder took {sum(overheads):.2f}s longer than its configured delays "
+                f"(keystroke pause and Explorer response).")
+        self.measured_delays_label.setVisible(bool(overheads))
+
     def setup_options_section(self):
         # Create options widget and layout
         options_widget = QWidget()
@@ -313,6 +375,42 @@ class ConfiguratorUI:
         system_tray_note.setStyleSheet("color: #666; font-style: italic;")
         options_layout.addWidget(system_tray_note)
 
+        # Developer options, hidden until toggled with Ctrl+Shift+P
+        self.developer_widget = QWidget()
+        developer_layout = QVBoxLayout(self.developer_widget)
+        developer_layout.setContentsMargins(0, 10, 0, 0)
+        developer_label = QLabel("Developer Options:")
+        developer_label.setFont(font)
+        developer_layout.addWidget(developer_label)
+
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("Profiler:"))
+        self.profile_mode_combo = QComboBox()
+        self.profile_mode_combo.addItem("Off", "off")
+        self.profile_mode_combo.addItem("cProfile (.pstats)", "cprofile")
+        self.profile_mode_combo.addItem("Sampling (flamegraph)", "sample")
+        self.profile_mode_combo.setCurrentIndex(
+            max(0, self.profile_mode_combo.findData(self.dialog.profiling.get("mode", "off"))))
+        self.profile_mode_combo.setToolTip(self.tooltips["profiling"])
+        profile_layout.addWidget(self.profile_mode_combo)
+        profile_layout.addWidget(QLabel("Rate:"))
+        self.profile_rate_spin = QSpinBox()
+        self.profile_rate_spin.setRange(1, 1000)
+        rate = self.dialog.profiling.get("rate", DEFAULT_SAMPLE_RATE)
+        self.profile_rate_spin.setValue(rate if isinstance(rate, int) else DEFAULT_SAMPLE_RATE)
+        self.profile_rate_spin.setSuffix(" Hz")
+        profile_layout.addWidget(self.profile_rate_spin)
+        profile_layout.addStretch(1)
+        developer_layout.addLayout(profile_layout)
+
+        profile_note = QLabel("Takes effect the next time the launcher starts. Profiles are saved in the 'profiles' folder.")
+        profile_note.setWordWrap(True)
+        profile_note.setStyleSheet("color: #666; font-style: italic;")
+        developer_layout.addWidget(profile_note)
+
+        self.developer_widget.setVisible(self.dialog.profiling.get("mode", "off") != "off")
+        options_layout.addWidget(self.developer_widget)
+
         # Connect signals for checkbox interactions
         self.system_tray_checkbox.stateChanged.connect(self.on_system_tray_changed)
         self.auto_close_checkbox.stateChanged.connect(self.on_auto_close_changed)
@@ -357,6 +455,9 @@ class ConfiguratorUI:
         # Update auto-close behavior description based on system tray state
         pass
 
+    def toggle_developer_options(self):
+        self.developer_widget.setVisible(not self.developer_widget.isVisible())
+
     def on_auto_close_changed(self):
         # Enable/disable auto-close delay spin box based on checkbox state
         self.auto_close_delay_spin.setEnabled(self.auto_close_checkbox.isChecked())
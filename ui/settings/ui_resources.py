@@ -29,6 +29,15 @@ class UIResources:
             "If some folders aren't opening completely before the next one starts, increase this value.\n"
             "Default: 0.5 seconds"
         ),
+        "input_pause": (
+            "Pause after every keystroke command sent to Explorer, on top of the delays above.\n"
+            "It adds up to four pauses per folder; the run log and Run History show how much it costs.\n"
+            "Default: 0.1 seconds"
+        ),
+        "failsafe": (
+            "When checked, moving the mouse into a corner of the screen aborts a run.\n"
+            "Uncheck it if runs stop unexpectedly."
+        ),
         "start_instantly": (
             "When checked, folders will open automatically as soon as you launch the app.\n"
             "Useful for creating a desktop shortcut that immediately opens all your folders with one click."
@@ -44,6 +53,10 @@ class UIResources:
         "auto_close_delay": (
             "How long to wait before closing the app after all folders are opened.\n"
             "Gives you time to see that everything opened correctly before the app disappears."
+        ),
+        "profiling": (
+            "Record where the launcher spends its time, for troubleshooting slow runs.\n"
+            "cProfile writes .pstats files; Sampling writes collapsed stacks for flamegraph tools."
         )
     }
 
@@ -3,7 +3,7 @@
 """Version 1.1"""
 
 from PySide6.QtGui import QUndoCommand
-from core.folder_operations import FolderOperations
+from ui.settings.folder_operations import FolderOperations
 
 
 class DeleteFolderCommand(QUndoCommand):
@@ -0,0 +1,103 @@
+# timing_panel.py
+
+"""Version 1.1"""
+
+from PySide6.QtWidgets import QWidget, QGridLayout, QLabel, QSlider
+from PySide6.QtCore import Qt, Signal
+
+from core.eta import FOLDER_STEPS, LAUNCH_STEP
+from ui.collapsible_section import CollapsibleSection
+from ui.settings.ui_resources import UIResources
+
+# Slider positions are multiples of this many seconds
+SLIDER_STEP = 0.05
+# Upper end of the sliders, unless a configured timer is longer
+SLIDER_MAX = 5.0
+
+TIMER_LABELS = {
+    "explorer_startup": "Explorer Startup",
+    "new_tab": "New Tab",
+    "address_bar_focus": "Address Bar Focus",
+    "after_typing": "After Typing",
+    "after_enter": "After Enter",
+}
+
+
+class LiveTimingPanel(CollapsibleSection):
+    """Sliders that change the sleep timers of the running session, with the last measured duration of each step.
+
+    A change applies from the next action of a run in progress and to the runs
+    after it, but is not saved: reloading the configuration resets the sliders.
+    """
+
+    # (timer name, seconds), emitted when a slider is released or moved with the keyboard
+    timer_changed = Signal(str, float)
+
+    def __init__(self, parent=None):
+        super().__init__("Live Timing (this session)", parent)
+        self.sliders = {}
+        self.value_labels = {}
+        self.readout_labels = {}
+        # Step name of each timer's row
+        self.steps = {timer: step for step, timer in (LAUNCH_STEP,) + FOLDER_STEPS}
+
+        widget = QWidget()
+        layout = QGridLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for row, timer in enumerate(self.steps):
+            label = QLabel(f"{TIMER_LABELS[timer]}:")
+            label.setToolTip(UIResources.tooltips[timer])
+            layout.addWidget(label, row, 0)
+
+            slider = QSlider(Qt.Horizontal)
+            slider.setRange(0, round(SLIDER_MAX / SLIDER_STEP))
+            slider.setPageStep(2)
+            # valueChanged only fires once the slider is released, so a drag is a single change
+            slider.setTracking(False)
+            slider.sliderMoved.connect(lambda position, t=timer: self._show_value(t, position * SLIDER_STEP))
+            slider.valueChanged.connect(lambda position, t=timer: self._on_value_changed(t, position))
+            layout.addWidget(slider, row, 1)
+
+            value_label = QLabel()
+            value_label.setMinimumWidth(45)
+            layout.addWidget(value_label, row, 2)
+
+            readout_label = QLabel("last: -")
+            readout_label.setStyleSheet("color: #666666; font-style: italic;")
+            readout_label.setMinimumWidth(170)
+            layout.addWidget(readout_label, row, 3)
+
+            self.sliders[timer] = slider
+            self.value_labels[timer] = value_label
+            self.readout_labels[timer] = readout_label
+        layout.setColumnStretch(1, 1)
+        self.add_widget(widget)
+
+    def set_timers(self, sleep_timers):
+        """Move the sliders to the given timers without emitting timer_changed"""
+        for timer, slider in self.sliders.items():
+            seconds = sleep_timers.get(timer, 0)
+            position = round(seconds / SLIDER_STEP)
+            slider.blockSignals(True)
+            # A longer timer widens its slider rather than being cut to SLIDER_MAX
+            slider.setMaximum(max(round(SLIDER_MAX / SLIDER_STEP), position))
+            slider.setValue(position)
+            slider.blockSignals(False)
+            self._show_value(timer, seconds)
+
+    def show_step_timings(self, timings):
+        """Show the last measured duration and configured wait of each step ({step: (duration, expected)})"""
+        for timer, step in self.steps.items():
+            if step in timings:
+                duration, expected = timings[step]
+                self.readout_labels[timer].setText(f"last: {duration:.2f}s (wait {expected:.2f}s)")
+            else:
+                self.readout_labels[timer].setText("last: -")
+
+    def _show_value(self, timer, seconds):
+        self.value_labels[timer].setText(f"{seconds:.2f}s")
+
+    def _on_value_changed(self, timer, position):
+        seconds = round(position * SLIDER_STEP, 2)
+        self._show_value(timer, seconds)
+        self.timer_changed.emit(timer, seconds)